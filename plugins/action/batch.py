@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+
+from ansible.errors import AnsibleActionFail
+from ansible.plugins.action import ActionBase
+from ansible_collections.margays.proxmox.plugins.module_utils.proxmox.batch import batch_params
+
+
+class ActionModule(ActionBase):
+    """Checks the items of margays.proxmox.batch on the controller, then runs them all in one module run."""
+
+    TRANSFERS_FILES = False
+
+    def run(self, tmp=None, task_vars=None):
+        result = super().run(tmp, task_vars)
+        module_args = self._task.args.copy()
+
+        items = module_args.get('items')
+        if not isinstance(items, list):
+            raise AnsibleActionFail('items must be a list of {module, args} items')
+
+        checked = []
+        for index, item in enumerate(items):
+            if not isinstance(item, dict) or not isinstance(item.get('args') or {}, dict):
+                raise AnsibleActionFail(f'Item {index} must be a dict with module and args')
+
+            try:
+                name, _ = batch_params(item)
+            except ValueError as e:
+                raise AnsibleActionFail(f'Item {index}: {e}')
+
+            checked.append({'module': name, 'args': item.get('args') or {}})
+
+        module_args['items'] = checked
+        result.update(
+            self._execute_module(module_name='margays.proxmox.batch', module_args=module_args, task_vars=task_vars)
+        )
+        return result
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+
+
+class ModuleDocFragment(object):
+
+    DOCUMENTATION = r'''
+options:
+    api_host:
+        description:
+            - Proxmox VE API host. When set, the module talks to the REST API instead of running C(pvesh),
+              so it can run from the controller (for example with C(delegate_to: localhost)).
+        type: str
+        required: false
+    api_port:
+        description: Proxmox VE API port.
+        type: int
+        default: 8006
+    api_token_id:
+        description: API token id in the C(USER@REALM!TOKENID) form.
+        type: str
+        required: false
+    api_token_secret:
+        description: API token secret.
+        type: str
+        required: false
+    validate_certs:
+        description: Validate the API TLS certificate.
+        type: bool
+        default: true
+    pvesh_session:
+        description:
+            - Run all C(pvesh) calls of the module through one long-lived worker process instead of starting
+              C(pvesh) for every call. Ignored when I(api_host) is set.
+        type: bool
+        default: false
+    cache_responses:
+        description:
+            - Cache read responses for the duration of the module run. Writes drop the cached responses they affect,
+              so repeated lookups of the same resource cost a single call.
+        type: bool
+        default: false
+    retries:
+        description:
+            - How many times a call is retried when the resource is locked or the API is temporarily unavailable.
+              Reads are retried on both, writes only on lock contention. V(0) disables retries.
+        type: int
+        default: 3
+    retry_budget:
+        description: Maximum number of seconds a single call may spend waiting between retries.
+        type: float
+        default: 30
+    metrics:
+        description:
+            - Return a C(metrics) block with the number, duration and output size of the calls made by the module,
+              in total, per phase (C(lookup), C(diff), C(apply), C(final_lookup)) and per method,
+              plus the slowest calls.
+        type: bool
+        default: false
+    record_cassette:
+        description:
+            - Append every call made by the module, with its response or error and duration, to this cassette file
+              on the managed host. Cassettes can be replayed offline with the replay client of the collection.
+            - Passwords, SSH keys, ACME EAB keys and ACME plugin data are masked before they are written. The
+              other call options and responses are kept as they are, protect cassettes like the cluster configuration.
+        type: path
+        required: false
+    api_schema_cache:
+        description:
+            - Directory on the managed host caching the API schema of the cluster, one file per Proxmox VE version.
+              When set, options are checked and coerced against the schema before any call, so a typo like
+              C(cahce=writeback) in a disk fails before anything reaches the cluster.
+            - The schema is read from the API viewer of the node (C(pve-docs)) on the first run against a version.
+            - The version of the cluster is kept in the directory too and only looked up again after an hour, runs
+              within that hour make no extra call.
+        type: path
+        required: false
+'''
@@ -0,0 +1,16 @@
+# -*- coding: utf-8 -*-
+
+
+class ModuleDocFragment(object):
+
+    DOCUMENTATION = r'''
+options:
+    return_mode:
+        description:
+            - How much the module returns. C(minimal) returns C(changed) only, C(diff) adds C(updated_fields).
+            - C(full) adds C(data), derived from the single lookup made before the changes and the changes applied.
+            - C(verified) reads C(data) back from the cluster after the changes, at the cost of one more call.
+        type: str
+        choices: [ minimal, diff, full, verified ]
+        default: full
+'''
@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+
+DOCUMENTATION = '''
+---
+name: proxmox
+
+short_description: Proxmox VE guests as inventory hosts
+
+description:
+    - Lists the QEMU VMs and LXC containers of a Proxmox VE cluster with a single C(cluster/resources) call
+      and groups them by node, pool, tag and HA group.
+    - HA groups take one more call, C(cluster/ha/resources), made only when some guest is HA managed.
+    - With I(fetch_configs), the config of every QEMU VM is read as well, on a bounded pool of threads,
+      and returned as the C(config) host variable.
+    - With the inventory cache enabled, runs within I(cache_timeout) make no calls at all.
+    - The inventory file name must end with C(proxmox.yml) or C(proxmox.yaml).
+
+extends_documentation_fragment:
+    - constructed
+    - inventory_cache
+
+options:
+    plugin:
+        description: Name of the plugin.
+        required: true
+        choices: [ "margays.proxmox.proxmox" ]
+    api_host:
+        description:
+            - Proxmox VE API host. Without it, C(pvesh) is run locally, which only works on a Proxmox VE node.
+        type: str
+        env:
+            - name: PROXMOX_API_HOST
+    api_port:
+        description: Proxmox VE API port.
+        type: int
+        default: 8006
+        env:
+            - name: PROXMOX_API_PORT
+    api_token_id:
+        description: API token id in the C(USER@REALM!TOKENID) form.
+        type: str
+        env:
+            - name: PROXMOX_API_TOKEN_ID
+    api_token_secret:
+        description: API token secret.
+        type: str
+        env:
+            - name: PROXMOX_API_TOKEN_SECRET
+    validate_certs:
+        description: Validate the API TLS certificate.
+        type: bool
+        default: true
+        env:
+            - name: PROXMOX_VALIDATE_CERTS
+    retries:
+        description: How many times a call is retried when the API is temporarily unavailable.
+        type: int
+        default: 3
+    fetch_configs:
+        description: Read the config of every QEMU VM into the C(config) host variable.
+        type: bool
+        default: false
+    config_workers:
+        description: Number of configs read at the same time when I(fetch_configs) is set.
+        type: int
+        default: 8
+    group_by:
+        description: Groups to build, one group per node, pool, tag or HA group, named C(<group_prefix><kind>_<value>).
+        type: list
+        elements: str
+        default: [ "node", "pool", "tag", "ha_group" ]
+        choices: [ "node", "pool", "tag", "ha_group" ]
+    group_prefix:
+        description: Prefix of the group names and of the host variables.
+        type: str
+        default: "proxmox_"
+    hostnames:
+        description:
+            - Name hosts after the guest name or its vmid. Guests without name use the vmid,
+              a name used by more than one guest gets the vmid appended.
+        type: str
+        default: "name"
+        choices: [ "name", "vmid" ]
+    guest_types:
+        description: Guest types listed as hosts.
+        type: list
+        elements: str
+        default: [ "qemu", "lxc" ]
+        choices: [ "qemu", "lxc" ]
+    include_templates:
+        description: List templates as hosts too.
+        type: bool
+        default: false
+'''
+
+EXAMPLES = '''
+# proxmox.yml
+plugin: margays.proxmox.proxmox
+api_host: pve1.example.com
+api_token_id: "ansible@pve!inventory"
+fetch_configs: true
+cache: true
+cache_plugin: ansible.builtin.jsonfile
+cache_connection: ~/.cache/ansible/proxmox
+cache_timeout: 300
+keyed_groups:
+  - key: proxmox_status
+    prefix: status
+'''
+
+from ansible.errors import AnsibleParserError
+from ansible.plugins.inventory import BaseInventoryPlugin, Cacheable, Constructable
+from ansible_collections.margays.proxmox.plugins.module_utils.proxmox.client.factory import client_from_params
+from ansible_collections.margays.proxmox.plugins.module_utils.proxmox.inventory import build_inventory, fetch_inventory
+
+
+class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
+
+    NAME = 'margays.proxmox.proxmox'
+
+    def verify_file(self, path):
+        return super().verify_file(path) and path.endswith(('proxmox.yml', 'proxmox.yaml'))
+
+    def parse(self, inventory, loader, path, cache=True):
+        super().parse(inventory, loader, path, cache)
+        self._read_config_data(path)
+
+        cache_key = self.get_cache_key(path)
+        use_cache = self.get_option('cache') and cache
+        update_cache = self.get_option('cache') and not cache
+
+        data = None
+        if use_cache:
+            try:
+                data = self._cache[cache_key]
+            except KeyError:
+                update_cache = True
+
+        if data is None:
+            data = self._fetch()
+
+        if update_cache:
+            self._cache[cache_key] = data
+
+        self._populate(data)
+
+    def _fetch(self):
+        client = client_from_params({
+            'api_host': self.get_option('api_host'),
+            'api_port': self.get_option('api_port'),
+            'api_token_id': self.get_option('api_token_id'),
+            'api_token_secret': self.get_option('api_token_secret'),
+            'validate_certs': self.get_option('validate_certs'),
+            'retries': self.get_option('retries'),
+        })
+        try:
+            return fetch_inventory(
+                client,
+                configs=self.get_option('fetch_configs'),
+                ha_groups='ha_group' in self.get_option('group_by'),
+                workers=self.get_option('config_workers'),
+            )
+        except Exception as e:
+            raise AnsibleParserError(f'Failed to read the Proxmox VE inventory: {e}') from e
+
+    def _populate(self, data):
+        result = build_inventory(
+            data,
+            group_by=self.get_option('group_by'),
+            prefix=self.get_option('group_prefix'),
+            hostnames=self.get_option('hostnames'),
+            guest_types=self.get_option('guest_types'),
+            templates=self.get_option('include_templates'),
+        )
+        strict = self.get_option('strict')
+        for group, group_vars in result.group_vars.items():
+            self.inventory.add_group(group)
+            for key, value in group_vars.items():
+                self.inventory.set_variable(group, key, value)
+
+        for group, hosts in result.groups.items():
+            self.inventory.add_group(group)
+            for host in hosts:
+                self.inventory.add_host(host, group=group)
+
+        for host, hostvars in result.hosts.items():
+            self.inventory.add_host(host)
+            for key, value in hostvars.items():
+                self.inventory.set_variable(host, key, value)
+
+            self._set_composite_vars(self.get_option('compose'), hostvars, host, strict=strict)
+            self._add_host_to_composed_groups(self.get_option('groups'), hostvars, host, strict=strict)
+            self._add_host_to_keyed_groups(self.get_option('keyed_groups'), hostvars, host, strict=strict)
@@ -0,0 +1,102 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from .client import Client, MetricsCollector
+from .fleet import reconcile_one, summarize
+from .handlers.base import BaseHandler
+from .handlers.cluster_ha_group_handler import HA_GROUP_ARGUMENT_SPEC, ClusterHAGroupHandler
+from .handlers.cluster_ha_resource_handler import HA_RESOURCE_ARGUMENT_SPEC, ClusterHAResourceHandler
+from .handlers.cluster_options_handler import OPTIONS_ARGUMENT_SPEC, ClusterOptionsHandler
+from .handlers.pool_handler import POOL_ARGUMENT_SPEC, PoolHandler
+from ..utils import AnsibleParams
+
+COLLECTION = "margays.proxmox"
+
+# kind of the resource, then its id, an id of `None` touches nothing
+Key = Tuple[Any, ...]
+
+
+@dataclass
+class BatchModule:
+    handler: type[BaseHandler]
+    # resources an item reads or writes, items sharing one run in the order they are given
+    keys: Callable[[AnsibleParams], List[Key]]
+    # options of the module without the client and result ones, items are checked against them
+    argument_spec: Dict[str, Any] = field(default_factory=dict)
+
+
+BATCH_MODULES: Dict[str, BatchModule] = {
+    "pool": BatchModule(PoolHandler, lambda params: [("pool", params["poolid"])], POOL_ARGUMENT_SPEC),
+    "cluster_ha_group": BatchModule(
+        ClusterHAGroupHandler, lambda params: [("ha_group", params["group"])], HA_GROUP_ARGUMENT_SPEC
+    ),
+    "cluster_ha_resource": BatchModule(
+        ClusterHAResourceHandler,
+        lambda params: [("ha_resource", params["sid"]), ("ha_group", params.get("group"))],
+        HA_RESOURCE_ARGUMENT_SPEC,
+    ),
+    "cluster_options": BatchModule(ClusterOptionsHandler, lambda params: [("options",)], OPTIONS_ARGUMENT_SPEC),
+}
+
+
+def batch_module_name(name: str) -> str:
+    """Short name of a module of the collection, `margays.proxmox.pool` and `pool` are both `pool`."""
+    short_name = name.removeprefix(f"{COLLECTION}.")
+    if short_name not in BATCH_MODULES:
+        raise ValueError(f"Module {name} cannot be batched, supported modules are: {', '.join(BATCH_MODULES)}")
+
+    return short_name
+
+
+def batch_params(item: Dict[str, Any]) -> Tuple[str, AnsibleParams]:
+    """Module name and module parameters of a `{module, args}` item, with the module defaults filled in."""
+    name = batch_module_name(item.get("module") or "")
+    spec = BATCH_MODULES[name].argument_spec
+    defaults = {option: argument["default"] for option, argument in spec.items() if "default" in argument}
+    params = dict(defaults, **(item.get("args") or {}))
+    missing = [option for option, argument in spec.items() if argument.get("required") and params.get(option) is None]
+    if missing:
+        raise ValueError(f"Missing required arguments of {name}: {', '.join(missing)}")
+
+    params.setdefault("state", "present")
+    return name, params
+
+
+def run_batch(
+    client: type[Client],
+    items: List[Dict[str, Any]],
+    check: bool,
+    workers: int = 8,
+    collector: Optional[MetricsCollector] = None,
+    return_mode: str = "full",
+) -> Dict[str, Any]:
+    """Reconcile `{module, args}` items of different modules in one process, like a loop over their tasks would.
+
+    Items run concurrently on a bounded thread pool, except that an item waits for the earlier items touching the
+    same resource, e.g. an HA resource waits for its HA group. A failing item does not stop the others, the result
+    holds one entry per item, in order, plus aggregate counts.
+    """
+    parsed = [batch_params(item) for item in items]
+    latest: Dict[Key, int] = {}
+    dependencies: List[List[int]] = []
+    for index, (name, params) in enumerate(parsed):
+        keys = [key for key in BATCH_MODULES[name].keys(params) if None not in key]
+        dependencies.append(sorted(set(latest[key] for key in keys if key in latest)))
+        latest.update((key, index) for key in keys)
+
+    futures: List[Future] = []
+
+    def run(index: int) -> Dict[str, Any]:
+        # dependencies are earlier items, they were picked up by a worker before this one and never wait for it
+        for dependency in dependencies[index]:
+            futures[dependency].exception()
+
+        name, params = parsed[index]
+        result = reconcile_one(BATCH_MODULES[name].handler, client, params, check, None, (), collector, return_mode)
+        return {"module": name, **result}
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        for index in range(len(parsed)):
+            futures.append(executor.submit(run, index))
+
+    return summarize([future.result() for future in futures])
@@ -1,2 +1,41 @@
+from .errors import (
+    ProxmoxError,
+    NotFoundError,
+    LockedError,
+    PermissionDeniedError,
+    ValidationError,
+    TransientError,
+    ConflictError,
+    classify_error,
+)
+from .retry import NO_RETRY, RetryPolicy, with_retry_policy
+from .metrics import CallRecord, MetricsCollector, with_collector
+from .stream import aiter_json_array, iter_json_array, iter_records
 from .pvesh import Pvesh
+from .pvesh_session import PveshSession
 from .client import Client
+from .async_client import AsyncClient
+from .async_pvesh import AsyncPvesh, create_async_pvesh
+from .api import PveApi, create_api_client
+from .cache import CachingClient, ResponseCache, create_caching_client
+from .cassette import (
+    Cassette,
+    CassetteMiss,
+    RecordingClient,
+    ReplayClient,
+    create_recording_client,
+    create_replay_client,
+)
+from .schema import (
+    APIDOC_PATH,
+    APIDOC_URL,
+    ApiSchema,
+    SchemaCache,
+    ValidatingClient,
+    client_schema,
+    create_validating_client,
+    load_api_schema,
+    parse_apidoc,
+    read_apidoc,
+)
+from .factory import CLIENT_ARGUMENT_SPEC, client_from_params, metrics_from_params
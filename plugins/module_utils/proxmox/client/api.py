@@ -0,0 +1,297 @@
+import json
+import ssl
+import threading
+import http.client
+from copy import deepcopy
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import quote, urlencode
+from .errors import TransientError, create_error
+from .pvesh import normalize_path
+from .retry import RetryPolicy
+from .metrics import MetricsCollector
+from .stream import ChunkReader, iter_json_array
+
+
+class ConnectionPool:
+    """Keep-alive HTTP(S) connections to a single Proxmox API endpoint, shared between requests."""
+
+    def __init__(
+        self,
+        host: str,
+        port: int = 8006,
+        scheme: str = "https",
+        validate_certs: bool = True,
+        timeout: float = 30.0,
+        maxsize: int = 4,
+    ) -> None:
+        if scheme not in ("http", "https"):
+            raise ValueError(f"Unsupported scheme: {scheme}")
+
+        self.host = host
+        self.port = port
+        self.scheme = scheme
+        self.validate_certs = validate_certs
+        self.timeout = timeout
+        self.maxsize = maxsize
+        self.connections_created = 0
+        self._idle: List[http.client.HTTPConnection] = []
+        self._lock = threading.Lock()
+
+    def _new_connection(self) -> http.client.HTTPConnection:
+        self.connections_created += 1
+        if self.scheme == "http":
+            return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+        context = ssl.create_default_context()
+        if not self.validate_certs:
+            context.check_hostname = False
+            context.verify_mode = ssl.CERT_NONE
+
+        return http.client.HTTPSConnection(self.host, self.port, timeout=self.timeout, context=context)
+
+    def _acquire(self) -> Tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            if self._idle:
+                return self._idle.pop(), True
+
+            return self._new_connection(), False
+
+    def _release(self, connection: http.client.HTTPConnection) -> None:
+        with self._lock:
+            if len(self._idle) < self.maxsize:
+                self._idle.append(connection)
+                return
+
+        connection.close()
+
+    def open(
+        self, method: str, url: str, body: Optional[str] = None, headers: Optional[Dict[str, str]] = None
+    ) -> Tuple[http.client.HTTPConnection, http.client.HTTPResponse]:
+        """Send a request and return its connection and unread response, hand both back with `finish()`."""
+        connection, reused = self._acquire()
+        try:
+            return connection, self._start(connection, method, url, body, headers or {})
+        except (http.client.HTTPException, ConnectionError):
+            if not reused:
+                raise
+
+        # The server may have dropped an idle keep-alive connection, retry once on a fresh one.
+        with self._lock:
+            connection = self._new_connection()
+
+        return connection, self._start(connection, method, url, body, headers or {})
+
+    def _start(
+        self,
+        connection: http.client.HTTPConnection,
+        method: str,
+        url: str,
+        body: Optional[str],
+        headers: Dict[str, str],
+    ) -> http.client.HTTPResponse:
+        try:
+            connection.request(method, url, body=body, headers=headers)
+            return connection.getresponse()
+        except BaseException:
+            connection.close()
+            raise
+
+    def finish(self, connection: http.client.HTTPConnection, response: http.client.HTTPResponse) -> None:
+        """Return the connection to the pool, unless the response was not read to the end."""
+        if response.isclosed() and not response.will_close:
+            self._release(connection)
+        else:
+            connection.close()
+
+    def request(
+        self, method: str, url: str, body: Optional[str] = None, headers: Optional[Dict[str, str]] = None
+    ) -> Tuple[int, str, bytes]:
+        connection, response = self.open(method, url, body, headers)
+        try:
+            data = response.read()
+        except BaseException:
+            connection.close()
+            raise
+
+        self.finish(connection, response)
+        return response.status, response.reason, data
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+
+        for connection in idle:
+            connection.close()
+
+
+class PveApi:
+    """Client talking to the Proxmox VE REST API, use `create_api_client` to bind it to an endpoint."""
+
+    _pool: Optional[ConnectionPool] = None
+    _auth: Optional[str] = None
+    _base_path = "/api2/json"
+    _retry_policy = RetryPolicy()
+    _collector: Optional[MetricsCollector] = None
+    _methods = {"GET": "get", "PUT": "set", "POST": "create", "DELETE": "delete"}
+
+    def __init__(self, path: str) -> None:
+        self._connections()
+        self._path = normalize_path(path.strip("/"))
+        self._options: Dict[str, str] = {}
+
+    @classmethod
+    def _connections(cls) -> ConnectionPool:
+        if cls._pool is None:
+            raise RuntimeError("PveApi is not bound to any endpoint, use create_api_client() to create a client")
+
+        return cls._pool
+
+    def _url(self, query: bool) -> str:
+        url = f"{self._base_path}/{quote(self._path)}"
+        if query and self._options:
+            url += f"?{urlencode(self._options)}"
+
+        return url
+
+    def _headers(self, has_body: bool) -> Dict[str, str]:
+        headers = {"Accept": "application/json"}
+        if self._auth:
+            headers["Authorization"] = self._auth
+
+        if has_body:
+            headers["Content-Type"] = "application/x-www-form-urlencoded"
+
+        return headers
+
+    def __decode_output(self, body: bytes) -> Any:
+        if body == b"":
+            return {}
+
+        try:
+            data = json.loads(body.decode("utf-8"))
+        except json.JSONDecodeError as e:
+            return {"stdout": body.decode("utf-8"), "error": str(e)}
+
+        data = data.get("data") if isinstance(data, dict) else data
+        return {} if data is None else data
+
+    def _request(self, method: str) -> Any:
+        return self._retry_policy.run(self._methods[method], lambda: self._send(method))
+
+    def _send(self, method: str) -> Any:
+        has_body = method in ("POST", "PUT")
+        body = urlencode(self._options) if has_body else None
+        started = time.perf_counter()
+        try:
+            url, headers = self._url(not has_body), self._headers(has_body)
+            status, reason, data = self._connections().request(method, url, body, headers)
+        except (http.client.HTTPException, OSError) as e:
+            self._record(method, started, -1, 0)
+            raise TransientError(f"API request {method} {self._path} failed: {e}") from e
+
+        self._record(method, started, status, len(data))
+        if status >= 400:
+            raise self.__error(method, status, reason, data)
+
+        return self.__decode_output(data)
+
+    def _record(self, method: str, started: float, status: int, size: int) -> None:
+        if self._collector is not None:
+            seconds = time.perf_counter() - started
+            failed = not 0 < status < 400
+            self._collector.record(self._methods[method], self._path, seconds, status, size, failed=failed)
+
+    def __error(self, method: str, status: int, reason: str, body: bytes) -> Exception:
+        errors = self.__errors(body)
+        message = f"API request {method} {self._path} failed with status {status}: {reason} {errors}".strip()
+        return create_error(message, status)
+
+    def __errors(self, body: bytes) -> str:
+        try:
+            errors = json.loads(body.decode("utf-8")).get("errors")
+        except (ValueError, AttributeError):
+            return ""
+
+        return json.dumps(errors) if errors else ""
+
+    def add_option(self, name: str, value: str = "") -> "PveApi":
+        self._options[name] = str(value)
+        return self
+
+    def create(self) -> Any:
+        return self._request("POST")
+
+    def get(self) -> Any:
+        return self._request("GET")
+
+    def get_iter(self) -> Iterator[Any]:
+        """Stream the records of a list response from the HTTP body instead of decoding it at once.
+
+        Streamed calls are not retried, records may already have been consumed when a call fails.
+        """
+        started = time.perf_counter()
+        try:
+            connection, response = self._connections().open("GET", self._url(True), headers=self._headers(False))
+        except (http.client.HTTPException, OSError) as e:
+            self._record("GET", started, -1, 0)
+            raise TransientError(f"API request GET {self._path} failed: {e}") from e
+
+        chunks = ChunkReader(response)
+        try:
+            if response.status >= 400:
+                raise self.__error("GET", response.status, response.reason, b"".join(chunks))
+
+            yield from iter_json_array(chunks, key="data")
+        finally:
+            self._connections().finish(connection, response)
+            self._record("GET", started, response.status, chunks.size)
+
+    def set(self) -> Any:
+        return self._request("PUT")
+
+    def delete(self) -> Any:
+        return self._request("DELETE")
+
+    def get_document(self, url: str) -> bytes:
+        """Raw `GET` of a document served next to the API, like the schema of the API viewer."""
+        started = time.perf_counter()
+        try:
+            status, reason, data = self._connections().request("GET", url, headers=self._headers(False))
+        except (http.client.HTTPException, OSError) as e:
+            self._record("GET", started, -1, 0)
+            raise TransientError(f"API request GET {url} failed: {e}") from e
+
+        self._record("GET", started, status, len(data))
+        if status >= 400:
+            raise self.__error("GET", status, reason, data)
+
+        return data
+
+    def copy(self) -> "PveApi":
+        clone = self.__class__(self._path)
+        clone._options = deepcopy(self._options)
+        return clone
+
+    def __str__(self) -> str:
+        return f"PveApi({self._path}) with options {self._options}"
+
+
+def create_api_client(
+    host: str,
+    token_id: Optional[str] = None,
+    token_secret: Optional[str] = None,
+    port: int = 8006,
+    scheme: str = "https",
+    validate_certs: bool = True,
+    timeout: float = 30.0,
+) -> type[PveApi]:
+    """Create a `PveApi` class bound to one endpoint, all instances share its connection pool."""
+    pool = ConnectionPool(host, port=port, scheme=scheme, validate_certs=validate_certs, timeout=timeout)
+    auth = f"PVEAPIToken={token_id}={token_secret}" if token_id else None
+
+    class PveApiClient(PveApi):
+        _pool = pool
+        _auth = auth
+
+    return PveApiClient
@@ -0,0 +1,27 @@
+from typing import Any, AsyncIterator, Protocol
+
+
+class AsyncClient(Protocol):
+    def __init__(self, path: str) -> None:
+        """Client for the API `path`, calls are awaited."""
+
+    async def get(self) -> Any:
+        """Read the resource."""
+
+    def get_iter(self) -> AsyncIterator[Any]:
+        """Stream the records of a list response."""
+
+    async def get_document(self, url: str) -> bytes:
+        """Document served next to the API, like the schema of the API viewer."""
+
+    async def create(self) -> Any:
+        """Create the resource, with the added options."""
+
+    async def set(self) -> Any:
+        """Update the resource, with the added options."""
+
+    async def delete(self) -> Any:
+        """Delete the resource."""
+
+    def add_option(self, field: str, value: str) -> "AsyncClient":
+        """Add an option to the call and return the client."""
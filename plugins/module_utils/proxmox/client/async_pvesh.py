@@ -0,0 +1,130 @@
+import asyncio
+import json
+import tempfile
+import time
+import weakref
+from typing import Any, AsyncIterator
+from .errors import TransientError
+from .pvesh import Pvesh, CommandResult
+from .stream import AsyncChunkReader, aiter_json_array
+
+
+class AsyncPvesh:
+    """Pvesh client running calls as asyncio subprocesses.
+
+    At most `_max_in_flight` calls of the class run at once per event loop, the rest wait on a semaphore.
+    """
+
+    _pvesh_class: type[Pvesh] = Pvesh
+    _max_in_flight: int = 8
+    _semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]"
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._semaphores = weakref.WeakKeyDictionary()
+
+    def __init__(self, path: str) -> None:
+        self._request = self._pvesh_class(path)
+
+    @classmethod
+    def _semaphore(cls) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if loop not in cls._semaphores:
+            cls._semaphores[loop] = asyncio.Semaphore(cls._max_in_flight)
+
+        return cls._semaphores[loop]
+
+    async def _exec(self, command: list[str]) -> CommandResult:
+        process = await asyncio.create_subprocess_exec(
+            *command,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        stdout, stderr = await process.communicate()
+        return CommandResult(
+            return_code=await process.wait(),
+            stderr=stderr,
+            stdout=stdout,
+        )
+
+    async def _pvesh(self, method: str) -> Any:
+        command = self._request._create_cmd(method)
+        return await self._request._retry_policy.run_async(method, lambda: self._call(method, command))
+
+    async def _call(self, method: str, command: list[str]) -> Any:
+        async with self._semaphore():
+            started = time.perf_counter()
+            result = await self._exec(command)
+            self._request._record(method, started, result.return_code, len(result.stdout))
+
+        return self._request._parse_result(command, result)
+
+    def add_option(self, name: str, value: str = "") -> "AsyncPvesh":
+        self._request.add_option(name, value)
+        return self
+
+    async def create(self) -> Any:
+        return await self._pvesh("create")
+
+    async def get(self) -> Any:
+        return await self._pvesh("get")
+
+    async def get_iter(self) -> AsyncIterator[Any]:
+        """Stream the records of a list response from the pvesh output, see `Pvesh.get_iter`.
+
+        The call holds its place in the semaphore until the records are consumed or the iterator is closed.
+        """
+        command = self._request._create_cmd("get")
+        async with self._semaphore():
+            started = time.perf_counter()
+            with tempfile.TemporaryFile() as stderr:
+                process = await asyncio.create_subprocess_exec(*command, stdout=asyncio.subprocess.PIPE, stderr=stderr)
+                if process.stdout is None:
+                    process.kill()
+                    await process.wait()
+                    raise TransientError(f"Pvesh command {command} was started without an output pipe")
+
+                chunks = AsyncChunkReader(process.stdout)
+                try:
+                    async for record in aiter_json_array(chunks):
+                        yield record
+                except GeneratorExit:
+                    process.kill()
+                    raise
+                except json.JSONDecodeError:
+                    if await process.wait() == 0:
+                        raise
+                finally:
+                    return_code = await process.wait()
+                    self._request._record("get", started, return_code, chunks.size)
+
+                if return_code != 0:
+                    stderr.seek(0)
+                    result = CommandResult(return_code=return_code, stderr=stderr.read(), stdout=b"")
+                    self._request._parse_result(command, result)
+
+    async def get_document(self, url: str) -> bytes:
+        # a local file read, kept off the event loop
+        return await asyncio.to_thread(self._request.get_document, url)
+
+    async def set(self) -> Any:
+        return await self._pvesh("set")
+
+    async def delete(self) -> Any:
+        return await self._pvesh("delete")
+
+    def __str__(self) -> str:
+        return f"AsyncPvesh({self._request})"
+
+
+AsyncPvesh._semaphores = weakref.WeakKeyDictionary()
+
+
+def create_async_pvesh(max_in_flight: int = 8, pvesh: type[Pvesh] = Pvesh) -> type[AsyncPvesh]:
+    """Create an `AsyncPvesh` class with its own bound of concurrent calls."""
+
+    class BoundedAsyncPvesh(AsyncPvesh):
+        _pvesh_class = pvesh
+        _max_in_flight = max_in_flight
+
+    return BoundedAsyncPvesh
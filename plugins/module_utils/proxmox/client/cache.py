@@ -0,0 +1,146 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+from copy import deepcopy
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+from .client import Client
+from .pvesh import normalize_path
+from .stream import iter_records
+
+CacheKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+# `cluster/resources` lists guests, pools and HA states, writes to any of them change it
+SUMMARIZED_PATHS = re.compile(r"^(nodes/[^/]+/(qemu|lxc)|pools|cluster/ha)(/|$)")
+# task status and logs change while the task runs, they are polled and never served from the cache
+UNCACHED_PATHS = re.compile(r"^nodes/[^/]+/tasks(/|$)")
+
+
+class ResponseCache:
+    """LRU cache of `get()` responses keyed by path and options, entries expire after `ttl` seconds."""
+
+    def __init__(self, ttl: float = 60.0, maxsize: int = 256, clock: Callable[[], float] = time.monotonic) -> None:
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._clock = clock
+        self._entries: OrderedDict[CacheKey, Tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: CacheKey) -> Tuple[bool, Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= self._clock():
+                self._entries.pop(key, None)
+                self.misses += 1
+                return False, None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, deepcopy(entry[1])
+
+    def put(self, key: CacheKey, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl, deepcopy(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, path: str) -> None:
+        """Drop entries affected by a write to `path`.
+
+        Writes usually target a sibling of the cached path (`qemu/101/resize` changes `qemu/101/config`),
+        so everything below the parent of `path`, and every listing above it, is dropped. Writes to guests, pools
+        and HA also drop `cluster/resources`.
+        """
+        path = normalize_path(path.strip("/"))
+        scope = path.rpartition("/")[0]
+        summary = "cluster/resources" if SUMMARIZED_PATHS.match(path) else None
+        with self._lock:
+            for key in list(self._entries):
+                cached = key[0]
+                below = cached == scope or cached.startswith(f"{scope}/")
+                if not scope or below or scope.startswith(f"{cached}/") or cached == summary:
+                    del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+
+class CachingClient:
+    """Client wrapper serving `get()` from a shared `ResponseCache`, use `create_caching_client` to build one."""
+
+    cache: ResponseCache
+    _client: type[Client]
+
+    def __init__(self, path: str) -> None:
+        self._path = normalize_path(path.strip("/"))
+        self._options: Dict[str, str] = {}
+        self._request = self._client(path)
+
+    def add_option(self, name: str, value: str = "") -> "CachingClient":
+        self._options[name] = str(value)
+        self._request.add_option(name, value)
+        return self
+
+    def _key(self) -> CacheKey:
+        return self._path, tuple(sorted(self._options.items()))
+
+    def get(self) -> Any:
+        if UNCACHED_PATHS.match(self._path):
+            return self._request.get()
+
+        found, value = self.cache.get(self._key())
+        if found:
+            return value
+
+        value = self._request.get()
+        self.cache.put(self._key(), value)
+        return value
+
+    def get_iter(self) -> Iterator[Any]:
+        # streamed responses are too large to be worth caching, only already cached ones are reused
+        found, value = self.cache.get(self._key())
+        if found:
+            return iter(value if isinstance(value, list) else [value] if value else [])
+
+        return iter_records(self._request)
+
+    def get_document(self, url: str) -> bytes:
+        return self._request.get_document(url)
+
+    def _write(self, method: Callable[[], Any]) -> Any:
+        try:
+            return method()
+        finally:
+            self.cache.invalidate(self._path)
+
+    def create(self) -> Any:
+        return self._write(self._request.create)
+
+    def set(self) -> Any:
+        return self._write(self._request.set)
+
+    def delete(self) -> Any:
+        return self._write(self._request.delete)
+
+    def __str__(self) -> str:
+        return f"CachingClient({self._request})"
+
+
+def create_caching_client(
+    client: type[Client], cache: Optional[ResponseCache] = None, ttl: float = 60.0, maxsize: int = 256
+) -> type[CachingClient]:
+    """Wrap `client` so `get()` is served from `cache` and writes invalidate the cached paths they affect."""
+    response_cache = cache or ResponseCache(ttl=ttl, maxsize=maxsize)
+
+    class ClientWithCache(CachingClient):
+        cache = response_cache
+        _client = client
+
+    return ClientWithCache
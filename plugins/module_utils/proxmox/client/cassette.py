@@ -0,0 +1,237 @@
+import gzip
+import json
+import os
+import re
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple
+from . import errors
+from .client import Client
+from .errors import ProxmoxError
+from .pvesh import normalize_path
+from .stream import iter_records
+
+Interaction = Dict[str, Any]
+InteractionKey = Tuple[str, str, Tuple[Tuple[str, str], ...]]
+
+REDACTED = "**********"
+# options and response fields holding credentials, cassettes are shared and never hold their values
+SECRET_FIELDS = frozenset(["cipassword", "sshkeys", "password", "eab-hmac-key", "eab_hmac_key", "api_token_secret"])
+# the `data` of ACME plugins holds the credentials of the DNS API
+_SECRET_DATA_PATHS = re.compile(r"^cluster/acme/plugins(/|$)")
+
+
+class CassetteMiss(Exception):
+    pass
+
+
+class Cassette:
+    """Recorded client exchanges: the call, its response or error and how long it took.
+
+    Saved as compact JSON, gzip compressed when the file name ends with `.gz`.
+    """
+
+    version = 1
+
+    def __init__(self, interactions: Optional[List[Interaction]] = None) -> None:
+        self.interactions: List[Interaction] = interactions or []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: str) -> "Cassette":
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rt", encoding="utf-8") as f:
+            data = json.load(f)
+
+        if data.get("version") != cls.version:
+            raise ValueError(f"Unsupported cassette version {data.get('version')} in {path}")
+
+        return cls(data["interactions"])
+
+    def save(self, path: str) -> None:
+        opener = gzip.open if path.endswith(".gz") else open
+        with self._lock:
+            data = {"version": self.version, "interactions": list(self.interactions)}
+
+        tmp_path = f"{path}.tmp"
+        with opener(tmp_path, "wt", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+
+        os.replace(tmp_path, path)
+
+    def append(self, interaction: Interaction) -> None:
+        with self._lock:
+            self.interactions.append(interaction)
+
+    def __len__(self) -> int:
+        return len(self.interactions)
+
+
+def redact(path: str, value: Any) -> Any:
+    """Copy of the options or the response of a call to `path` with the values of secret fields masked."""
+    secrets = SECRET_FIELDS | {"data"} if _SECRET_DATA_PATHS.match(normalize_path(path.strip("/"))) else SECRET_FIELDS
+    return _redact(value, secrets)
+
+
+def _redact(value: Any, secrets: frozenset) -> Any:
+    if isinstance(value, dict):
+        return {
+            key: REDACTED if key in secrets and item is not None else _redact(item, secrets)
+            for key, item in value.items()
+        }
+
+    if isinstance(value, list):
+        return [_redact(item, secrets) for item in value]
+
+    return value
+
+
+def _key(method: str, path: str, options: Dict[str, str]) -> InteractionKey:
+    # recorded options are redacted, replayed calls are matched the same way
+    return method, normalize_path(path.strip("/")), tuple(sorted(redact(path, options).items()))
+
+
+class RecordingClient:
+    """Client wrapper recording every call into a `Cassette`, use `create_recording_client` to build one."""
+
+    cassette: Cassette
+    _client: type[Client]
+    _clock: Callable[[], float] = time.perf_counter
+
+    def __init__(self, path: str) -> None:
+        self._path = normalize_path(path.strip("/"))
+        self._options: Dict[str, str] = {}
+        self._request = self._client(path)
+
+    def add_option(self, name: str, value: str = "") -> "RecordingClient":
+        self._options[name] = str(value)
+        self._request.add_option(name, value)
+        return self
+
+    def _record(self, method: str, call: Callable[[], Any]) -> Any:
+        interaction: Interaction = {"method": method, "path": self._path, "options": redact(self._path, self._options)}
+        started = self._clock()
+        try:
+            response = call()
+            interaction["response"] = redact(self._path, response)
+            return response
+        except Exception as e:
+            interaction["error"] = {"type": type(e).__name__, "message": str(e), "status": getattr(e, "status", None)}
+            raise
+        finally:
+            interaction["seconds"] = round(self._clock() - started, 6)
+            self.cassette.append(interaction)
+
+    def get(self) -> Any:
+        return self._record("get", self._request.get)
+
+    def get_iter(self) -> Iterator[Any]:
+        # recorded as a plain `get`, the cassette holds the whole list anyway
+        return iter(self._record("get", lambda: list(iter_records(self._request))))
+
+    def get_document(self, url: str) -> bytes:
+        # documents are not API calls, they are neither recorded nor replayed
+        return self._request.get_document(url)
+
+    def create(self) -> Any:
+        return self._record("create", self._request.create)
+
+    def set(self) -> Any:
+        return self._record("set", self._request.set)
+
+    def delete(self) -> Any:
+        return self._record("delete", self._request.delete)
+
+    def __str__(self) -> str:
+        return f"RecordingClient({self._request})"
+
+
+def create_recording_client(client: type[Client], cassette: Optional[Cassette] = None) -> type[RecordingClient]:
+    """Wrap `client` so every call, with its response or error and duration, is appended to `cassette`."""
+    recorded = cassette if cassette is not None else Cassette()
+    return type("ClientWithRecording", (RecordingClient,), {"cassette": recorded, "_client": client})
+
+
+class ReplayClient:
+    """Client serving the calls recorded in a cassette, use `create_replay_client` to build one.
+
+    Calls are matched by method, path and options. Identical calls get the recorded responses in order,
+    the last one is repeated once they run out so changed handlers can still be replayed.
+    """
+
+    latency: float = 0.0
+    _pending: Dict[InteractionKey, Deque[Interaction]]
+    _last: Dict[InteractionKey, Interaction]
+    _lock: threading.Lock
+    _sleep: Callable[[float], None] = time.sleep
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+        self._options: Dict[str, str] = {}
+
+    def add_option(self, name: str, value: str = "") -> "ReplayClient":
+        self._options[name] = str(value)
+        return self
+
+    def _next(self, method: str) -> Interaction:
+        key = _key(method, self._path, self._options)
+        with self._lock:
+            pending = self._pending.get(key)
+            if pending:
+                self._last[key] = pending.popleft()
+
+            interaction = self._last.get(key)
+
+        if interaction is None:
+            raise CassetteMiss(f"No recorded {method} call for {key[1]} with options {self._options}")
+
+        return interaction
+
+    def _replay(self, method: str) -> Any:
+        interaction = self._next(method)
+        if self.latency:
+            self._sleep(interaction.get("seconds", 0.0) * self.latency)
+
+        error = interaction.get("error")
+        if error:
+            error_class = getattr(errors, error["type"], None)
+            if not isinstance(error_class, type) or not issubclass(error_class, ProxmoxError):
+                error_class = ProxmoxError
+
+            raise error_class(error["message"], error.get("status"))
+
+        return interaction.get("response")
+
+    def get(self) -> Any:
+        return self._replay("get")
+
+    def get_iter(self) -> Iterator[Any]:
+        data = self._replay("get")
+        return iter(data if isinstance(data, list) else [data] if data else [])
+
+    def get_document(self, url: str) -> bytes:
+        raise CassetteMiss(f"Documents are not recorded, no {url} in the cassette")
+
+    def create(self) -> Any:
+        return self._replay("create")
+
+    def set(self) -> Any:
+        return self._replay("set")
+
+    def delete(self) -> Any:
+        return self._replay("delete")
+
+    def __str__(self) -> str:
+        return f"ReplayClient({self._path}) with options {self._options}"
+
+
+def create_replay_client(cassette: Cassette, latency: float = 0.0) -> type[ReplayClient]:
+    """Create a client replaying `cassette`, sleeping `latency` times the recorded duration of each call."""
+    pending: Dict[InteractionKey, Deque[Interaction]] = {}
+    for interaction in cassette.interactions:
+        key = _key(interaction["method"], interaction["path"], interaction["options"])
+        pending.setdefault(key, deque()).append(interaction)
+
+    attributes = {"latency": latency, "_pending": pending, "_last": {}, "_lock": threading.Lock()}
+    return type("ClientWithReplay", (ReplayClient,), attributes)
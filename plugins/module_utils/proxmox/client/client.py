@@ -1,15 +1,27 @@
-from typing import Protocol
+from typing import Any, Iterator, Protocol
 
 
 class Client(Protocol):
-    def __init__(self, path: str) -> None: ...
+    def __init__(self, path: str) -> None:
+        """Client for the API `path`."""
 
-    def get(self) -> dict: ...
+    def get(self) -> Any:
+        """Read the resource."""
 
-    def create(self) -> None: ...
+    def get_iter(self) -> Iterator[Any]:
+        """Read the records of a list response one at a time."""
 
-    def set(self) -> None: ...
+    def get_document(self, url: str) -> bytes:
+        """Raw document served next to the API, like the schema of the API viewer."""
 
-    def delete(self) -> None: ...
+    def create(self) -> Any:
+        """Create the resource, with the added options. Returns the task UPID when one was started."""
 
-    def add_option(self, field: str, value: str) -> "Client": ...
+    def set(self) -> Any:
+        """Update the resource, with the added options. Returns the task UPID when one was started."""
+
+    def delete(self) -> Any:
+        """Delete the resource. Returns the task UPID when one was started."""
+
+    def add_option(self, field: str, value: str) -> "Client":
+        """Add an option to the call and return the client."""
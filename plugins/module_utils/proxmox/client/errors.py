@@ -0,0 +1,84 @@
+import re
+from typing import List, Optional, Tuple
+
+
+class ProxmoxError(Exception):
+    """Failed Proxmox call, subclasses tell why so callers do not have to match error messages."""
+
+    retryable = False
+
+    def __init__(self, message: str, status: Optional[int] = None) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+class NotFoundError(ProxmoxError):
+    pass
+
+
+class LockedError(ProxmoxError):
+    retryable = True
+
+
+class PermissionDeniedError(ProxmoxError):
+    pass
+
+
+class ValidationError(ProxmoxError):
+    pass
+
+
+class TransientError(ProxmoxError):
+    retryable = True
+
+
+class ConflictError(ProxmoxError):
+    """The config changed since it was read, the write was made against a stale `digest`."""
+
+
+# First match wins. Validation and conflict messages can quote a missing value ("storage 'x' does not exist"),
+# they are matched before the not found messages.
+_message_patterns: List[Tuple[type[ProxmoxError], re.Pattern]] = [
+    (LockedError, re.compile(r"can't lock file|cfs-lock .* error|(VM|CT) is locked|got lock request timeout", re.I)),
+    (
+        ValidationError,
+        re.compile(r"Parameter verification failed|unable to parse|value does not match|invalid format", re.I),
+    ),
+    (ConflictError, re.compile(r"detected modified configuration", re.I)),
+    (PermissionDeniedError, re.compile(r"Permission check failed|permission denied|authentication failure", re.I)),
+    (
+        NotFoundError,
+        re.compile(
+            r"does not exist|no such (ha group|resource|task)|ACME plugin '.*' not defined",
+            re.I,
+        ),
+    ),
+    (
+        TransientError,
+        re.compile(r"ipcc_send_rec|Connection refused|connection timed out|temporarily unavailable|broken pipe", re.I),
+    ),
+]
+
+_status_errors = {
+    400: ValidationError,
+    401: PermissionDeniedError,
+    403: PermissionDeniedError,
+    404: NotFoundError,
+    502: TransientError,
+    503: TransientError,
+    504: TransientError,
+    595: TransientError,
+}
+
+
+def classify_error(message: str, status: Optional[int] = None) -> type[ProxmoxError]:
+    """Map a pvesh error output or an API status and reason to the matching error type."""
+    for error, pattern in _message_patterns:
+        if pattern.search(message):
+            return error
+
+    return _status_errors.get(status or 0, ProxmoxError)
+
+
+def create_error(message: str, status: Optional[int] = None) -> ProxmoxError:
+    return classify_error(message, status)(message, status)
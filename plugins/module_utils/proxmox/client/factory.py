@@ -0,0 +1,82 @@
+import atexit
+import os
+from typing import Optional, cast
+from ...utils import AnsibleParams
+from .client import Client
+from .pvesh import Pvesh
+from .pvesh_session import PveshSession
+from .api import create_api_client
+from .cache import create_caching_client
+from .cassette import Cassette, create_recording_client
+from .metrics import MetricsCollector, with_collector
+from .retry import RetryPolicy, with_retry_policy
+from .schema import create_validating_client, load_api_schema, read_apidoc
+
+CLIENT_ARGUMENT_SPEC = dict(
+    api_host=dict(type="str"),
+    api_port=dict(type="int", default=8006),
+    api_token_id=dict(type="str"),
+    api_token_secret=dict(type="str", no_log=True),
+    validate_certs=dict(type="bool", default=True),
+    pvesh_session=dict(type="bool", default=False),
+    cache_responses=dict(type="bool", default=False),
+    retries=dict(type="int", default=3),
+    retry_budget=dict(type="float", default=30.0),
+    metrics=dict(type="bool", default=False),
+    record_cassette=dict(type="path"),
+    api_schema_cache=dict(type="path"),
+)
+
+
+def metrics_from_params(params: AnsibleParams) -> Optional[MetricsCollector]:
+    return MetricsCollector() if params.get("metrics") else None
+
+
+def client_from_params(params: AnsibleParams, collector: Optional[MetricsCollector] = None) -> type[Client]:
+    """Pick the client for a module run: the REST API when `api_host` is given, local pvesh otherwise.
+
+    With `collector`, every call reaching the cluster is recorded there, cache hits are not.
+    """
+    transport = _transport_from_params(params)
+    client = transport
+    if collector is not None:
+        client = with_collector(client, collector)
+
+    # options are typed by CLIENT_ARGUMENT_SPEC, AnsibleModule has coerced them already
+    if params.get("retries") is not None:
+        attempts, budget = cast(int, params["retries"]) + 1, cast(float, params.get("retry_budget") or 30.0)
+        policy = RetryPolicy(attempts=attempts, budget=budget)
+        client = with_retry_policy(client, policy)
+
+    if params.get("record_cassette"):
+        client = _recording_client(client, cast(str, params["record_cassette"]))
+
+    if params.get("api_schema_cache"):
+        directory, host = cast(str, params["api_schema_cache"]), cast(str, params.get("api_host") or "localhost")
+        schema = load_api_schema(client, directory, lambda: read_apidoc(transport), host)
+        client = create_validating_client(client, schema)
+
+    if params.get("cache_responses"):
+        return create_caching_client(client)
+
+    return client
+
+
+def _recording_client(client: type[Client], path: str) -> type[Client]:
+    # calls of every run are appended, so one file can hold the traffic of a whole playbook
+    cassette = Cassette.load(path) if os.path.exists(path) else Cassette()
+    atexit.register(cassette.save, path)
+    return create_recording_client(client, cassette)
+
+
+def _transport_from_params(params: AnsibleParams) -> type[Client]:
+    if not params.get("api_host"):
+        return PveshSession if params.get("pvesh_session") else Pvesh
+
+    return create_api_client(
+        host=cast(str, params["api_host"]),
+        token_id=cast(Optional[str], params.get("api_token_id")),
+        token_secret=cast(Optional[str], params.get("api_token_secret")),
+        port=cast(int, params.get("api_port") or 8006),
+        validate_certs=cast(bool, params.get("validate_certs", True)),
+    )
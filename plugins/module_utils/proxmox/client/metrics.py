@@ -0,0 +1,128 @@
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass
+class CallRecord:
+    method: str
+    path: str
+    seconds: float
+    return_code: int
+    size: int
+    failed: bool = False
+    phase: Optional[str] = None
+
+
+class MetricsCollector:
+    """Records every call made by instrumented clients, see `with_collector`.
+
+    Calls are attributed to the innermost phase open in the calling thread, so handlers running in
+    parallel threads keep their phases apart. Work a handler hands to other threads takes its phases
+    along through `in_current_phase`.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter) -> None:
+        self.records: List[CallRecord] = []
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._phase_seconds: Dict[str, float] = {}
+
+    def _phases(self) -> List[str]:
+        if not hasattr(self._local, "phases"):
+            self._local.phases = []
+
+        phases: List[str] = self._local.phases
+        return phases
+
+    def current_phase(self) -> Optional[str]:
+        phases = self._phases()
+        return phases[-1] if phases else None
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Attribute the calls made inside the block to `name` and measure its wall time."""
+        phases = self._phases()
+        phases.append(name)
+        started = self._clock()
+        try:
+            yield
+        finally:
+            phases.pop()
+            with self._lock:
+                self._phase_seconds[name] = self._phase_seconds.get(name, 0.0) + self._clock() - started
+
+    def in_current_phase(self, call: Callable[[], T]) -> Callable[[], T]:
+        """`call` attributing its calls to the phases open now, wherever it runs, without counting phase time twice."""
+        phases = list(self._phases())
+
+        def run() -> T:
+            stack = self._phases()
+            depth = len(stack)
+            stack.extend(phases)
+            try:
+                return call()
+            finally:
+                del stack[depth:]
+
+        return run
+
+    def record(self, method: str, path: str, seconds: float, return_code: int, size: int, failed: bool = False) -> None:
+        """Record a call, `return_code` is the pvesh exit code or the API HTTP status."""
+        record = CallRecord(method, path, seconds, return_code, size, failed, self.current_phase())
+        with self._lock:
+            self.records.append(record)
+
+    def calls(self, method: Optional[str] = None, phase: Optional[str] = None) -> List[CallRecord]:
+        with self._lock:
+            records = list(self.records)
+
+        return [
+            record
+            for record in records
+            if (method is None or record.method == method) and (phase is None or record.phase == phase)
+        ]
+
+    def count(self, method: Optional[str] = None, phase: Optional[str] = None) -> int:
+        return len(self.calls(method, phase))
+
+    def reset(self) -> None:
+        with self._lock:
+            self.records.clear()
+            self._phase_seconds.clear()
+
+    def summary(self, slowest: int = 5) -> Dict[str, Any]:
+        """Totals for the module result: overall, per phase and per method, plus the slowest calls."""
+        records = self.calls()
+        phases: Dict[str, Dict[str, Any]] = {}
+        for name, seconds in self._phase_seconds.items():
+            phases[name] = self._totals([record for record in records if record.phase == name])
+            phases[name]["wall_seconds"] = round(seconds, 6)
+
+        return {
+            **self._totals(records),
+            "phases": phases,
+            "methods": {
+                method: self._totals([record for record in records if record.method == method])
+                for method in sorted(set(record.method for record in records))
+            },
+            "slowest": [asdict(record) for record in sorted(records, key=lambda r: r.seconds, reverse=True)[:slowest]],
+        }
+
+    def _totals(self, records: List[CallRecord]) -> Dict[str, Any]:
+        return {
+            "calls": len(records),
+            "seconds": round(sum(record.seconds for record in records), 6),
+            "bytes": sum(record.size for record in records),
+            "errors": sum(1 for record in records if record.failed),
+        }
+
+
+def with_collector(client: type[T], collector: MetricsCollector) -> type[T]:
+    """Subclass `client` (`Pvesh`, `PveApi` and their variants) to record its calls into `collector`."""
+    return type(client.__name__, (client,), {"_collector": collector})
@@ -1,8 +1,19 @@
 import subprocess
 import json
-from typing import Optional, Dict
+import tempfile
+import time
+from typing import Any, Iterator, Optional, Dict
 from copy import deepcopy
 from dataclasses import dataclass
+from .errors import TransientError, create_error
+from .retry import RetryPolicy
+from .metrics import MetricsCollector
+from .stream import ChunkReader, iter_json_array
+
+
+def normalize_path(path: str) -> str:
+    # task UPIDs are case sensitive, everything else is matched lowercase
+    return "/".join(part if part.startswith("UPID:") else part.lower() for part in path.split("/"))
 
 
 @dataclass
@@ -13,13 +24,18 @@ class CommandResult:
 
 
 class Pvesh:
+    _retry_policy = RetryPolicy()
+    _collector: Optional[MetricsCollector] = None
+    _command = "/usr/bin/pvesh"
+    # pveproxy serves /pve-docs and friends from here
+    _document_root = "/usr/share"
+
     def __init__(self, path: str) -> None:
-        self._command = "/usr/bin/pvesh"
         self._format = "json"
-        self._path = path.lower()
-        self._options: Dict[str] = {}
+        self._path = normalize_path(path)
+        self._options: Dict[str, str] = {}
 
-    def __create_cmd(self, method: str) -> list[str]:
+    def _create_cmd(self, method: str) -> list[str]:
         # call pvesh command with the given path
         command = [self._command, method, self._path]
         for key, value in self._options.items():
@@ -41,7 +57,7 @@ class Pvesh:
             stdout=stdout,
         )
 
-    def __decode_output(self, stdout: bytes) -> dict:
+    def __decode_output(self, stdout: bytes) -> Any:
         if stdout == b"":
             return {}
 
@@ -50,14 +66,56 @@ class Pvesh:
         except json.JSONDecodeError as e:
             return {"stdout": stdout.decode("utf-8"), "error": str(e)}
 
-    def _pvesh(self, method: str) -> Optional[dict]:
-        command = self.__create_cmd(method)
+    def _pvesh(self, method: str) -> Any:
+        command = self._create_cmd(method)
+        return self._retry_policy.run(method, lambda: self._parse_result(command, self._timed_run(method, command)))
+
+    def _timed_run(self, method: str, command: list[str]) -> CommandResult:
+        started = time.perf_counter()
         result = self._run(command)
+        self._record(method, started, result.return_code, len(result.stdout))
+        return result
+
+    def _record(self, method: str, started: float, return_code: int, size: int) -> None:
+        if self._collector is not None:
+            seconds = time.perf_counter() - started
+            self._collector.record(method, self._path, seconds, return_code, size, failed=return_code != 0)
+
+    def _parse_result(self, command: list[str], result: CommandResult) -> Any:
         if result.return_code != 0:
-            raise Exception(f"Pvesh command {command} failed with error: {result.stderr.decode('utf-8')}")
+            raise create_error(f"Pvesh command {command} failed with error: {result.stderr.decode('utf-8')}")
 
         return self.__decode_output(result.stdout)
 
+    def _stream(self, command: list[str]) -> Iterator[Any]:
+        started = time.perf_counter()
+        with tempfile.TemporaryFile() as stderr:
+            process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=stderr)
+            stdout = process.stdout
+            if stdout is None:
+                process.kill()
+                process.wait()
+                raise TransientError(f"Pvesh command {command} was started without an output pipe")
+
+            chunks = ChunkReader(stdout)
+            try:
+                yield from iter_json_array(chunks)
+            except GeneratorExit:
+                process.kill()
+                raise
+            except json.JSONDecodeError:
+                if process.wait() == 0:
+                    raise
+            finally:
+                stdout.close()
+                process.wait()
+                self._record("get", started, process.returncode, chunks.size)
+
+            if process.returncode != 0:
+                stderr.seek(0)
+                result = CommandResult(return_code=process.returncode, stderr=stderr.read(), stdout=b"")
+                self._parse_result(command, result)
+
     def add_option(self, name: str, value: str = "") -> "Pvesh":
         self._options[name] = value
         return self
@@ -66,20 +124,32 @@ class Pvesh:
         self._format = format
         return self
 
-    def create(self):
+    def create(self) -> Any:
         return self._pvesh("create")
 
-    def get(self):
+    def get(self) -> Any:
         return self._pvesh("get")
 
-    def set(self):
+    def get_iter(self) -> Iterator[Any]:
+        """Stream the records of a list response from the pvesh output instead of decoding it at once.
+
+        Streamed calls are not retried, records may already have been consumed when a call fails.
+        """
+        return self._stream(self._create_cmd("get"))
+
+    def get_document(self, url: str) -> bytes:
+        """Document served next to the API, like the schema of the API viewer, read from disk on the node."""
+        with open(f"{self._document_root}/{url.lstrip('/')}", "rb") as f:
+            return f.read()
+
+    def set(self) -> Any:
         return self._pvesh("set")
 
-    def delete(self):
+    def delete(self) -> Any:
         return self._pvesh("delete")
 
     def copy(self) -> "Pvesh":
         return deepcopy(self)
 
-    def __str__(self):
+    def __str__(self) -> str:
         return f"Pvesh({self._path}) with options {self._options}"
@@ -0,0 +1,159 @@
+import atexit
+import json
+import subprocess
+import threading
+from typing import IO, Any, Iterator, Optional, Tuple
+from .errors import TransientError
+from .pvesh import Pvesh, CommandResult
+from .stream import iter_json_array
+
+# Loads the PVE API once and serves pvesh style argument lists read from stdin, one JSON request per line.
+# Handler output is redirected to stderr so only protocol responses are written to the real stdout. The cluster
+# file system is refreshed before every request, like a new pvesh process would read it. Requests that pvesh
+# would proxy to another node are answered with `forward` and run through pvesh instead.
+_WORKER_SCRIPT = r"""
+use strict;
+use warnings;
+use JSON;
+use PVE::API2;
+use PVE::Cluster;
+use PVE::INotify;
+use PVE::RPCEnvironment;
+
+my %methods = (get => 'GET', set => 'PUT', create => 'POST', delete => 'DELETE');
+my $protocol = JSON->new->utf8->canonical;
+my $output = JSON->new->canonical->allow_nonref;
+
+my $rpcenv = PVE::RPCEnvironment->init('cli');
+$rpcenv->set_language($ENV{LANG});
+$rpcenv->set_user('root@pam');
+my $nodename = PVE::INotify::nodename();
+
+open(my $out, '>&', \*STDOUT) or die "unable to duplicate stdout - $!\n";
+$out->autoflush(1);
+open(STDOUT, '>&', \*STDERR) or die "unable to redirect stdout - $!\n";
+
+while (my $line = <STDIN>) {
+    my $response = { return_code => 0, stdout => '', stderr => '' };
+    eval {
+        my ($method, $path, @args) = @{$protocol->decode($line)->{argv}};
+        my $param = {};
+        foreach my $arg (@args) {
+            next if $arg !~ m/^--([^=]+)=(.*)$/s || $1 eq 'output-format';
+            $param->{$1} = $2;
+        }
+
+        $rpcenv->init_request();
+        PVE::Cluster::cfs_update();
+        my $uri_param = {};
+        my ($handler, $info) = PVE::API2->find_handler($methods{$method} // '', $path, $uri_param);
+        die "no '$method' handler for '$path'\n" if !$handler || !$info;
+
+        my $request_param = { %$param, %$uri_param };
+        if (my $proxyto = $info->{proxyto}) {
+            my $callback = $info->{proxyto_callback};
+            my $node = $callback ? $callback->($rpcenv, $proxyto, $request_param) : $request_param->{$proxyto};
+            if ($node && $node ne 'localhost' && $node ne $nodename) {
+                $response->{forward} = 1;
+                return;
+            }
+        }
+
+        my $data = $handler->handle($info, $request_param);
+        $response->{stdout} = $output->encode($data) if defined($data);
+    };
+    if (my $err = $@) {
+        $response->{return_code} = 255;
+        $response->{stderr} = "$err";
+    }
+    print $out $protocol->encode($response), "\n";
+}
+"""
+
+
+class PveshSession(Pvesh):
+    """Pvesh client sending every call to one long-lived worker process instead of starting pvesh each time.
+
+    The worker is shared by all instances of the class, so handlers reuse it for the whole module run.
+    """
+
+    _worker_command: list[str] = ["/usr/bin/perl", "-e", _WORKER_SCRIPT]
+    _process: Optional[subprocess.Popen] = None
+    _lock = threading.Lock()
+    _close_at_exit = False
+
+    def _run(self, command: list[str]) -> CommandResult:
+        request = json.dumps({"argv": command[1:]}).encode("utf-8") + b"\n"
+        with self._lock:
+            stdin, stdout = self._pipes(self._worker())
+            try:
+                stdin.write(request)
+                stdin.flush()
+                line = stdout.readline()
+            except BrokenPipeError:
+                line = b""
+
+            if not line:
+                self.close()
+                raise TransientError(f"Pvesh session worker exited while running command {command}")
+
+        response = json.loads(line)
+        if response.get("forward"):
+            # pvesh proxies the request to the node it is meant for
+            return super()._run(command)
+
+        return CommandResult(
+            return_code=response["return_code"],
+            stderr=response["stderr"].encode("utf-8"),
+            stdout=response["stdout"].encode("utf-8"),
+        )
+
+    def _stream(self, command: list[str]) -> Iterator[Any]:
+        """List responses of the session transport, the worker sends them whole.
+
+        Records are still decoded one at a time. Test clients answering `_run` without a process stream the same way.
+        """
+        result = self._timed_run("get", command)
+        if result.return_code != 0:
+            self._parse_result(command, result)
+
+        yield from iter_json_array([result.stdout])
+
+    @classmethod
+    def _worker(cls) -> subprocess.Popen:
+        if cls._process is None or cls._process.poll() is not None:
+            cls._process = subprocess.Popen(
+                cls._worker_command,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+
+        if not cls._close_at_exit:
+            atexit.register(cls.close)
+            cls._close_at_exit = True
+
+        return cls._process
+
+    @staticmethod
+    def _pipes(process: subprocess.Popen) -> Tuple[IO[bytes], IO[bytes]]:
+        if process.stdin is None or process.stdout is None:
+            raise TransientError("Pvesh session worker was started without pipes")
+
+        return process.stdin, process.stdout
+
+    @classmethod
+    def close(cls) -> None:
+        process, cls._process = cls._process, None
+        if process is None:
+            return
+
+        stdin, stdout = cls._pipes(process)
+        stdin.close()
+        try:
+            process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+        stdout.close()
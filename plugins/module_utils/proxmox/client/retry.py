@@ -0,0 +1,84 @@
+import asyncio
+import random
+import time
+from typing import Awaitable, Callable, TypeVar
+from .errors import LockedError, ProxmoxError
+
+T = TypeVar("T")
+
+
+class RetryPolicy:
+    """Retries calls failing with a retryable `ProxmoxError`.
+
+    Reads are retried on any retryable error. Writes are only retried when the target was locked, the call
+    failed before doing anything then, while a transient failure may hide a write that went through.
+    Every call stops after `attempts` tries or once the next pause would exceed its `budget` in seconds.
+    """
+
+    def __init__(
+        self,
+        attempts: int = 4,
+        initial_delay: float = 0.5,
+        max_delay: float = 5.0,
+        backoff: float = 2.0,
+        budget: float = 30.0,
+        jitter: float = 0.2,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+        rand: Callable[[], float] = random.random,
+    ) -> None:
+        self.attempts = attempts
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.backoff = backoff
+        self.budget = budget
+        self.jitter = jitter
+        self._clock = clock
+        self._sleep = sleep
+        self._rand = rand
+
+    def should_retry(self, method: str, error: ProxmoxError) -> bool:
+        if method == "get":
+            return error.retryable
+
+        return isinstance(error, LockedError)
+
+    def _pause(self, method: str, error: ProxmoxError, attempt: int, started: float) -> float:
+        """Seconds to wait before the next attempt, raises `error` when the call should give up."""
+        if attempt >= self.attempts or not self.should_retry(method, error):
+            raise error
+
+        delay = self.initial_delay * self.backoff ** (attempt - 1)
+        pause = min(delay * (1 + self.jitter * (2 * self._rand() - 1)), self.max_delay)
+        if self._clock() - started + pause > self.budget:
+            raise error
+
+        return pause
+
+    def run(self, method: str, call: Callable[[], T]) -> T:
+        started = self._clock()
+        attempt = 1
+        while True:
+            try:
+                return call()
+            except ProxmoxError as e:
+                self._sleep(self._pause(method, e, attempt, started))
+                attempt += 1
+
+    async def run_async(self, method: str, call: Callable[[], Awaitable[T]]) -> T:
+        started = self._clock()
+        attempt = 1
+        while True:
+            try:
+                return await call()
+            except ProxmoxError as e:
+                await asyncio.sleep(self._pause(method, e, attempt, started))
+                attempt += 1
+
+
+NO_RETRY = RetryPolicy(attempts=1)
+
+
+def with_retry_policy(client: type[T], policy: RetryPolicy) -> type[T]:
+    """Subclass `client` (`Pvesh`, `PveApi` and their variants) to use `policy` for its calls."""
+    return type(client.__name__, (client,), {"_retry_policy": policy})
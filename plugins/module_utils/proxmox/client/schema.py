@@ -0,0 +1,359 @@
+import json
+import os
+import re
+import tempfile
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from .client import Client
+from .errors import ValidationError
+from .pvesh import normalize_path
+from .stream import iter_records
+from ..property_string import format_property_string, parse_property_string
+
+# served by pveproxy next to the API, and installed on every node by pve-docs
+APIDOC_URL = "/pve-docs/api-viewer/apidoc.js"
+APIDOC_PATH = "/usr/share/pve-docs/api-viewer/apidoc.js"
+# seconds a looked up cluster version is trusted, runs within it read the cached schema without any call
+VERSION_MAX_AGE = 3600
+
+_HTTP_METHODS = {"get": "GET", "create": "POST", "set": "PUT", "delete": "DELETE"}
+_TRUE = ("1", "true", "yes", "on")
+_FALSE = ("0", "false", "no", "off")
+_INTEGER = re.compile(r"^-?\d+$")
+_NUMBER = re.compile(r"^-?(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?$")
+_INDEXED = re.compile(r"^(.*\D)(\d+)$")
+_ARGUMENT_TYPES = {"boolean": "bool", "integer": "int", "number": "float", "string": "str", "array": "list"}
+
+Properties = Dict[str, Dict[str, Any]]
+
+
+def parse_apidoc(text: str) -> List[Dict[str, Any]]:
+    """API tree from the `apidoc.js` of the API viewer, or from the plain JSON it holds."""
+    start = text.find("[", text.find("apiSchema") + 1)
+    if start < 0:
+        raise ValueError("No API schema found in the API viewer document")
+
+    tree: List[Dict[str, Any]]
+    tree, _ = json.JSONDecoder().raw_decode(text, start)
+    return tree
+
+
+class ApiSchema:
+    """Parameters of every API method, used to check options before they are sent.
+
+    Options are checked the way `PVE::JSONSchema` does it on the node: types, ranges, enums, patterns and
+    the keys of property strings like `scsi0`. Checked options are coerced to the form the API expects,
+    e.g. booleans become `1` and `0`. Paths the schema does not know are passed through unchecked.
+    """
+
+    def __init__(self, tree: List[Dict[str, Any]]) -> None:
+        self._root: Dict[str, Any] = {"children": tree}
+        self._children: Dict[int, Dict[str, Dict[str, Any]]] = {}
+        self._patterns: Dict[str, Optional[re.Pattern]] = {}
+
+    def method(self, path: str, method: str) -> Optional[Dict[str, Any]]:
+        """Schema of `method` (`GET`, `POST`, ...) on a concrete `path` like `nodes/pve1/qemu/100/config`."""
+        node: Optional[Dict[str, Any]] = self._root
+        for segment in normalize_path(path.strip("/")).split("/"):
+            node = self.__child(node, segment) if node is not None else None
+
+        if node is None:
+            return None
+
+        info: Dict[str, Dict[str, Any]] = node.get("info", {})
+        return info.get(method)
+
+    def __child(self, node: Dict[str, Any], segment: str) -> Optional[Dict[str, Any]]:
+        children = self._children.get(id(node))
+        if children is None:
+            children = self._children[id(node)] = {child["text"]: child for child in node.get("children", [])}
+
+        child = children.get(segment)
+        if child is None:
+            child = next((child for text, child in children.items() if text.startswith("{")), None)
+
+        return child
+
+    def properties(self, path: str, method: str) -> Optional[Properties]:
+        info = self.method(path, method)
+        if info is None:
+            return None
+
+        properties: Properties = info.get("parameters", {}).get("properties", {})
+        return properties
+
+    def validate(self, path: str, method: str, options: Dict[str, Any]) -> Dict[str, str]:
+        """Options of a call with their values coerced, raises a `ValidationError` listing every invalid one."""
+        info = self.method(path, method)
+        if info is None:
+            return {name: str(value) for name, value in options.items()}
+
+        parameters = info.get("parameters", {})
+        properties: Properties = parameters.get("properties", {})
+        coerced: Dict[str, str] = {}
+        errors: List[str] = []
+        for name, value in options.items():
+            schema = self.__property(properties, name)
+            if schema is None:
+                if parameters.get("additionalProperties", 1):
+                    coerced[name] = str(value)
+                else:
+                    errors.append(f"{name}: property is not defined in schema")
+
+                continue
+
+            try:
+                coerced[name] = self.coerce(name, value, schema)
+            except ValueError as e:
+                errors.append(str(e))
+
+        if errors:
+            raise ValidationError(f"Parameter verification failed for {method} {path} - {'; '.join(errors)}", 400)
+
+        return coerced
+
+    def __property(self, properties: Properties, name: str) -> Optional[Dict[str, Any]]:
+        schema = properties.get(name)
+        if schema is None and (match := _INDEXED.match(name)):
+            # the API viewer documents `scsi0` to `scsi30` once, as `scsi[n]`
+            schema = properties.get(f"{match.group(1)}[n]")
+
+        return schema
+
+    def coerce(self, name: str, value: Any, schema: Dict[str, Any]) -> str:
+        """`value` in the form the API expects, raises a `ValueError` when it does not match `schema`."""
+        kind = schema.get("type", "string")
+        if kind == "boolean":
+            return self.__boolean(name, value)
+
+        text = str(value)
+        if kind in ("integer", "number"):
+            return self.__number(name, text, schema, kind)
+
+        if kind != "string":
+            return text
+
+        if "enum" in schema and text not in schema["enum"]:
+            raise ValueError(f"{name}: value '{text}' does not have a value in the enumeration '{schema['enum']}'")
+
+        if "maxLength" in schema and len(text) > schema["maxLength"]:
+            raise ValueError(f"{name}: value may only be {schema['maxLength']} characters long")
+
+        pattern = self.__pattern(schema.get("pattern"))
+        if pattern is not None and not pattern.fullmatch(text):
+            raise ValueError(f"{name}: value does not match the regex pattern")
+
+        if isinstance(schema.get("format"), dict):
+            return self.__property_string(name, text, schema["format"])
+
+        return text
+
+    def __boolean(self, name: str, value: Any) -> str:
+        if isinstance(value, bool):
+            return "1" if value else "0"
+
+        text = str(value).lower()
+        if text in _TRUE:
+            return "1"
+
+        if text in _FALSE:
+            return "0"
+
+        raise ValueError(f"{name}: type check ('boolean') failed - got '{value}'")
+
+    def __number(self, name: str, text: str, schema: Dict[str, Any], kind: str) -> str:
+        if not (_INTEGER if kind == "integer" else _NUMBER).match(text):
+            raise ValueError(f"{name}: type check ('{kind}') failed - got '{text}'")
+
+        number = int(text) if kind == "integer" else float(text)
+        if "minimum" in schema and number < float(schema["minimum"]):
+            raise ValueError(f"{name}: value must have a minimum value of {schema['minimum']}")
+
+        if "maximum" in schema and number > float(schema["maximum"]):
+            raise ValueError(f"{name}: value must have a maximum value of {schema['maximum']}")
+
+        return text
+
+    def __pattern(self, pattern: Optional[str]) -> Optional[re.Pattern]:
+        if pattern is None:
+            return None
+
+        if pattern not in self._patterns:
+            try:
+                self._patterns[pattern] = re.compile(pattern)
+            except re.error:
+                # written for Perl, the node still checks the ones Python cannot compile
+                self._patterns[pattern] = None
+
+        return self._patterns[pattern]
+
+    def __property_string(self, name: str, text: str, properties: Properties) -> str:
+        default_key = next((key for key, schema in properties.items() if schema.get("default_key")), None)
+        tokens: List[Tuple[Optional[str], str]] = []
+        for key, value in parse_property_string(text):
+            property_key = key if key is not None else default_key
+            if property_key is None:
+                raise ValueError(f"{name}: value without key, but schema does not define a default key")
+
+            schema = properties.get(property_key)
+            if schema is None:
+                raise ValueError(f"{name}: invalid format - property '{key}' is not defined in schema")
+
+            if "alias" in schema:
+                schema = properties.get(schema["alias"], schema)
+            tokens.append((key, self.coerce(f"{name}.{key or default_key}", value, schema)))
+
+        return format_property_string(tokens)
+
+    def argument_spec(self, path: str, method: str, exclude: Tuple[str, ...] = ()) -> Dict[str, Dict[str, Any]]:
+        """Ansible argument spec for the parameters of a method, e.g. `nodes/{node}/qemu` and `POST`.
+
+        Names use `_` instead of `-`, indexed parameters like `scsi[n]` become one list of dicts. Whether an
+        option is required is left to the module, most of them depend on `state`.
+        """
+        spec: Dict[str, Dict[str, Any]] = {}
+        for name, schema in (self.properties(path, method) or {}).items():
+            name = name.replace("-", "_")
+            if name.endswith("[n]"):
+                spec[name[:-3]] = dict(type="list", elements="dict", default=[])
+                continue
+
+            argument: Dict[str, Any] = dict(type=_ARGUMENT_TYPES.get(schema.get("type", "string"), "raw"))
+            if "enum" in schema:
+                argument["choices"] = list(schema["enum"])
+
+            spec[name] = argument
+
+        return {name: argument for name, argument in sorted(spec.items()) if name not in exclude}
+
+
+class SchemaCache:
+    """API schemas stored in `directory`, one file per Proxmox VE version, fetched once for every version.
+
+    The version each host runs is kept there too, so runs within `max_age` of the last lookup make no call.
+    """
+
+    def __init__(self, directory: str) -> None:
+        self.directory = os.path.expanduser(directory)
+
+    def path(self, version: str) -> str:
+        return os.path.join(self.directory, f"apidoc-{_file_name(version)}.json")
+
+    def version(self, host: str, lookup: Callable[[], str], max_age: float = VERSION_MAX_AGE) -> str:
+        """Version of `host`, looked up again once the recorded one is older than `max_age` seconds."""
+        path = os.path.join(self.directory, f"version-{_file_name(host)}")
+        try:
+            if time.time() - os.path.getmtime(path) < max_age:
+                with open(path, "r", encoding="utf-8") as f:
+                    return f.read()
+        except OSError:
+            pass
+
+        version = lookup()
+        self.__write(path, version)
+        return version
+
+    def load(self, version: str, fetch: Callable[[], str]) -> ApiSchema:
+        path = self.path(version)
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                return ApiSchema(json.load(f))
+
+        tree = parse_apidoc(fetch())
+        self.__write(path, json.dumps(tree))
+        return ApiSchema(tree)
+
+    def __write(self, path: str, text: str) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        # written aside and renamed, parallel runs never read a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+
+        os.replace(tmp_path, path)
+
+
+def _file_name(text: str) -> str:
+    return re.sub(r"[^A-Za-z0-9._-]", "_", text)
+
+
+def read_apidoc(client: type[Client]) -> str:
+    """API viewer document for `client`, from the endpoint for the REST API and from disk on a node."""
+    return client("").get_document(APIDOC_URL).decode("utf-8")
+
+
+def load_api_schema(
+    client: type[Client], directory: str, fetch: Optional[Callable[[], str]] = None, host: str = "localhost"
+) -> ApiSchema:
+    """Schema of the cluster behind `client`, fetched on the first run against its version only.
+
+    `host` names the cluster in the cache, its version is only looked up once the recorded one is outdated.
+    """
+    cache = SchemaCache(directory)
+    key = cache.version(host, lambda: _version_key(client))
+    return cache.load(key, fetch or (lambda: read_apidoc(client)))
+
+
+def _version_key(client: type[Client]) -> str:
+    version = client("version").get()
+    return f"{version.get('version', 'unknown')}-{version.get('repoid', '')}".rstrip("-")
+
+
+def client_schema(client: Any) -> Optional[ApiSchema]:
+    """Schema `client` checks its options against, looking through the wrappers around it."""
+    while client is not None:
+        schema = getattr(client, "schema", None)
+        if isinstance(schema, ApiSchema):
+            return schema
+
+        client = getattr(client, "_client", None)
+
+    return None
+
+
+class ValidatingClient:
+    """Client wrapper checking options against an `ApiSchema` before any call, use `create_validating_client`."""
+
+    schema: ApiSchema
+    _client: type[Client]
+
+    def __init__(self, path: str) -> None:
+        self._path = normalize_path(path.strip("/"))
+        self._options: Dict[str, Any] = {}
+
+    def add_option(self, name: str, value: str = "") -> "ValidatingClient":
+        self._options[name] = value
+        return self
+
+    def _request(self, method: str) -> Client:
+        request = self._client(self._path)
+        for name, value in self.schema.validate(self._path, _HTTP_METHODS[method], self._options).items():
+            request.add_option(name, value)
+
+        return request
+
+    def get(self) -> Any:
+        return self._request("get").get()
+
+    def get_iter(self) -> Iterator[Any]:
+        return iter_records(self._request("get"))
+
+    def get_document(self, url: str) -> bytes:
+        return self._client(self._path).get_document(url)
+
+    def create(self) -> Any:
+        return self._request("create").create()
+
+    def set(self) -> Any:
+        return self._request("set").set()
+
+    def delete(self) -> Any:
+        return self._request("delete").delete()
+
+    def __str__(self) -> str:
+        return f"ValidatingClient({self._client.__name__}({self._path}) with options {self._options})"
+
+
+def create_validating_client(client: type[Client], schema: ApiSchema) -> type[ValidatingClient]:
+    """Wrap `client` so options are checked and coerced against `schema`, invalid ones never reach the cluster."""
+    return type("ClientWithSchema", (ValidatingClient,), {"schema": schema, "_client": client})
@@ -0,0 +1,208 @@
+import asyncio
+import codecs
+import json
+from typing import IO, Any, AsyncIterable, AsyncIterator, Callable, Generator, Iterable, Iterator, Optional
+from .client import Client
+
+CHUNK_SIZE = 64 * 1024
+
+
+class ChunkReader:
+    """Iterates over `CHUNK_SIZE` chunks of a binary stream, counting the bytes read in `size`."""
+
+    def __init__(self, stream: IO[bytes]) -> None:
+        self._stream = stream
+        self.size = 0
+
+    def __iter__(self) -> Iterator[bytes]:
+        while True:
+            chunk = self._stream.read(CHUNK_SIZE)
+            if not chunk:
+                return
+
+            self.size += len(chunk)
+            yield chunk
+
+
+class AsyncChunkReader:
+    """Iterates over `CHUNK_SIZE` chunks of an asyncio stream, counting the bytes read in `size`."""
+
+    def __init__(self, stream: asyncio.StreamReader) -> None:
+        self._stream = stream
+        self.size = 0
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        while True:
+            chunk = await self._stream.read(CHUNK_SIZE)
+            if not chunk:
+                return
+
+            self.size += len(chunk)
+            yield chunk
+
+
+# returned by the reads of `_Buffer` when the text does not go far enough, the parser then yields it to get the
+# next chunk, so sync and async readers can drive the same parser
+_MORE: Any = object()
+
+
+class _Buffer:
+    """Decoded text of a chunked JSON document, only the part not consumed yet is kept.
+
+    Reads return `_MORE` without consuming anything when they need more text, they can be repeated once
+    the next chunk is passed to `feed`.
+    """
+
+    _whitespace = " \t\r\n"
+
+    def __init__(self) -> None:
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self.text = ""
+        self.pos = 0
+        self.eof = False
+
+    def feed(self, chunk: Optional[bytes]) -> None:
+        """Append the next chunk, None at the end of the document."""
+        consumed, self.pos = self.pos, 0
+        self.text = self.text[consumed:]
+        if chunk is not None:
+            self.text += self._decoder.decode(chunk)
+            return
+
+        self.text += self._decoder.decode(b"", final=True)
+        self.eof = True
+
+    def peek(self) -> Any:
+        """Next non whitespace character, empty at the end of the document."""
+        while self.pos < len(self.text) and self.text[self.pos] in self._whitespace:
+            self.pos += 1
+
+        if self.pos < len(self.text):
+            return self.text[self.pos]
+
+        return "" if self.eof else _MORE
+
+    def expect(self, characters: str) -> Any:
+        character = self.peek()
+        if character is _MORE:
+            return _MORE
+
+        if not character or character not in characters:
+            raise json.JSONDecodeError(f"Expecting one of {characters!r}", self.text, self.pos)
+
+        self.pos += 1
+        return character
+
+    def value(self) -> Any:
+        if self.peek() is _MORE:
+            return _MORE
+
+        try:
+            value, end = self._json.raw_decode(self.text, self.pos)
+        except json.JSONDecodeError:
+            if self.eof:
+                raise
+
+            return _MORE
+
+        # a number at the end of the buffer may continue in the next chunk
+        if end == len(self.text) and not self.eof:
+            return _MORE
+
+        self.pos = end
+        return value
+
+
+def _read(read: Callable[[], Any]) -> Generator[Any, None, Any]:
+    """Result of `read`, yielding `_MORE` until the buffer holds enough text for it."""
+    result = read()
+    while result is _MORE:
+        yield _MORE
+        result = read()
+
+    return result
+
+
+def _seek_key(buffer: _Buffer, key: str) -> Generator[Any, None, bool]:
+    yield from _read(lambda: buffer.expect("{"))
+    if (yield from _read(buffer.peek)) == "}":
+        return False
+
+    while True:
+        name = yield from _read(buffer.value)
+        yield from _read(lambda: buffer.expect(":"))
+        if name == key:
+            return True
+
+        yield from _read(buffer.value)
+        if (yield from _read(lambda: buffer.expect(",}"))) == "}":
+            return False
+
+
+def _parse_json_array(buffer: _Buffer, key: Optional[str]) -> Generator[Any, None, None]:
+    """Items of the array in `buffer`, interleaved with `_MORE` whenever the buffer needs another chunk."""
+    if key is not None and ((yield from _read(buffer.peek)) == "" or not (yield from _seek_key(buffer, key))):
+        return
+
+    first = yield from _read(buffer.peek)
+    if first != "[":
+        value = (yield from _read(buffer.value)) if first else None
+        if value is not None:
+            yield value
+
+        return
+
+    yield from _read(lambda: buffer.expect("["))
+    if (yield from _read(buffer.peek)) == "]":
+        return
+
+    while True:
+        # reads mostly succeed at once, only a chunk boundary goes through `_read`
+        value = buffer.value()
+        if value is _MORE:
+            value = yield from _read(buffer.value)
+
+        yield value
+        separator = buffer.expect(",]")
+        if separator is _MORE:
+            separator = yield from _read(lambda: buffer.expect(",]"))
+
+        if separator == "]":
+            return
+
+
+def iter_json_array(chunks: Iterable[bytes], key: Optional[str] = None) -> Iterator[Any]:
+    """Yield the items of a JSON array read from `chunks` one at a time.
+
+    With `key`, the array is the value of that key in a top level object (`{"data": [...]}` API responses).
+    A document holding anything else than an array yields that value as its single item, empty or null
+    documents yield nothing.
+    """
+    buffer = _Buffer()
+    reader = iter(chunks)
+    for item in _parse_json_array(buffer, key):
+        if item is _MORE:
+            buffer.feed(next(reader, None))
+        else:
+            yield item
+
+
+async def aiter_json_array(chunks: AsyncIterable[bytes], key: Optional[str] = None) -> AsyncIterator[Any]:
+    """`iter_json_array` reading its chunks from an asynchronous iterable."""
+    buffer = _Buffer()
+    reader = chunks.__aiter__()
+    for item in _parse_json_array(buffer, key):
+        if item is not _MORE:
+            yield item
+            continue
+
+        try:
+            buffer.feed(await reader.__anext__())
+        except StopAsyncIteration:
+            buffer.feed(None)
+
+
+def iter_records(request: Client) -> Iterator[Any]:
+    """Records of a `get()` list response, streamed as far as the client can."""
+    return request.get_iter()
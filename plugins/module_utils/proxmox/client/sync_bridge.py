@@ -0,0 +1,65 @@
+import asyncio
+import functools
+from typing import Any, Awaitable, Callable, Iterator
+from .async_client import AsyncClient
+
+
+class SyncBridge:
+    """Synchronous client forwarding calls to an `AsyncClient` running on an event loop in another thread."""
+
+    _async_client: type[AsyncClient]
+    _loop: asyncio.AbstractEventLoop
+
+    def __init__(self, path: str) -> None:
+        self._request = self._async_client(path)
+
+    def _call(self, method: Callable[[], Awaitable[Any]]) -> Any:
+        async def call() -> Any:
+            return await method()
+
+        return asyncio.run_coroutine_threadsafe(call(), self._loop).result()
+
+    def add_option(self, name: str, value: str = "") -> "SyncBridge":
+        self._request.add_option(name, value)
+        return self
+
+    def create(self) -> Any:
+        return self._call(self._request.create)
+
+    def get(self) -> Any:
+        return self._call(self._request.get)
+
+    def get_iter(self) -> Iterator[Any]:
+        """Stream the records of the asynchronous `get_iter`, each record is fetched on the loop when it is needed."""
+        records = self._request.get_iter()
+        try:
+            while True:
+                try:
+                    yield self._call(records.__anext__)
+                except StopAsyncIteration:
+                    return
+        finally:
+            # an asynchronous generator only ends its call, like a pvesh process, once closed
+            close = getattr(records, "aclose", None)
+            if close is not None:
+                self._call(close)
+
+    def get_document(self, url: str) -> bytes:
+        document: bytes = self._call(functools.partial(self._request.get_document, url))
+        return document
+
+    def set(self) -> Any:
+        return self._call(self._request.set)
+
+    def delete(self) -> Any:
+        return self._call(self._request.delete)
+
+
+def create_sync_bridge(client: type[AsyncClient], loop: asyncio.AbstractEventLoop) -> type[SyncBridge]:
+    """Create a synchronous client class for `client`, it must not be used from the thread running `loop`."""
+
+    class BoundSyncBridge(SyncBridge):
+        _async_client = client
+        _loop = loop
+
+    return BoundSyncBridge
@@ -0,0 +1,96 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from .client import Client
+from .handlers.cluster_acme_account_handler import ClusterAcmeAccountHandler
+from .resources.cluster.acme import ClusterAcmePlugin
+from .resources.cluster.ha import ClusterHAGroup, ClusterHAResource
+from .resources.cluster.options import ClusterOptions
+from .resources.pool import Pool
+from .snapshot import ClusterSnapshot
+
+# fields of the `cluster/resources` guest entries kept in the VM index, the others are usage counters
+VM_FIELDS = ("vmid", "name", "type", "node", "status", "pool", "tags", "hastate", "template")
+# ACME accounts read at once, the listing only holds the names so every account takes a call of its own
+ACME_ACCOUNT_WORKERS = 8
+
+
+def _pools(client: type[Client]) -> List[Dict[str, str]]:
+    return [Pool(data).to_dict() for data in client("pools").get()]
+
+
+def _ha_groups(client: type[Client]) -> List[Dict[str, str]]:
+    return [ClusterHAGroup(data).to_dict() for data in client("cluster/ha/groups").get()]
+
+
+def _ha_resources(client: type[Client]) -> List[Dict[str, str]]:
+    return [ClusterHAResource(data).to_dict() for data in client("cluster/ha/resources").get()]
+
+
+def _options(client: type[Client]) -> Dict[str, str]:
+    return ClusterOptions(client("cluster/options").get()).to_dict()
+
+
+def _acme_accounts(client: type[Client]) -> List[Dict[str, str]]:
+    names = [entry["name"] for entry in client("cluster/acme/account").get()]
+    with ThreadPoolExecutor(max_workers=max(1, min(ACME_ACCOUNT_WORKERS, len(names)))) as executor:
+        accounts = executor.map(lambda name: _acme_account(client, name), names)
+        return [account for account in accounts if account is not None]
+
+
+def _acme_account(client: type[Client], name: str) -> Optional[Dict[str, str]]:
+    account = ClusterAcmeAccountHandler(client, {"name": name}).lookup()
+    if account is None:
+        # removed since the listing
+        return None
+
+    account.name = name
+    return account.to_dict()
+
+
+def _acme_plugins(client: type[Client]) -> List[Dict[str, str]]:
+    plugins = []
+    for data in client("cluster/acme/plugins").get():
+        plugin = ClusterAcmePlugin(data)
+        # the plugin data holds the credentials of the DNS API, facts end up in fact caches and logs
+        plugin.data = None
+        plugins.append(plugin.to_dict())
+
+    return plugins
+
+
+def _vms(client: type[Client]) -> Dict[str, Dict[str, Any]]:
+    snapshot = ClusterSnapshot(client)
+    vms = {}
+    for entry in snapshot.guests():
+        vm = {field: entry[field] for field in VM_FIELDS if entry.get(field) is not None}
+        vm["tags"] = snapshot.guest_tags(entry)
+        vms[str(entry["vmid"])] = vm
+
+    return vms
+
+
+SECTIONS: Dict[str, Callable[[type[Client]], Any]] = {
+    "pools": _pools,
+    "ha_groups": _ha_groups,
+    "ha_resources": _ha_resources,
+    "options": _options,
+    "acme_accounts": _acme_accounts,
+    "acme_plugins": _acme_plugins,
+    "vms": _vms,
+}
+
+
+def collect_cluster_facts(client: type[Client], sections: Iterable[str] = tuple(SECTIONS)) -> Dict[str, Any]:
+    """Cluster state of the given `sections`, each read on its own thread and parsed by its resource class.
+
+    Resources are returned the way the modules return them in `data`, VMs are indexed by vmid. A failing
+    section fails the whole collection, unsupported sections like HA groups on PVE 9 can be left out.
+    """
+    sections = list(sections)
+    unknown = [section for section in sections if section not in SECTIONS]
+    if unknown:
+        raise ValueError(f"Unknown sections: {', '.join(unknown)}")
+
+    with ThreadPoolExecutor(max_workers=max(len(sections), 1)) as executor:
+        futures = {section: executor.submit(SECTIONS[section], client) for section in sections}
+        return {section: future.result() for section, future in futures.items()}
@@ -0,0 +1,112 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple, cast
+from .client import Client, MetricsCollector
+from .handlers.base import BaseHandler
+from .snapshot import ClusterSnapshot
+from ..utils import AnsibleParams
+
+
+def _vmid_range(value: Any) -> range:
+    if isinstance(value, str):
+        start, _, end = value.partition("-")
+        return range(int(start), int(end or start) + 1)
+
+    start, end = value
+    return range(int(start), int(end) + 1)
+
+
+def expand_vms(items: List[AnsibleParams], defaults: AnsibleParams) -> List[AnsibleParams]:
+    """Turn `vms` items into one set of parameters per VM.
+
+    Module level parameters are defaults for every item. An item with `vmid_range` (`"200-209"` or `[200, 209]`)
+    stands for one VM per vmid, `{vmid}` and `{index}` in its `name` are filled in for each of them.
+    """
+    base = {key: value for key, value in defaults.items() if value is not None}
+    vms: List[AnsibleParams] = []
+    for item in items:
+        params = dict(base, **item)
+        vmid_range = params.pop("vmid_range", None)
+        if vmid_range is None:
+            vms.append(params)
+            continue
+
+        for index, vmid in enumerate(_vmid_range(vmid_range)):
+            vm = dict(params, vmid=vmid)
+            if isinstance(vm.get("name"), str):
+                vm["name"] = vm["name"].format(vmid=vmid, index=index)
+
+            vms.append(vm)
+
+    _validate_vms(vms)
+    return vms
+
+
+def _validate_vms(vms: List[AnsibleParams]) -> None:
+    seen = set()
+    for vm in vms:
+        if not vm.get("node") or vm.get("vmid") is None:
+            raise ValueError(f"Every VM needs node and vmid, got {vm}")
+
+        vmid = str(vm["vmid"])
+        if vmid in seen:
+            raise ValueError(f"VM {vmid} is defined more than once")
+
+        seen.add(vmid)
+
+
+def reconcile_one(
+    handler: type[BaseHandler],
+    client: type[Client],
+    params: AnsibleParams,
+    check: bool,
+    snapshot: Optional[ClusterSnapshot] = None,
+    keys: Tuple[str, ...] = (),
+    collector: Optional[MetricsCollector] = None,
+    return_mode: str = "full",
+) -> Dict[str, Any]:
+    """Result of reconciling one item, with `failed` set and the error in `msg` instead of raising it."""
+    result: Dict[str, Any] = {key: params.get(key) for key in keys}
+    kwargs = {"snapshot": snapshot} if snapshot is not None else {}
+    try:
+        instance = handler(client, params, **kwargs).collect_metrics(collector)
+        state = cast(str, params.get("state") or "present")
+        result.update(instance.reconcile(state, check, return_mode))
+        result["failed"] = False
+    except Exception as e:
+        result.update({"changed": False, "failed": True, "msg": str(e)})
+
+    return result
+
+
+def summarize(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return {
+        "results": results,
+        "changed": any(result["changed"] for result in results),
+        "changed_count": sum(1 for result in results if result["changed"]),
+        "failed_count": sum(1 for result in results if result["failed"]),
+    }
+
+
+def reconcile_many(
+    handler: type[BaseHandler],
+    client: type[Client],
+    items: List[AnsibleParams],
+    check: bool,
+    workers: int = 8,
+    snapshot: Optional[ClusterSnapshot] = None,
+    keys: Tuple[str, ...] = (),
+    collector: Optional[MetricsCollector] = None,
+    return_mode: str = "full",
+) -> Dict[str, Any]:
+    """Reconcile every item with its own handler on a bounded thread pool.
+
+    A failing item does not stop the others, the result holds one entry per item, in order, plus aggregate counts.
+    """
+
+    def run(params: AnsibleParams) -> Dict[str, Any]:
+        return reconcile_one(handler, client, params, check, snapshot, keys, collector, return_mode)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        results = list(executor.map(run, items))
+
+    return summarize(results)
@@ -0,0 +1,71 @@
+import asyncio
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, TypeVar
+from ..client.async_client import AsyncClient
+from ..client.async_pvesh import AsyncPvesh
+from ..client.sync_bridge import create_sync_bridge
+from ...utils import AnsibleParams, AnsibleResult
+from .base import BaseHandler
+
+T = TypeVar("T")
+
+
+class AsyncHandler:
+    """Asyncio variant of a handler.
+
+    The wrapped handler keeps its logic and runs in a worker thread, every client call it makes is sent back
+    to the event loop through `client`, so many handlers overlap their I/O instead of serializing it.
+    The worker threads come from a pool per event loop sized to the `_max_in_flight` bound of the client,
+    not from the default executor of the loop, whose size follows the CPU count and would cap the overlap.
+    """
+
+    _executors: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[int, ThreadPoolExecutor]]"
+    _executors_lock = threading.Lock()
+
+    def __init__(self, handler: type[BaseHandler], client: type[AsyncClient], params: AnsibleParams, **kwargs: Any):
+        self._handler_class = handler
+        self._client_class = client
+        self._params = params
+        self._kwargs = kwargs
+        self._handler: Optional[BaseHandler] = None
+
+    def _get_handler(self) -> BaseHandler:
+        if self._handler is None:
+            bridge = create_sync_bridge(self._client_class, asyncio.get_running_loop())
+            self._handler = self._handler_class(bridge, self._params, **self._kwargs)
+
+        return self._handler
+
+    def _executor(self) -> ThreadPoolExecutor:
+        # clients without a bound of their own get the default bound of AsyncPvesh
+        workers = max(1, getattr(self._client_class, "_max_in_flight", AsyncPvesh._max_in_flight))
+        loop = asyncio.get_running_loop()
+        with self._executors_lock:
+            executors = self._executors.setdefault(loop, {})
+            if workers not in executors:
+                executors[workers] = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="AsyncHandler")
+
+            return executors[workers]
+
+    async def _call(self, method: Callable[..., T], *args: Any) -> T:
+        return await asyncio.get_running_loop().run_in_executor(self._executor(), method, *args)
+
+    async def lookup(self) -> Any:
+        return await self._call(self._get_handler().lookup)
+
+    async def exists(self) -> bool:
+        return await self._call(self._get_handler().exists)
+
+    async def create(self, check: bool) -> AnsibleResult:
+        return await self._call(self._get_handler().create, check)
+
+    async def modify(self, check: bool) -> AnsibleResult:
+        return await self._call(self._get_handler().modify, check)
+
+    async def remove(self, check: bool) -> AnsibleResult:
+        return await self._call(self._get_handler().remove, check)
+
+
+AsyncHandler._executors = weakref.WeakKeyDictionary()
@@ -1,6 +1,138 @@
-from ..client import Client
+from contextlib import nullcontext
+from typing import Any, Callable, ContextManager, Dict, Optional, TypeVar
+from ..client import ApiSchema, Client, MetricsCollector, client_schema
+from ..snapshot import ClusterSnapshot
+from ..tasks import TaskWaiter, is_upid
+from ...utils import AnsibleParams, AnsibleResult
+
+T = TypeVar("T")
+
+RETURN_MODES = ("minimal", "diff", "full", "verified")
+
+RESULT_ARGUMENT_SPEC: Dict[str, Any] = {
+    "return_mode": {"type": "str", "default": "full", "choices": list(RETURN_MODES)},
+}
 
 
 class BaseHandler:
-    def __init__(self, client: type[Client]) -> None:
+    # desired state built from the module parameters by each handler
+    _resource: Any
+
+    def __init__(self, client: type[Client], params: AnsibleParams, snapshot: Optional[ClusterSnapshot] = None) -> None:
         self._client_class = client
+        self._snapshot = snapshot
+        self._task_waiter: Optional[TaskWaiter] = None
+        self._metrics: Optional[MetricsCollector] = None
+
+    def wait_for_tasks(self, timeout: float = 300.0) -> "BaseHandler":
+        """Wait for the tasks started by create/modify/remove to finish before returning."""
+        self._task_waiter = TaskWaiter(self._client_class, timeout=timeout)
+        return self
+
+    def collect_metrics(self, collector: Optional[MetricsCollector]) -> "BaseHandler":
+        """Mark the phases of the handler (lookup, diff, apply, final_lookup) on `collector`."""
+        self._metrics = collector
+        return self
+
+    def phase(self, name: str) -> ContextManager[None]:
+        if self._metrics is None:
+            return nullcontext()
+
+        return self._metrics.phase(name)
+
+    def _in_phase(self, call: Callable[[], T]) -> Callable[[], T]:
+        """`call` keeping the current phase when it runs on another thread, like the steps of `run_steps`."""
+        if self._metrics is None:
+            return call
+
+        return self._metrics.in_current_phase(call)
+
+    def _wait(self, *results: Any) -> None:
+        upids = [result for result in results if is_upid(result)]
+        if self._task_waiter is not None and upids:
+            self._task_waiter.wait_all(upids)
+
+    def _snapshot_exists(self) -> Optional[bool]:
+        """Existence of the resource according to the cluster snapshot, None when it cannot tell."""
+        return None
+
+    def exists(self) -> bool:
+        known = self._snapshot_exists()
+        if known is not None:
+            return known
+
+        return self.lookup() is not None
+
+    def lookup(self) -> Optional[Any]:
+        raise NotImplementedError()
+
+    def validate(self, schema: ApiSchema) -> None:
+        """Check the desired resource against the API schema of the cluster, before any call is made."""
+
+    def create(self, check: bool) -> AnsibleResult:
+        raise NotImplementedError()
+
+    def modify(self, check: bool, lookup: Optional[Any] = None) -> AnsibleResult:
+        """Apply the differences to the existing resource, `lookup` saves looking it up again."""
+        raise NotImplementedError()
+
+    def remove(self, check: bool) -> AnsibleResult:
+        raise NotImplementedError()
+
+    def reconcile(self, state: str, check: bool, return_mode: str = "full") -> Dict[str, Any]:
+        """Bring the resource to `state` and return the module result.
+
+        The resource is looked up once. `data` is derived from that lookup and the applied changes, only the
+        `verified` return mode reads it back from the cluster. `minimal` returns `changed` only, `diff` adds
+        `updated_fields`.
+        """
+        if return_mode not in RETURN_MODES:
+            raise ValueError(f"Unknown return mode {return_mode}, expected one of {', '.join(RETURN_MODES)}")
+
+        schema = client_schema(self._client_class)
+        if schema is not None and state == "present":
+            self.validate(schema)
+
+        with self.phase("lookup"):
+            lookup = self.lookup()
+
+        with self.phase("apply"):
+            result = self._apply(state, check, lookup)
+
+        output: Dict[str, Any] = {"changed": result.status}
+        if return_mode == "minimal":
+            return output
+
+        output["updated_fields"] = result.changes
+        if return_mode == "diff":
+            return output
+
+        if return_mode == "verified":
+            # The snapshot predates the changes above, the final state has to come from the cluster.
+            self._snapshot = None
+            with self.phase("final_lookup"):
+                lookup = self.lookup()
+        elif result.status and not check:
+            lookup = self.expected(state, lookup, result)
+
+        output["data"] = lookup.to_dict() if lookup else None
+        return output
+
+    def _apply(self, state: str, check: bool, lookup: Optional[Any]) -> AnsibleResult:
+        if state == "absent" and lookup:
+            return self.remove(check)
+
+        if state == "present":
+            return self.modify(check, lookup) if lookup else self.create(check)
+
+        return AnsibleResult()
+
+    def expected(self, state: str, lookup: Optional[Any], result: AnsibleResult) -> Optional[Any]:
+        """State of the resource after `result` was applied to `lookup`."""
+        if state == "absent":
+            return None
+
+        if lookup is None:
+            return self._resource
+
+        return lookup.merge(self._resource, result.changes)
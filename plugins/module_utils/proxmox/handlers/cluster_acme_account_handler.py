@@ -1,16 +1,14 @@
-import re
 from typing import Optional
-from ..client import Client
+from ..client import Client, NotFoundError
 from ...utils import AnsibleResult, AnsibleParams
 from ..resources.cluster.acme import ClusterAcmeAccount
+from ..snapshot import ClusterSnapshot
 from .base import BaseHandler
 
 
 class ClusterAcmeAccountHandler(BaseHandler):
-    _missing_resource_regex = re.compile(r".*ACME account config file '.*' does not exist.*")
-
-    def __init__(self, client: type[Client], params: AnsibleParams) -> None:
-        super().__init__(client)
+    def __init__(self, client: type[Client], params: AnsibleParams, snapshot: Optional[ClusterSnapshot] = None) -> None:
+        super().__init__(client, params, snapshot)
         self._resource = ClusterAcmeAccount(params)
         self._path = "cluster/acme/account"
 
@@ -20,11 +18,8 @@ class ClusterAcmeAccountHandler(BaseHandler):
             data = request.get()
             return ClusterAcmeAccount(data)
 
-        except Exception as e:
-            if self._missing_resource_regex.match(str(e)):
-                return None
-
-            raise e
+        except NotFoundError:
+            return None
 
     def create(self, check: bool) -> AnsibleResult:
         if check:
@@ -46,9 +41,12 @@ class ClusterAcmeAccountHandler(BaseHandler):
         request.delete()
         return AnsibleResult(status=True)
 
-    def modify(self, check: bool) -> AnsibleResult:
-        lookup = self.lookup()
-        updated_fields = self._resource.diff(lookup)
+    def modify(self, check: bool, lookup: Optional[ClusterAcmeAccount] = None) -> AnsibleResult:
+        with self.phase("diff"):
+            if lookup is None:
+                lookup = self.lookup()
+
+            updated_fields = self._resource.diff(lookup)
 
         if check or not updated_fields:
             return AnsibleResult(status=bool(updated_fields), changes=updated_fields)
@@ -1,17 +1,15 @@
-import re
 import base64
 from typing import Optional
-from ..client import Client
+from ..client import Client, NotFoundError
 from ...utils import AnsibleResult, AnsibleParams
 from ..resources.cluster.acme import ClusterAcmePlugin
+from ..snapshot import ClusterSnapshot
 from .base import BaseHandler
 
 
 class ClusterAcmePluginHandler(BaseHandler):
-    _missing_resource_regex = re.compile(r".*ACME plugin '.*' not defined.*")
-
-    def __init__(self, client: type[Client], params: AnsibleParams) -> None:
-        super().__init__(client)
+    def __init__(self, client: type[Client], params: AnsibleParams, snapshot: Optional[ClusterSnapshot] = None) -> None:
+        super().__init__(client, params, snapshot)
         self._resource = ClusterAcmePlugin(params)
         self._path = "cluster/acme/plugins"
 
@@ -22,11 +20,8 @@ class ClusterAcmePluginHandler(BaseHandler):
             data["data"] = base64.b64decode(data["data"]).decode()
             return ClusterAcmePlugin(data)
 
-        except Exception as e:
-            if self._missing_resource_regex.match(str(e)):
-                return None
-
-            raise e
+        except NotFoundError:
+            return None
 
     def create(self, check: bool) -> AnsibleResult:
         if check:
@@ -53,12 +48,12 @@ class ClusterAcmePluginHandler(BaseHandler):
         request.delete()
         return AnsibleResult(status=True)
 
-    def modify(self, check: bool) -> AnsibleResult:
-        lookup = self.lookup()
-        updated_fields = self._resource.diff(lookup)
-        print(lookup.serialize())
-        print(self._resource.serialize())
-        print(updated_fields)
+    def modify(self, check: bool, lookup: Optional[ClusterAcmePlugin] = None) -> AnsibleResult:
+        with self.phase("diff"):
+            if lookup is None:
+                lookup = self.lookup()
+
+            updated_fields = self._resource.diff(lookup)
 
         if check or not updated_fields:
             return AnsibleResult(status=bool(updated_fields), changes=updated_fields)
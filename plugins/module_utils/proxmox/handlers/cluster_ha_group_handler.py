@@ -1,16 +1,25 @@
-import re
-from typing import Optional
-from ..client import Client
+from typing import Any, Dict, Optional
+from ..client import Client, NotFoundError
 from ...utils import AnsibleResult, AnsibleParams
 from ..resources.cluster.ha import ClusterHAGroup
+from ..snapshot import ClusterSnapshot
 from .base import BaseHandler
 
+# options of the module, also used to check batch items
+HA_GROUP_ARGUMENT_SPEC: Dict[str, Any] = {
+    "group": {"type": "str", "required": True},
+    "nodes": {"type": "list", "default": []},
+    "comment": {"type": "str"},
+    "nofailback": {"type": "str"},
+    "restricted": {"type": "str"},
+    "type": {"type": "str"},
+    "state": {"type": "str", "default": "present", "choices": ["present", "absent"]},
+}
 
-class ClusterHAGroupHandler(BaseHandler):
-    _missing_resource_regex = re.compile(r".*no such ha group '.*'.*")
 
-    def __init__(self, client: type[Client], params: AnsibleParams) -> None:
-        super().__init__(client)
+class ClusterHAGroupHandler(BaseHandler):
+    def __init__(self, client: type[Client], params: AnsibleParams, snapshot: Optional[ClusterSnapshot] = None) -> None:
+        super().__init__(client, params, snapshot)
         self._resource = ClusterHAGroup(params)
         self._path = "cluster/ha/groups"
 
@@ -20,11 +29,8 @@ class ClusterHAGroupHandler(BaseHandler):
             data = request.get()
             return ClusterHAGroup(data)
 
-        except Exception as e:
-            if self._missing_resource_regex.match(str(e)):
-                return None
-
-            raise e
+        except NotFoundError:
+            return None
 
     def create(self, check: bool) -> AnsibleResult:
         if check:
@@ -46,9 +52,12 @@ class ClusterHAGroupHandler(BaseHandler):
         request.delete()
         return AnsibleResult(status=True)
 
-    def modify(self, check: bool) -> AnsibleResult:
-        lookup = self.lookup()
-        updated_fields = self._resource.diff(lookup)
+    def modify(self, check: bool, lookup: Optional[ClusterHAGroup] = None) -> AnsibleResult:
+        with self.phase("diff"):
+            if lookup is None:
+                lookup = self.lookup()
+
+            updated_fields = self._resource.diff(lookup)
 
         if check or not updated_fields:
             return AnsibleResult(status=bool(updated_fields), changes=updated_fields)
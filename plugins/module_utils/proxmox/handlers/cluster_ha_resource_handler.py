@@ -1,30 +1,45 @@
-import re
-from typing import Optional
-from ..client import Client
+from typing import Any, Dict, Optional
+from ..client import Client, NotFoundError
 from ...utils import AnsibleResult, AnsibleParams
 from ..resources.cluster.ha import ClusterHAResource
+from ..snapshot import ClusterSnapshot
 from .base import BaseHandler
 
+# options of the module, also used to check batch items
+HA_RESOURCE_ARGUMENT_SPEC: Dict[str, Any] = {
+    "sid": {"type": "str", "required": True},
+    "comment": {"type": "str"},
+    "group": {"type": "str"},
+    "max_relocate": {"type": "str"},
+    "max_restart": {"type": "str"},
+    "resource_state": {"type": "str"},
+    "state": {"type": "str", "default": "present", "choices": ["present", "absent"]},
+}
 
-class ClusterHAResourceHandler(BaseHandler):
-    _missing_resource_regex = re.compile(r".*no such resource '.*'.*")
 
-    def __init__(self, client: type[Client], params: AnsibleParams) -> None:
-        super().__init__(client)
+class ClusterHAResourceHandler(BaseHandler):
+    def __init__(self, client: type[Client], params: AnsibleParams, snapshot: Optional[ClusterSnapshot] = None) -> None:
+        super().__init__(client, params, snapshot)
         self._resource = ClusterHAResource(params)
         self._path = "cluster/ha/resources"
 
+    def _snapshot_exists(self) -> Optional[bool]:
+        if self._snapshot is None:
+            return None
+
+        return self._snapshot.has_ha_resource(self._resource.sid)
+
     def lookup(self) -> Optional[ClusterHAResource]:
+        if self._snapshot_exists() is False:
+            return None
+
         try:
             request = self._client_class(f"{self._path}/{self._resource.sid}")
             data = request.get()
             return ClusterHAResource(data)
 
-        except Exception as e:
-            if self._missing_resource_regex.match(str(e)):
-                return None
-
-            raise e
+        except NotFoundError:
+            return None
 
     def create(self, check: bool) -> AnsibleResult:
         if check:
@@ -46,9 +61,12 @@ class ClusterHAResourceHandler(BaseHandler):
         request.delete()
         return AnsibleResult(status=True)
 
-    def modify(self, check: bool) -> AnsibleResult:
-        lookup = self.lookup()
-        updated_fields = self._resource.diff(lookup)
+    def modify(self, check: bool, lookup: Optional[ClusterHAResource] = None) -> AnsibleResult:
+        with self.phase("diff"):
+            if lookup is None:
+                lookup = self.lookup()
+
+            updated_fields = self._resource.diff(lookup)
 
         if check or not updated_fields:
             return AnsibleResult(status=bool(updated_fields), changes=updated_fields)
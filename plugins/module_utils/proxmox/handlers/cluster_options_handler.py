@@ -1,12 +1,42 @@
+from typing import Any, Dict, Optional
 from ..client import Client
 from ...utils import AnsibleResult, AnsibleParams
 from ..resources.cluster import ClusterOptions
+from ..snapshot import ClusterSnapshot
 from .base import BaseHandler
 
+# options of the module, also used to check batch items
+OPTIONS_ARGUMENT_SPEC: Dict[str, Any] = {
+    name: {"type": "str"}
+    for name in (
+        "bwlimit",
+        "console",
+        "crs",
+        "description",
+        "email_from",
+        "fencing",
+        "ha",
+        "http_proxy",
+        "keyboard",
+        "language",
+        "mac_prefix",
+        "max_workers",
+        "migration",
+        "migration_unsecure",
+        "next_id",
+        "notify",
+        "registred_tags",
+        "tag_style",
+        "u2f",
+        "user_tag_access",
+        "webauthn",
+    )
+}
+
 
 class ClusterOptionsHandler(BaseHandler):
-    def __init__(self, client: type[Client], params: AnsibleParams) -> None:
-        super().__init__(client)
+    def __init__(self, client: type[Client], params: AnsibleParams, snapshot: Optional[ClusterSnapshot] = None) -> None:
+        super().__init__(client, params, snapshot)
         self._resource = ClusterOptions(params)
         self._path = "cluster/options"
 
@@ -15,9 +45,12 @@ class ClusterOptionsHandler(BaseHandler):
         data = request.get()
         return ClusterOptions(data)
 
-    def modify(self, check: bool) -> AnsibleResult:
-        lookup = self.lookup()
-        updated_fields = self._resource.diff(lookup)
+    def modify(self, check: bool, lookup: Optional[ClusterOptions] = None) -> AnsibleResult:
+        with self.phase("diff"):
+            if lookup is None:
+                lookup = self.lookup()
+
+            updated_fields = self._resource.diff(lookup)
 
         if check or not updated_fields:
             return AnsibleResult(status=bool(updated_fields), changes=updated_fields)
@@ -1,31 +1,62 @@
-import re
-from typing import Optional
-from ..client import Client
+import functools
+from typing import Any, Dict, Optional, cast
+from ..client import ApiSchema, Client, NotFoundError
 from ...utils import AnsibleResult, AnsibleParams
+from ..property_string import format_property_string, parse_property_string, property_dict
+from ..resources.cache import ParseCache
 from ..resources.node.qemu import Qemu
+from ..resources.node.qemu.storage import DiskSize
+from ..resources.node.qemu.view import QemuView
+from ..scheduler import Step, run_steps
+from ..snapshot import ClusterSnapshot
 from .base import BaseHandler
 
 
 class NodeQemuHandler(BaseHandler):
-    _vm_not_exists_regex = re.compile(r".*Configuration file '.*' does not exist.*")
+    # shared by all handlers, a VM config read again in the same run is parsed once
+    parse_cache = ParseCache()
 
-    def __init__(self, client: type[Client], params: AnsibleParams) -> None:
-        super().__init__(client)
-        self._resource = Qemu(params["node"], params)
+    def __init__(self, client: type[Client], params: AnsibleParams, snapshot: Optional[ClusterSnapshot] = None) -> None:
+        super().__init__(client, params, snapshot)
+        self._resource = Qemu(cast(str, params["node"]), cast(Dict[str, str], params))
         self._path = f"nodes/{self._resource.node}/qemu"
+        self._resize_concurrency = cast(int, params.get("resize_concurrency") or 2)
+        if params.get("wait_for_task"):
+            self.wait_for_tasks(cast(float, params.get("task_timeout") or 300))
+
+    def _snapshot_exists(self) -> Optional[bool]:
+        if self._snapshot is None:
+            return None
+
+        return self._snapshot.guest(self._resource.vmid, "qemu") is not None
+
+    def placement(self) -> Optional[str]:
+        """Node currently running the VM according to the cluster snapshot."""
+        if self._snapshot is None:
+            return None
+
+        guest = self._snapshot.guest(self._resource.vmid, "qemu")
+        return guest["node"] if guest else None
+
+    def lookup(self) -> Optional[QemuView]:
+        if self._snapshot_exists() is False:
+            return None
 
-    def lookup(self) -> Optional[Qemu]:
         try:
             request = self._client_class(f"{self._path}/{self._resource.vmid}/config")
             data: dict[str, str] = request.get()
-            qemu = Qemu(self._resource.node, data)
-            return qemu
+            digest = data.get("digest")
+            # clones share configs and digests, the parsed view still belongs to one VM
+            key = (self._resource.node, self._resource.vmid, digest) if digest else None
+            # disks and NICs are only parsed when diffed, existence checks and removals never need them
+            return self.parse_cache.parse(key, lambda: QemuView(self._resource.node, data))
 
-        except Exception as e:
-            if self._vm_not_exists_regex.match(str(e)):
-                return None
+        except NotFoundError:
+            return None
 
-            raise e
+    def validate(self, schema: ApiSchema) -> None:
+        options = {field: value for field, value in self._resource.serialize().items() if field not in ["node"]}
+        schema.validate(self._path, "POST", options)
 
     def remove(self, check: bool) -> AnsibleResult:
         if check:
@@ -41,7 +72,7 @@ class NodeQemuHandler(BaseHandler):
         if self._resource.skiplock:
             request.add_option("skiplock", self._resource.skiplock)
 
-        request.delete()
+        self._wait(request.delete())
         return AnsibleResult(status=True)
 
     def create(self, check: bool) -> AnsibleResult:
@@ -56,21 +87,31 @@ class NodeQemuHandler(BaseHandler):
             if value:
                 request.add_option(field, value)
 
-        request.create()
+        self._wait(request.create())
         return AnsibleResult(status=True)
 
-    def modify(self, check: bool) -> AnsibleResult:
-        lookup = self.lookup()
-        updated_fields = self._resource.diff(lookup)
+    def modify(self, check: bool, lookup: Optional[QemuView] = None) -> AnsibleResult:
+        with self.phase("diff"):
+            if lookup is None:
+                lookup = self.lookup()
+
+            if lookup is None:
+                raise NotFoundError(f"VM {self._resource.vmid} does not exist on node {self._resource.node}")
+
+            updated_fields = self._resource.diff(lookup)
 
         serialized_lookup = lookup.serialize()
         request = self._client_class(f"{self._path}/{self._resource.vmid}/config")
-        options = {}
-        reqeusts: list[Client] = [request]
+        options: Dict[str, Any] = {}
+        resizes: list[Step] = []
         for key, value in updated_fields.items():
             if self._resource.storage_regex.match(key):
                 self._add_storage_options(options, key, value, serialized_lookup)
-                reqeusts.append(self._resize_disk(key, value, serialized_lookup))
+                resize = self._resize_disk(key, value, serialized_lookup)
+                if resize:
+                    storage = self._disk_storage(key, serialized_lookup)
+                    run = self._in_phase(functools.partial(self._run_resize, resize))
+                    resizes.append(Step(key, run, group=storage))
             else:
                 options[key] = value
 
@@ -80,55 +121,66 @@ class NodeQemuHandler(BaseHandler):
         for key, value in options.items():
             request.add_option(key, value)
 
-        for r in reqeusts:
-            if r:
-                r.set()
+        # the write fails with a ConflictError when the config changed since the lookup
+        if lookup.digest:
+            request.add_option("digest", lookup.digest)
+
+        # disks are resized once the config update is done, concurrently but bounded per storage
+        self._wait(request.set())
+        run_steps(resizes, per_group=self._resize_concurrency)
 
         return AnsibleResult(status=True, changes=updated_fields)
 
-    def _add_storage_options(self, options: dict, field: str, value: str, serialized_lookup: dict):
-        def filter_comparable_parts(parts):
-            parts = list(filter(lambda x: "import-from=" not in x and "file=" not in x, parts))
-            parts.sort()
-            return parts
+    def expected(self, state: str, lookup: Optional[QemuView], result: AnsibleResult) -> Optional[Qemu]:
+        expected = super().expected(state, lookup, result)
+        if expected is not None:
+            # every write changes the digest, the new one is only known by reading the config again
+            expected.digest = None
 
-        lookup_value = serialized_lookup.get(field, "")
-        if filter_comparable_parts(value.split(",")) == filter_comparable_parts(lookup_value.split(",")):
-            return {}
+        return expected
 
-        if "import-from" in value or not lookup_value:
-            options[field] = value
-        else:
-            lookup_parts = lookup_value.split(",")
-            lookup_import = next(filter(lambda x: "import-from=" in x, lookup_parts), None)
-            lookup_file = next(filter(lambda x: "file=" in x, lookup_parts), None)
+    def _run_resize(self, request: Client) -> None:
+        self._wait(request.set())
 
-            final_parts = []
-            for part in value.split(","):
-                if "file=" in part:
-                    final_parts.append(lookup_file)
-                else:
-                    final_parts.append(part)
+    def _disk_storage(self, field: str, serialized_lookup: dict) -> Optional[str]:
+        volume = property_dict(serialized_lookup.get(field, "")).get("file")
+        return volume.partition(":")[0] if volume else None
 
-            if lookup_import:
-                final_parts.append(f"{lookup_import}")
+    def _add_storage_options(self, options: dict, field: str, value: str, serialized_lookup: dict) -> None:
+        def comparable_parts(text: str) -> Dict[Optional[str], str]:
+            return {key: part for key, part in parse_property_string(text) if key not in ("import-from", "file")}
 
-            options[field] = ",".join(final_parts)
+        lookup_value = serialized_lookup.get(field, "")
+        if comparable_parts(value) == comparable_parts(lookup_value):
+            return
 
-    def _resize_disk(self, field: str, value: str, serialized_lookup: dict) -> None:
-        lookup_disk_size = next(filter(lambda x: "size=" in x, serialized_lookup.get(field, "").split(",")), None)
-        expected_disk_size = next(filter(lambda x: "size=" in x, value.split(",")), None)
+        tokens = parse_property_string(value)
+        if "import-from" in dict(tokens) or not lookup_value:
+            options[field] = value
+        else:
+            # the volume is kept, only the options of the disk change
+            lookup_tokens = property_dict(lookup_value)
+            final_tokens = [(key, lookup_tokens.get("file") if key == "file" else part) for key, part in tokens]
+            final_tokens.append(("import-from", lookup_tokens.get("import-from")))
+            options[field] = format_property_string(final_tokens)
 
-        if not lookup_disk_size:
-            return
+    def _resize_disk(self, field: str, value: str, serialized_lookup: dict) -> Optional[Client]:
+        # sizes are compared in bytes, `1T` and `1024G` are the same disk and `9G` is smaller than `10G`
+        lookup_disk_size = DiskSize.parse(property_dict(serialized_lookup.get(field, "")).get("size"))
+        expected_disk_size = DiskSize.parse(property_dict(value).get("size"))
+
+        if lookup_disk_size is None or expected_disk_size is None:
+            return None
 
         if expected_disk_size < lookup_disk_size:
-            raise ValueError(f"Cannot shrink disk size from {lookup_disk_size} to {expected_disk_size}")
+            raise ValueError(
+                f"Cannot shrink disk size from size={lookup_disk_size.to_api()} to size={expected_disk_size.to_api()}"
+            )
 
         if lookup_disk_size == expected_disk_size:
-            return
+            return None
 
         request = self._client_class(f"{self._path}/{self._resource.vmid}/resize")
         request.add_option("disk", field)
-        request.add_option("size", expected_disk_size.split("=")[1] + "G")
+        request.add_option("size", expected_disk_size.to_api())
         return request
@@ -1,20 +1,34 @@
-import re
-from typing import Optional
-from ..client import Client
+from typing import Any, Dict, Optional
+from ..client import Client, NotFoundError
 from ...utils import AnsibleResult, AnsibleParams
 from ..resources.pool import Pool
+from ..snapshot import ClusterSnapshot
 from .base import BaseHandler
 
+# options of the module, also used to check batch items
+POOL_ARGUMENT_SPEC: Dict[str, Any] = {
+    "poolid": {"type": "str", "required": True},
+    "comment": {"type": "str", "default": ""},
+    "state": {"type": "str", "default": "present", "choices": ["present", "absent"]},
+}
 
-class PoolHandler(BaseHandler):
-    _pool_not_found_regex = re.compile(r".*pool '.*' does not exist.*")
 
-    def __init__(self, client: type[Client], params: AnsibleParams) -> None:
-        super().__init__(client)
+class PoolHandler(BaseHandler):
+    def __init__(self, client: type[Client], params: AnsibleParams, snapshot: Optional[ClusterSnapshot] = None) -> None:
+        super().__init__(client, params, snapshot)
         self._resource = Pool(params)
         self._path = "pools"
 
+    def _snapshot_exists(self) -> Optional[bool]:
+        if self._snapshot is None:
+            return None
+
+        return self._snapshot.has_pool(self._resource.poolid)
+
     def lookup(self) -> Optional[Pool]:
+        if self._snapshot_exists() is False:
+            return None
+
         try:
             request = self._client_class(f"{self._path}").add_option("poolid", self._resource.poolid)
             pool: list[dict[str, str]] = request.get()
@@ -23,11 +37,8 @@ class PoolHandler(BaseHandler):
                 if pool.poolid == self._resource.poolid:
                     return pool
 
-        except Exception as e:
-            if self._pool_not_found_regex.match(str(e)):
-                return None
-
-            raise e
+        except NotFoundError:
+            return None
 
     def remove(self, check: bool) -> AnsibleResult:
         if check:
@@ -48,9 +59,12 @@ class PoolHandler(BaseHandler):
         request.create()
         return AnsibleResult(status=True)
 
-    def modify(self, check: bool) -> AnsibleResult:
-        lookup = self.lookup()
-        diff = self._resource.diff(lookup)
+    def modify(self, check: bool, lookup: Optional[Pool] = None) -> AnsibleResult:
+        with self.phase("diff"):
+            if lookup is None:
+                lookup = self.lookup()
+
+            diff = self._resource.diff(lookup)
 
         if check or not diff:
             return AnsibleResult(status=bool(diff), changes=diff)
@@ -0,0 +1,133 @@
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from .client import Client, NotFoundError, iter_records
+from .resources.cluster.ha import ClusterHAResource
+from .resources.node.qemu import Qemu
+from .resources.pool import Pool
+from .snapshot import ClusterSnapshot, Entry
+
+GROUP_BY = ("node", "pool", "tag", "ha_group")
+GUEST_TYPES = ("qemu", "lxc")
+
+_UNSAFE_GROUP_CHARACTERS = re.compile(r"[^A-Za-z0-9_]")
+
+
+@dataclass
+class Inventory:
+    hosts: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    groups: Dict[str, List[str]] = field(default_factory=dict)
+    group_vars: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+    def add(self, group: str, host: str) -> None:
+        self.groups.setdefault(group, []).append(host)
+
+
+def fetch_inventory(
+    client: type[Client], configs: bool = False, ha_groups: bool = True, workers: int = 8
+) -> Dict[str, Any]:
+    """Everything the inventory is built from, as plain JSON so the inventory cache can hold it.
+
+    A single `cluster/resources` call lists the guests with their node, pool, tags and HA state. HA groups take one
+    `cluster/ha/resources` call, made only when some guest is HA managed. With `configs`, the config of every QEMU
+    guest is read as well, on a pool of `workers` threads.
+    """
+    resources = list(iter_records(client("cluster/resources")))
+    guests = [entry for entry in resources if entry.get("type") in GUEST_TYPES]
+    data: Dict[str, Any] = {"resources": resources, "ha_resources": [], "configs": {}}
+    if ha_groups and any(entry.get("hastate") for entry in guests):
+        data["ha_resources"] = list(iter_records(client("cluster/ha/resources")))
+
+    if configs:
+        qemus = [entry for entry in guests if entry["type"] == "qemu"]
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for vmid, config in executor.map(lambda entry: _read_config(client, entry), qemus):
+                if config is not None:
+                    data["configs"][vmid] = config
+
+    return data
+
+
+def _read_config(client: type[Client], entry: Entry) -> Tuple[str, Optional[Dict[str, Any]]]:
+    vmid = str(entry["vmid"])
+    try:
+        return vmid, client(f"nodes/{entry['node']}/qemu/{vmid}/config").get()
+    except NotFoundError:
+        # removed or migrated since the `cluster/resources` call
+        return vmid, None
+
+
+def group_name(prefix: str, kind: str, value: str) -> str:
+    return _UNSAFE_GROUP_CHARACTERS.sub("_", f"{prefix}{kind}_{value}")
+
+
+def _guest(
+    entry: Entry, tags: List[str], ha_group: Optional[str], config: Optional[Dict[str, Any]]
+) -> Tuple[Dict[str, Any], Dict[str, List[Optional[str]]]]:
+    """Host variables of a guest, without prefix, and the values of the groups it belongs to."""
+    hostvars = {
+        "vmid": str(entry["vmid"]),
+        "type": entry["type"],
+        "node": entry.get("node"),
+        "status": entry.get("status"),
+        "pool": entry.get("pool"),
+        "tags": tags,
+        "hastate": entry.get("hastate"),
+        "ha_group": ha_group,
+    }
+    if config is not None:
+        serialized = Qemu(entry["node"], config).serialize()
+        hostvars["config"] = {key: value for key, value in serialized.items() if key != "node"}
+
+    groups: Dict[str, List[Optional[str]]] = {
+        "node": [entry.get("node")],
+        "pool": [entry.get("pool")],
+        "tag": list(tags),
+        "ha_group": [ha_group],
+    }
+    return {key: value for key, value in hostvars.items() if value is not None}, groups
+
+
+def build_inventory(
+    data: Dict[str, Any],
+    group_by: Iterable[str] = GROUP_BY,
+    prefix: str = "proxmox_",
+    hostnames: str = "name",
+    guest_types: Iterable[str] = GUEST_TYPES,
+    templates: bool = False,
+) -> Inventory:
+    """Hosts, groups and variables of the guests in `data`, as returned by `fetch_inventory`.
+
+    Hosts are named after the guest, or its vmid when it has no name or `hostnames` is `vmid`. A name used by more
+    than one guest gets the vmid appended. Host variables and group names start with `prefix`.
+    """
+    snapshot = ClusterSnapshot.from_entries(data["resources"])
+    ha_resources = [ClusterHAResource(entry) for entry in data.get("ha_resources", [])]
+    ha_groups = {resource.sid: resource.group for resource in ha_resources}
+    configs = data.get("configs", {})
+    kinds = [kind for kind in GROUP_BY if kind in group_by]
+
+    inventory = Inventory()
+    for entry in snapshot.guests():
+        if entry["type"] not in guest_types or (entry.get("template") and not templates):
+            continue
+
+        vmid = str(entry["vmid"])
+        host = str(entry.get("name") or vmid) if hostnames == "name" else vmid
+        if host in inventory.hosts:
+            host = f"{host}-{vmid}"
+
+        sid = f"{'vm' if entry['type'] == 'qemu' else 'ct'}:{vmid}"
+        hostvars, groups = _guest(entry, snapshot.guest_tags(entry), ha_groups.get(sid), configs.get(vmid))
+        inventory.hosts[host] = {f"{prefix}{key}": value for key, value in hostvars.items()}
+        for kind in kinds:
+            for value in filter(None, groups[kind]):
+                inventory.add(group_name(prefix, kind, value), host)
+
+    if "pool" in kinds:
+        for poolid in snapshot.pools():
+            pool = Pool({"poolid": poolid, **(snapshot.pool(poolid) or {})})
+            inventory.group_vars[group_name(prefix, "pool", poolid)] = {f"{prefix}pool_comment": pool.comment or ""}
+
+    return inventory
@@ -0,0 +1,32 @@
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+Token = Tuple[Optional[str], str]
+
+
+@lru_cache(maxsize=4096)
+def parse_property_string(text: str) -> Tuple[Token, ...]:
+    """Tokens of a property string like `local-lvm:vm-101-disk-0,cache=writeback,size=32G`.
+
+    Every comma separated part is a `(key, value)` pair, split at its first `=` the way the node does it, so
+    values may hold `=` and `:`. A part without a key, the value of the default key, has `None` as key.
+    Results are cached, configs repeat the same disk and NIC strings across many VMs.
+    """
+    tokens = []
+    for part in text.split(","):
+        if not part:
+            continue
+
+        key, separator, value = part.partition("=")
+        tokens.append((key, value) if separator else (None, part))
+
+    return tuple(tokens)
+
+
+def property_dict(text: str) -> Dict[Optional[str], str]:
+    return dict(parse_property_string(text))
+
+
+def format_property_string(tokens: Iterable[Tuple[Optional[str], Any]]) -> str:
+    """Property string of `(key, value)` pairs, keys of `None` write the bare value and `None` values are left out."""
+    return ",".join(str(value) if key is None else f"{key}={value}" for key, value in tokens if value is not None)
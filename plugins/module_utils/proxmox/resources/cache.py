@@ -0,0 +1,49 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class ParseCache:
+    """LRU cache of resources parsed from API responses, keyed by the config `digest`.
+
+    Proxmox changes the digest with every change of the config, so entries never go stale. Cached resources
+    are shared between handlers and must not be modified.
+    """
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def parse(self, key: Optional[Hashable], parse: Callable[[], T]) -> T:
+        """Cached resource for `key`, `parse` builds it on a miss. Without a key nothing is cached."""
+        if key is None:
+            return parse()
+
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                cached: T = self._entries[key]
+                return cached
+
+            self.misses += 1
+
+        value = parse()
+        with self._lock:
+            self._entries[key] = value
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
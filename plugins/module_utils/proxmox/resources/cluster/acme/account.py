@@ -3,6 +3,11 @@ from ...resource import Resource
 
 
 class ClusterAcmeAccount(Resource):
+    __slots__ = ("contact", "directory", "eab_hmac_key", "eab_kid", "name", "tos_url")
+    _mappings = {
+        "eab_hmac_key": "eab-hmac-key",
+        "eab_kid": "eab-kid",
+    }
 
     def __init__(self, data: Dict[str, Any]):
         super().__init__()
@@ -12,8 +17,3 @@ class ClusterAcmeAccount(Resource):
         self.eab_kid: Optional[str] = data.get("eab-kid", None)
         self.name: Optional[str] = data.get("name", None)
         self.tos_url: Optional[str] = data.get("tos_url", None)
-
-        self._mappings = {
-            "eab_hmac_key": "eab-hmac-key",
-            "eab_kid": "eab-kid",
-        }
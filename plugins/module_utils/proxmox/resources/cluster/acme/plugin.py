@@ -3,6 +3,11 @@ from ...resource import Resource
 
 
 class ClusterAcmePlugin(Resource):
+    __slots__ = ("id", "type", "api", "data", "disable", "nodes", "validation_delay")
+    _mappings = {
+        "validation_delay": "validation-delay",
+    }
+    _diff_skip = ("id", "disable", "nodes", "validation-delay")
 
     def __init__(self, data: Dict[str, Any]):
         super().__init__()
@@ -13,8 +18,3 @@ class ClusterAcmePlugin(Resource):
         self.disable: Optional[bool] = data.get("disable", False)
         self.nodes: list[str] = data.get("nodes", [])
         self.validation_delay: Optional[int] = data.get("validation_delay", data.get("validation-delay", 0))
-
-        self._mappings = {
-            "validation_delay": "validation-delay",
-        }
-        self._diff_skip = ["id", "disable", "nodes", "validation-delay"]
@@ -1,5 +1,6 @@
 from typing import Any, Dict, Optional, List
 from ...resource import Resource
+from ....property_string import parse_property_string
 from .....utils import load_objs_from_list
 
 
@@ -33,20 +34,22 @@ class Nodes:
         self.nodes.extend(load_objs_from_list(data, Node))
 
     def _load_from_str(self, data: str):
-        for node in data.split(","):
+        for key, node in parse_property_string(data):
             parts = node.split(":")
+            if key is not None or len(parts) > 2:
+                raise ValueError(f"Invalid format for nodes: {data}")
+
             if len(parts) == 1:
                 self.nodes.append(Node({"name": parts[0]}))
-            elif len(parts) == 2:
-                self.nodes.append(Node({"name": parts[0], "priority": parts[1]}))
             else:
-                raise ValueError(f"Invalid format for nodes: {data}")
+                self.nodes.append(Node({"name": parts[0], "priority": parts[1]}))
 
     def __str__(self):
         return ",".join([str(node) for node in self.nodes])
 
 
 class ClusterHAGroup(Resource):
+    __slots__ = ("group", "nodes", "comment", "nofailback", "restricted", "type")
 
     def __init__(self, data: Dict[str, Any]):
         super().__init__()
@@ -3,6 +3,7 @@ from ...resource import Resource
 
 
 class ClusterHAResource(Resource):
+    __slots__ = ("sid", "comment", "group", "max_relocate", "max_restart", "state")
 
     def __init__(self, data: Dict[str, Any]):
         super().__init__()
@@ -3,6 +3,29 @@ from ..resource import Resource
 
 
 class ClusterOptions(Resource):
+    __slots__ = (
+        "bwlimit",
+        "console",
+        "crs",
+        "description",
+        "email_from",
+        "fencing",
+        "ha",
+        "http_proxy",
+        "keyboard",
+        "language",
+        "mac_prefix",
+        "max_workers",
+        "migration",
+        "migration_unsecure",
+        "next_id",
+        "notify",
+        "registred_tags",
+        "tag_style",
+        "u2f",
+        "user_tag_access",
+        "webauthn",
+    )
 
     def __init__(self, data: Dict[str, Any]):
         super().__init__()
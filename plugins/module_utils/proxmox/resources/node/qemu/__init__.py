@@ -3,10 +3,109 @@ from typing import Dict, List, Optional, Any
 from .net import QemuNet
 from .storage import IDEStorage, SATAStorage, SCSIStorage, VIRTIOStorage
 from ...resource import Resource
+from ....property_string import parse_property_string
 from .....utils import load_objs_from_list
 
 
 class Qemu(Resource):
+    __slots__ = (
+        "node",
+        "vmid",
+        "digest",
+        "acpi",
+        "affinity",
+        "agent",
+        "amd_sev",
+        "arch",
+        "archive",
+        "args",
+        "audio0",
+        "autostart",
+        "balloon",
+        "bios",
+        "boot",
+        "bwlimit",
+        "cdrom",
+        "cicustom",
+        "cipassword",
+        "citype",
+        "ciupgrade",
+        "ciuser",
+        "cores",
+        "cpu",
+        "cpulimit",
+        "cpuunits",
+        "description",
+        "efidisk0",
+        "force",
+        "freeze",
+        "hostpci",
+        "hookscript",
+        "hugepages",
+        "ide",
+        "import_working_storage",
+        "ipconfig",
+        "ivshmem",
+        "keep_hugepages",
+        "keyboard",
+        "kvm",
+        "live_restore",
+        "localtime",
+        "lock",
+        "machine",
+        "memory",
+        "migrate_downtime",
+        "migrate_speed",
+        "name",
+        "nameserver",
+        "net",
+        "numa",
+        "onboot",
+        "ostype",
+        "parallel",
+        "pool",
+        "protection",
+        "reboot",
+        "rng0",
+        "sata",
+        "scsi",
+        "scsihw",
+        "searchdomain",
+        "serial",
+        "shares",
+        "smbios1",
+        "sockets",
+        "spice_enhancements",
+        "sshkeys",
+        "start",
+        "startdate",
+        "startup",
+        "storage",
+        "tablet",
+        "tags",
+        "tdf",
+        "template",
+        "tpmstate0",
+        "unique",
+        "unused",
+        "usb",
+        "vcpus",
+        "vga",
+        "virtio",
+        "vmgenid",
+        "vmstatestorage",
+        "watchdog",
+        "destroy_unreferenced_disks",
+        "purge",
+        "skiplock",
+    )
+    _mappings = {
+        "live_restore": "live-restore",
+        "import_working_storage": "import-working-storage",
+    }
+    _serialize_skip = ("destroy_unreferenced_disks", "purge", "skiplock", "digest")
+    _diff_skip = ("vmid", "pool")
+
     storage_regex = re.compile(r"^(ide|sata|scsi|virtio)(\d+)$")
     net_regex = re.compile(r"^net(\d+)$")
 
@@ -16,6 +115,8 @@ class Qemu(Resource):
         vmid = data.get("vmid", None)
         self.node: Optional[str] = node
         self.vmid: Optional[str] = str(vmid) if vmid is not None else None
+        # digest of the config it was read from, sent back with writes to reject them if the config changed since
+        self.digest: Optional[str] = data.get("digest", None)
 
         # Create options
         self.acpi: Optional[str] = data.get("acpi", None)
@@ -109,15 +210,6 @@ class Qemu(Resource):
         self.purge: bool = data.get("purge", False)
         self.skiplock: bool = data.get("skiplock", False)
 
-        self._mappings.update(
-            {
-                "live_restore": "live-restore",
-                "import_working_storage": "import-working-storage",
-            }
-        )
-        self._serialize_skip.extend(["destroy_unreferenced_disks", "purge", "skiplock"])
-        self._diff_skip.extend(["vmid", "pool"])
-
     def _normalize_proxmox_format(self, raw: Dict[str, str]) -> Dict[str, Any]:
         data: Dict[str, Any] = {}
         noramlizers = [
@@ -139,16 +231,13 @@ class Qemu(Resource):
                 "idx": storage_id,
             }
 
-            for param in value.split(","):
-                if "=" in param:
-                    key, value = param.split("=")
-                    partial_data[key] = value
-                elif ":" in param:
-                    storage_name, img_path = param.split(":")
-                    partial_data["storage"] = storage_name
-                    partial_data["file"] = f"{storage_name}:{img_path}"
+            for key, param in parse_property_string(value):
+                if key is not None:
+                    partial_data[key] = param
                 else:
-                    raise ValueError(f"Invalid storage parameter format: {param}")
+                    # the volume, `none` or a path for CD-ROMs and passed through devices
+                    partial_data["storage"] = param.partition(":")[0]
+                    partial_data["file"] = param
 
             state: list = data.get(storage_type, [])
             state.append(partial_data)
@@ -164,16 +253,14 @@ class Qemu(Resource):
                 "idx": net_id,
             }
 
-            for param in value.split(","):
-                if "=" in param:
-                    key, value = param.split("=")
-                    if value.count(":") == 5:
-                        partial_data["model"] = key
-                    else:
-                        partial_data[key] = value
+            for key, param in parse_property_string(value):
+                if key is None:
+                    raise ValueError(f"Invalid net parameter format: {param}")
 
+                if param.count(":") == 5:
+                    partial_data["model"] = key
                 else:
-                    raise ValueError(f"Invalid net parameter format: {param}")
+                    partial_data[key] = param
 
             state: list = data.get("net", [])
             state.append(partial_data)
@@ -4,6 +4,7 @@ from ...resource import ResourceField
 
 
 class QemuNet(ResourceField):
+    __slots__ = ("model", "bridge", "firewall", "link_down", "macaddr", "mtu", "queues", "rate", "tag", "trunks")
 
     def __init__(self, data: Dict[str, str]):
         super().__init__("net", int(data["idx"]))
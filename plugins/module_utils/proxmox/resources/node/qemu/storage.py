@@ -1,15 +1,134 @@
-from typing import Optional, Dict
+import functools
+import re
+from decimal import Decimal, InvalidOperation
+from typing import Any, Optional, Dict
 from ...resource import ResourceField
 
+_SIZE_REGEX = re.compile(r"(\d+(?:\.\d+)?)\s*([KMGT]?)", re.IGNORECASE)
+_UNITS = (("T", 1024**4), ("G", 1024**3), ("M", 1024**2), ("K", 1024))
+_UNIT_BYTES = dict(_UNITS)
+
+
+@functools.total_ordering
+class DiskSize:
+    """Size of a disk in bytes, compared by value whatever its unit, so `1T`, `1024G` and `1024` are equal.
+
+    Sizes without unit are gibibytes, like the `size` option of the modules and the `storage:N` allocation syntax.
+    Whole gibibytes are written as a plain number, other sizes with the largest unit that holds them exactly.
+    """
+
+    __slots__ = ("bytes",)
+
+    def __init__(self, size_bytes: int) -> None:
+        self.bytes = size_bytes
+
+    @classmethod
+    def parse(cls, value: Any) -> Optional["DiskSize"]:
+        if value is None or isinstance(value, DiskSize):
+            return value
+
+        match = _SIZE_REGEX.fullmatch(str(value).strip())
+        if not match:
+            raise ValueError(f"Invalid disk size: {value}")
+
+        number, unit = match.groups()
+        try:
+            return cls(int(Decimal(number) * _UNIT_BYTES[unit.upper() or "G"]))
+        except InvalidOperation:
+            raise ValueError(f"Invalid disk size: {value}")
+
+    @property
+    def gibibytes(self) -> str:
+        """Size in gibibytes without exponent, as used by `storage:N` to allocate a new volume."""
+        return format((Decimal(self.bytes) / _UNIT_BYTES["G"]).normalize(), "f")
+
+    def to_api(self) -> str:
+        """Size with its unit for the `resize` call, which reads a plain number as bytes."""
+        for unit, unit_bytes in _UNITS:
+            if self.bytes % unit_bytes == 0:
+                return f"{self.bytes // unit_bytes}{unit}"
+
+        return f"{-(-self.bytes // 1024)}K"
+
+    def __str__(self) -> str:
+        if self.bytes % _UNIT_BYTES["G"] == 0:
+            return str(self.bytes // _UNIT_BYTES["G"])
+
+        return self.to_api()
+
+    def __repr__(self) -> str:
+        return f"DiskSize({self.to_api()!r})"
+
+    def _other(self, other: Any) -> Optional["DiskSize"]:
+        if isinstance(other, (DiskSize, str, int)):
+            try:
+                return DiskSize.parse(other)
+            except ValueError:
+                return None
+
+        return None
+
+    def __eq__(self, other: Any) -> bool:
+        other = self._other(other)
+        return NotImplemented if other is None else self.bytes == other.bytes
+
+    def __lt__(self, other: Any) -> bool:
+        other = self._other(other)
+        return NotImplemented if other is None else self.bytes < other.bytes
+
+    def __hash__(self) -> int:
+        return hash(self.bytes)
+
 
 class BaseStorage(ResourceField):
+    __slots__ = (
+        "file",
+        "aio",
+        "backup",
+        "bps",
+        "bps_max_length",
+        "bps_rd",
+        "bps_rd_max_length",
+        "bps_wr",
+        "bps_wr_max_length",
+        "cache",
+        "cyls",
+        "detect_zeroes",
+        "discard",
+        "format",
+        "heads",
+        "import_from",
+        "iops",
+        "iops_max_length",
+        "iops_rd",
+        "iops_rd_max",
+        "ios_rd_max_length",
+        "iops_wr",
+        "iops_wr_max",
+        "iops_wr_max_length",
+        "media",
+        "replicate",
+        "rerror",
+        "secs",
+        "serial",
+        "shared",
+        "size",
+        "snapshot",
+        "trans",
+        "werror",
+    )
+    _mappings = {
+        "import_from": "import-from",
+    }
 
     def __init__(self, name: str, data: Dict[str, str]):
         super().__init__(name, int(data["idx"]))
-        size: str = str(data["size"])[:-1] if str(data["size"]).endswith("G") else data["size"]
+        # CD-ROM drives and passed through devices have no size
+        size = DiskSize.parse(data.get("size", None))
         storage: str = data["storage"]
         import_from = data.get("import_from", data.get("import-from", None))
-        file = data.get("file", f"{storage}:{size}" if import_from is None else f"{storage}:0")
+        allocation = size.gibibytes if size is not None and import_from is None else 0
+        file = data.get("file", f"{storage}:{allocation}")
 
         self.file: Optional[str] = file
         self.aio: Optional[str] = data.get("aio", None)
@@ -41,19 +160,14 @@ class BaseStorage(ResourceField):
         self.secs: Optional[str] = data.get("secs", None)
         self.serial: Optional[str] = data.get("serial", None)
         self.shared: Optional[str] = data.get("shared", None)
-        self.size: Optional[str] = size
+        self.size: Optional[DiskSize] = size
         self.snapshot: Optional[str] = data.get("snapshot", None)
         self.trans: Optional[str] = data.get("trans", None)
         self.werror: Optional[str] = data.get("werror", None)
 
-        self._mappings.update(
-            {
-                "import_from": "import-from",
-            }
-        )
-
 
 class IDEStorage(BaseStorage):
+    __slots__ = ("mbps", "mbps_max", "mbps_rd", "mbps_rd_max", "mbps_wr", "mbps_wr_max", "model", "ssd", "wwn")
 
     def __init__(self, data: Dict[str, str]):
         super().__init__("ide", data)
@@ -69,6 +183,22 @@ class IDEStorage(BaseStorage):
 
 
 class SCSIStorage(BaseStorage):
+    __slots__ = (
+        "iothreads",
+        "mbps",
+        "mbps_max",
+        "mbps_rd",
+        "mbps_rd_max",
+        "mbps_wr",
+        "mbps_wr_max",
+        "product",
+        "queues",
+        "ro",
+        "scsiblock",
+        "ssd",
+        "vendor",
+        "wwn",
+    )
 
     def __init__(self, data: Dict[str, str]):
         super().__init__("scsi", data)
@@ -89,6 +219,7 @@ class SCSIStorage(BaseStorage):
 
 
 class SATAStorage(BaseStorage):
+    __slots__ = ("mbps", "mbps_max", "mbps_rd", "mbps_rd_max", "mbps_wr", "mbps_wr_max", "ssd", "wwn")
 
     def __init__(self, data):
         super().__init__("sata", data)
@@ -103,6 +234,7 @@ class SATAStorage(BaseStorage):
 
 
 class VIRTIOStorage(BaseStorage):
+    __slots__ = ("iothreads", "mbps", "mbps_max", "mbps_rd", "mbps_rd_max", "mbps_wr", "mbps_wr_max", "ro")
 
     def __init__(self, data):
         super().__init__("virtio", data)
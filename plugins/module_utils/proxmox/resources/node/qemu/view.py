@@ -0,0 +1,59 @@
+from typing import Any, Dict, Optional
+from . import Qemu
+
+# fields `Qemu` builds from several raw keys or with defaults, read from the parsed config
+_PARSED = frozenset(["ide", "sata", "scsi", "virtio", "net", "destroy_unreferenced_disks", "purge", "skiplock"])
+_FIELDS = frozenset(Qemu._schema.keys)
+
+
+class QemuView:
+    """Read only view of a raw VM config, parsed into a `Qemu` only when needed.
+
+    Plain fields like `name`, `pool` or `tags` are read straight from the raw config. Disks and NICs, `serialize`,
+    `diff`, `to_dict` and `merge` parse the whole config once, so listings and existence checks skip the parsing.
+    """
+
+    __slots__ = ("node", "_raw", "_qemu")
+
+    def __init__(self, node: str, raw: Dict[str, Any]) -> None:
+        self.node = node
+        self._raw = raw
+        self._qemu: Optional[Qemu] = None
+
+    @property
+    def raw(self) -> Dict[str, Any]:
+        return self._raw
+
+    @property
+    def qemu(self) -> Qemu:
+        if self._qemu is None:
+            self._qemu = Qemu(self.node, self._raw)
+
+        return self._qemu
+
+    @property
+    def vmid(self) -> Optional[str]:
+        vmid = self._raw.get("vmid")
+        return str(vmid) if vmid is not None else None
+
+    def __getattr__(self, name: str) -> Any:
+        if name in _PARSED:
+            return getattr(self.qemu, name)
+
+        if name in _FIELDS:
+            value = self._raw.get(name)
+            return value if value is not None else self._raw.get(name.replace("_", "-"))
+
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+    def serialize(self) -> Dict[str, str]:
+        return self.qemu.serialize()
+
+    def diff(self, other: Any) -> Dict[str, str]:
+        return self.qemu.diff(other)
+
+    def to_dict(self) -> Dict[str, str]:
+        return self.qemu.to_dict()
+
+    def merge(self, other: Qemu, changes: Dict[str, str]) -> Qemu:
+        return self.qemu.merge(other, changes)
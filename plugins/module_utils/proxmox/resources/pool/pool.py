@@ -3,6 +3,7 @@ from ..resource import Resource
 
 
 class Pool(Resource):
+    __slots__ = ("poolid", "comment")
 
     def __init__(self, data: Dict[str, str]):
         super().__init__()
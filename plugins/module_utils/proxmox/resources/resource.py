@@ -1,96 +1,182 @@
-from typing import Dict, Optional, List
+import copy
+from operator import attrgetter
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, TypeVar
+
+R = TypeVar("R", bound="Resource")
+
+
+class _Schema:
+    """Fields of a resource class in declaration order with their API names, worked out once per class.
+
+    Fields are the `__slots__` of the class and its bases. `_mappings`, `_serialize_skip` and `_diff_skip` are
+    class level and extended, not replaced, by subclasses.
+    """
+
+    def __init__(self, cls: type) -> None:
+        mro = list(reversed(cls.__mro__))
+        mappings: Dict[str, str] = {}
+        skip = set()
+        diff_skip = set()
+        for base in mro:
+            mappings.update(base.__dict__.get("_mappings", {}))
+            skip.update(base.__dict__.get("_serialize_skip", ()))
+            diff_skip.update(base.__dict__.get("_diff_skip", ()))
+
+        self.keys = tuple(key for base in mro for key in base.__dict__.get("__slots__", ()))
+        self.names = tuple(mappings.get(key, key) for key in self.keys)
+        self.values = _getter(self.keys)
+        serialized = [key for key in self.keys if key not in skip]
+        self.serialized_names = tuple(mappings.get(key, key) for key in serialized)
+        self.serialized_values = _getter(serialized)
+        self.serialized = tuple(zip(serialized, self.serialized_names))
+        self.diff_skip = frozenset(diff_skip)
+
+
+def _getter(keys: Sequence[str]) -> Callable[[Any], Tuple[Any, ...]]:
+    """Fetch the values of the fields `keys` from an instance in one call."""
+    if len(keys) > 1:
+        return attrgetter(*keys)
+
+    return lambda obj: tuple(getattr(obj, key) for key in keys)
 
 
 class __Base:
-    def __init__(self):
-        self._mappings: Dict[str, str] = {}
-        self._serialize_skip: List[str] = ["_mappings", "_serialize_skip"]
+    __slots__ = ()
+    # metadata is shared by all instances of a class, an instance only holds its field values. A slot is a fixed
+    # pointer in the instance, an unset field points at the shared `None` and allocates nothing. Class level defaults
+    # cannot share a name with a slot, and leaving slots unset would make every read of them raise AttributeError.
+    _mappings: Dict[str, str] = {}
+    _serialize_skip: Tuple[str, ...] = ()
+    _schema: _Schema
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        if "__slots__" not in cls.__dict__:
+            raise TypeError(f"{cls.__name__} must declare its fields in __slots__")
+
+        cls._schema = _Schema(cls)
 
     def to_dict(self) -> Dict[str, str]:
-        data = {}
-        for key, value in self.__dict__.items():
+        data: Dict[str, str] = {}
+        schema = self._schema
+        for mapped_key, value in zip(schema.names, schema.values(self)):
+            if value is None:
+                continue
+
             if isinstance(value, list):
                 for item in value:
-                    data.update(self._normalize(key, item))
+                    _to_dict_into(data, mapped_key, item)
+            elif isinstance(value, _Fields):
+                data.update(value.to_dict())
             else:
-                data.update(self._normalize(key, value))
+                data[mapped_key] = str(value)
 
         return data
 
-    def _normalize(self, key: str, value: Optional[str]) -> Dict[str, str]:
-        if value is None:
-            return {}
-
-        if hasattr(value, "to_dict"):
-            return value.to_dict()
-        else:
-            mapped_key = self._mappings.get(key, key)
-            return {mapped_key: str(value)}
-
 
 class Resource(__Base):
-    def __init__(self):
-        super().__init__()
-        self._diff_skip: List[str] = []
-        self._serialize_skip.extend(["_diff_skip"])
-
-    def __normalize(self, key: str, value: Optional[str]) -> Dict[str, str]:
-        if value is None:
-            return {}
-
-        if hasattr(value, "serialize"):
-            return value.serialize()
-        else:
-            mapped_key = self._mappings.get(key, key)
-            return {mapped_key: str(value)}
+    __slots__ = ()
+    _diff_skip: Tuple[str, ...] = ()
 
     def serialize(self) -> Dict[str, str]:
-        data = {}
-        for key, value in self.__dict__.items():
-            if key in self._serialize_skip:
+        data: Dict[str, str] = {}
+        schema = self._schema
+        for mapped_key, value in zip(schema.serialized_names, schema.serialized_values(self)):
+            if value is None:
                 continue
 
             if isinstance(value, list):
                 for item in value:
-                    data.update(self.__normalize(key, item))
+                    _serialize_into(data, mapped_key, item)
+            elif isinstance(value, _Fields):
+                data.update(value.serialize())
             else:
-                data.update(self.__normalize(key, value))
+                data[mapped_key] = str(value)
 
         return data
 
     def diff(self, other: Optional["Resource"]) -> Dict[str, str]:
         diff: Dict[str, str] = {}
+        diff_skip = self._schema.diff_skip
         serialized_other = other.serialize() if other else {}
         for key, value in self.serialize().items():
-            if value is None or key in self._diff_skip:
+            if key in diff_skip:
                 continue
 
             other_value = serialized_other.get(key, None)
-            if other_value is None or value.strip() != serialized_other.get(key, None).strip():
+            if other_value is None or value.strip() != other_value.strip():
                 diff[key] = value
 
         return diff
 
+    def merge(self: R, other: "Resource", changes: Dict[str, str]) -> R:
+        """Copy of the resource with the fields of `other` behind `changes`, a diff of `other` against it."""
+        merged = copy.copy(self)
+        for key, mapped_key in other._schema.serialized:
+            value = getattr(other, key)
+            values = value if isinstance(value, list) else [value]
+            if not any(changes.keys() & _serialize_into({}, mapped_key, item).keys() for item in values):
+                continue
+
+            if isinstance(value, list) and all(isinstance(item, ResourceField) for item in value):
+                setattr(merged, key, self.__merge_fields(getattr(merged, key, None) or [], value, changes))
+            else:
+                setattr(merged, key, value)
+
+        return merged
+
+    def __merge_fields(
+        self, fields: List["ResourceField"], others: List["ResourceField"], changes: Dict[str, str]
+    ) -> List["ResourceField"]:
+        merged = {field.key(): field for field in fields}
+        for field in others:
+            if field.key() in changes:
+                merged[field.key()] = field
+
+        return list(merged.values())
+
 
 class ResourceField(__Base):
+    __slots__ = ("_name", "idx")
+    _serialize_skip = ("_name", "idx")
+
     def __init__(self, name: str, idx: Optional[int] = None):
-        super().__init__()
         self._name = name
         self.idx = idx
-        self._serialize_skip.extend(["idx", "_name"])
 
     def serialize(self) -> Dict[str, str]:
-        params = []
-        for key, value in self.__dict__.items():
-            if key in self._serialize_skip:
-                continue
+        schema = self._schema
+        values = zip(schema.serialized_names, schema.serialized_values(self))
+        return {self.key(): ",".join([f"{mapped_key}={value}" for mapped_key, value in values if value])}
 
-            mapped_key = self._mappings.get(key, key)
-            if value:
-                params.append(f"{mapped_key}={value}")
-
-        key = self._name
+    def key(self) -> str:
+        """Name of the field in the API, with its index."""
         if self.idx is not None:
-            key = f"{key}{self.idx}"
+            return f"{self._name}{self.idx}"
+
+        return self._name
+
+
+_Fields = (Resource, ResourceField)
+
+
+def _serialize_into(data: Dict[str, str], key: str, value: Any) -> Dict[str, str]:
+    if value is None:
+        return data
+
+    if isinstance(value, _Fields):
+        data.update(value.serialize())
+    else:
+        data[key] = str(value)
+
+    return data
+
+
+def _to_dict_into(data: Dict[str, str], key: str, value: Any) -> None:
+    if value is None:
+        return
 
-        return {key: ",".join(params)}
+    if isinstance(value, _Fields):
+        data.update(value.to_dict())
+    else:
+        data[key] = str(value)
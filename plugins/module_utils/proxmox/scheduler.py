@@ -0,0 +1,55 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+
+class ApplyError(Exception):
+    """Some steps failed, `errors` holds the error of every failed step by step name."""
+
+    def __init__(self, errors: Dict[str, Exception], total: int) -> None:
+        self.errors = errors
+        details = "; ".join(f"{name}: {error}" for name, error in errors.items())
+        super().__init__(f"{len(errors)} of {total} steps failed - {details}")
+
+
+@dataclass
+class Step:
+    name: str
+    run: Callable[[], Any]
+    # steps of the same group share the `per_group` concurrency limit, e.g. disks on one storage
+    group: Optional[str] = None
+
+
+def run_steps(steps: List[Step], per_group: int = 2, workers: int = 8) -> Dict[str, Any]:
+    """Run independent steps concurrently, at most `per_group` at a time within a group.
+
+    Every step runs even when others fail, the failures are raised together as an `ApplyError` at the end.
+    Returns the result of every step by step name.
+    """
+    if not steps:
+        return {}
+
+    slots = {step.group: threading.BoundedSemaphore(max(1, per_group)) for step in steps}
+
+    def run(step: Step) -> Any:
+        with slots[step.group]:
+            return step.run()
+
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(steps)))) as executor:
+        futures = {step.name: executor.submit(run, step) for step in steps}
+
+    results: Dict[str, Any] = {}
+    errors: Dict[str, Exception] = {}
+    for name, future in futures.items():
+        error = future.exception()
+        if isinstance(error, Exception):
+            errors[name] = error
+        else:
+            # interrupts are not step failures, future.result() raises them again
+            results[name] = future.result()
+
+    if errors:
+        raise ApplyError(errors, len(steps))
+
+    return results
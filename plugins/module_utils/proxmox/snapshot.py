@@ -0,0 +1,151 @@
+import re
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+from .client import Client, iter_records
+
+Entry = Dict[str, Any]
+
+
+class ClusterSnapshot:
+    """In-memory index of a single `cluster/resources` call.
+
+    Handlers use it to answer existence and placement questions without a round trip per resource,
+    the data is fetched on first use and shared by every handler holding the snapshot.
+    """
+
+    _tags_separator = re.compile(r"[;, ]+")
+    _guest_types = ("qemu", "lxc")
+
+    def __init__(self, client: Optional[type[Client]]) -> None:
+        self._client_class = client
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._by_vmid: Dict[str, Entry] = {}
+        self._by_node: Dict[str, List[Entry]] = {}
+        self._by_pool: Dict[str, List[Entry]] = {}
+        self._by_type: Dict[str, List[Entry]] = {}
+        self._by_tag: Dict[str, List[Entry]] = {}
+        self._pools: Dict[str, Entry] = {}
+
+    @classmethod
+    def from_entries(cls, entries: Iterable[Entry]) -> "ClusterSnapshot":
+        """Snapshot of `cluster/resources` entries read earlier, for example from a cache, never calling the cluster."""
+        snapshot = cls(None)
+        snapshot._index(entries)
+        snapshot._loaded = True
+        return snapshot
+
+    def load(self) -> "ClusterSnapshot":
+        with self._lock:
+            if not self._loaded:
+                if self._client_class is None:
+                    raise RuntimeError("Snapshot has no client to load cluster/resources with")
+
+                self._index(iter_records(self._client_class("cluster/resources")))
+                self._loaded = True
+
+        return self
+
+    def refresh(self) -> "ClusterSnapshot":
+        with self._lock:
+            self._loaded = False
+
+        return self.load()
+
+    def _index(self, entries: Iterable[Entry]) -> None:
+        for index in (self._by_vmid, self._by_node, self._by_pool, self._by_type, self._by_tag, self._pools):
+            index.clear()
+
+        for entry in entries:
+            self._add(entry)
+
+    def _add(self, entry: Entry) -> None:
+        entry_type = entry.get("type", "")
+        self._by_type.setdefault(entry_type, []).append(entry)
+        if entry_type == "pool":
+            self._pools[entry["pool"]] = entry
+            return
+
+        if entry.get("node"):
+            self._by_node.setdefault(entry["node"], []).append(entry)
+
+        if entry_type not in self._guest_types:
+            return
+
+        self._by_vmid[str(entry["vmid"])] = entry
+        if entry.get("pool"):
+            self._by_pool.setdefault(entry["pool"], []).append(entry)
+
+        for tag in self._split_tags(entry.get("tags")):
+            self._by_tag.setdefault(tag, []).append(entry)
+
+    def _split_tags(self, tags: Optional[str]) -> List[str]:
+        return [tag for tag in self._tags_separator.split(tags or "") if tag]
+
+    def guest_tags(self, entry: Entry) -> List[str]:
+        return self._split_tags(entry.get("tags"))
+
+    def guest(self, vmid: Any, guest_type: Optional[str] = None) -> Optional[Entry]:
+        entry = self.load()._by_vmid.get(str(vmid))
+        if entry is None or (guest_type and entry["type"] != guest_type):
+            return None
+
+        return entry
+
+    def guests(
+        self,
+        node: Optional[str] = None,
+        pool: Optional[str] = None,
+        guest_type: Optional[str] = None,
+        tag: Optional[str] = None,
+    ) -> List[Entry]:
+        self.load()
+        selected = [
+            self._by_type.get(guest_type, []) if guest_type else None,
+            self._by_node.get(node, []) if node else None,
+            self._by_pool.get(pool, []) if pool else None,
+            self._by_tag.get(tag, []) if tag else None,
+        ]
+        candidates = [entries for entries in selected if entries is not None]
+        if not candidates:
+            return list(self._by_vmid.values())
+
+        matched = set(id(entry) for entry in min(candidates, key=len))
+        for entries in candidates:
+            matched &= set(id(entry) for entry in entries)
+
+        return [entry for entry in self._by_vmid.values() if id(entry) in matched]
+
+    def nodes(self) -> List[str]:
+        return [entry["node"] for entry in self.load()._by_type.get("node", [])]
+
+    def pools(self) -> List[str]:
+        self.load()
+        return sorted(set(self._pools) | set(self._by_pool))
+
+    def pool(self, poolid: str) -> Optional[Entry]:
+        """The `pool` entry of `poolid`, only listed by PVE 8.1 and newer."""
+        return self.load()._pools.get(poolid)
+
+    def tags(self) -> List[str]:
+        return sorted(self.load()._by_tag)
+
+    def has_pool(self, poolid: str) -> Optional[bool]:
+        """Whether the pool exists, None when the snapshot cannot tell.
+
+        Only PVE 8.1 and newer list pools in `cluster/resources`, older versions show them on guests only.
+        """
+        self.load()
+        if poolid in self._pools or poolid in self._by_pool:
+            return True
+
+        return False if self._by_type.get("pool") else None
+
+    def has_ha_resource(self, sid: str) -> Optional[bool]:
+        """Whether an HA resource `sid` (`vm:101`, `ct:101` or `101`) exists, None when the snapshot cannot tell."""
+        guest_type, _, vmid = sid.rpartition(":")
+        entry = self.guest(vmid, {"vm": "qemu", "ct": "lxc"}.get(guest_type))
+        if entry is None:
+            return None
+
+        return bool(entry.get("hastate"))
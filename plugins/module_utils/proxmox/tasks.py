@@ -0,0 +1,97 @@
+import random
+import time
+from typing import Any, Callable, Dict, Iterable
+from .client import Client
+
+
+class TaskError(Exception):
+    pass
+
+
+class TaskTimeout(TaskError):
+    pass
+
+
+def is_upid(value: Any) -> bool:
+    return isinstance(value, str) and value.startswith("UPID:")
+
+
+def task_node(upid: str) -> str:
+    """Node running the task, UPIDs look like `UPID:<node>:<pid>:<pstart>:<starttime>:<type>:<id>:<user>:`."""
+    parts = upid.split(":")
+    if len(parts) < 3 or parts[0] != "UPID":
+        raise ValueError(f"Invalid task UPID: {upid}")
+
+    return parts[1]
+
+
+class TaskWaiter:
+    """Polls `nodes/{node}/tasks/{upid}/status` until tasks stop.
+
+    The poll interval starts at `initial_interval` and grows by `backoff` up to `max_interval`, with random
+    jitter so parallel forks do not poll in lockstep. All pending tasks are polled in one loop.
+    """
+
+    def __init__(
+        self,
+        client: type[Client],
+        timeout: float = 300.0,
+        initial_interval: float = 0.5,
+        max_interval: float = 10.0,
+        backoff: float = 2.0,
+        jitter: float = 0.2,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+        rand: Callable[[], float] = random.random,
+    ) -> None:
+        self._client_class = client
+        self.timeout = timeout
+        self.initial_interval = initial_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.jitter = jitter
+        self._clock = clock
+        self._sleep = sleep
+        self._rand = rand
+
+    def status(self, upid: str) -> Dict[str, Any]:
+        status: Dict[str, Any] = self._client_class(f"nodes/{task_node(upid)}/tasks/{upid}/status").get()
+        return status
+
+    def wait(self, upid: str) -> Dict[str, Any]:
+        return self.wait_all([upid])[upid]
+
+    def wait_all(self, upids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        pending = list(dict.fromkeys(upids))
+        statuses: Dict[str, Dict[str, Any]] = {}
+        deadline = self._clock() + self.timeout
+        interval = self.initial_interval
+        while True:
+            for upid in list(pending):
+                status = self.status(upid)
+                if status.get("status") == "stopped":
+                    statuses[upid] = status
+                    pending.remove(upid)
+
+            if not pending:
+                break
+
+            remaining = deadline - self._clock()
+            if remaining <= 0:
+                raise TaskTimeout(f"Tasks {pending} did not finish within {self.timeout} seconds")
+
+            self._sleep(min(remaining, interval * (1 + self.jitter * (2 * self._rand() - 1))))
+            interval = min(interval * self.backoff, self.max_interval)
+
+        self._check(statuses)
+        return statuses
+
+    def _check(self, statuses: Dict[str, Dict[str, Any]]) -> None:
+        # Tasks finishing with warnings report `WARNINGS: <count>`, they still did their job.
+        failed = {
+            upid: status.get("exitstatus")
+            for upid, status in statuses.items()
+            if status.get("exitstatus") != "OK" and not str(status.get("exitstatus", "")).startswith("WARNINGS")
+        }
+        if failed:
+            raise TaskError(f"Tasks failed: {failed}")
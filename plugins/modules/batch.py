@@ -0,0 +1,152 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+ANSIBLE_METADATA = {
+    'metadata_version': '1.0',
+    'status': ['stableinterface'],
+    'supported_by': 'Margays'
+}
+
+DOCUMENTATION = '''
+---
+module: batch
+
+short_description: Runs many small changes of the collection in one module run
+
+description:
+    - Reconciles a list of C(pool), C(cluster_ha_group), C(cluster_ha_resource) and C(cluster_options)
+      invocations in one process on the managed host, instead of one module transfer and Python start per
+      loop item.
+    - Items run concurrently, except that an item waits for the earlier items touching the same resource,
+      for example an HA resource waits for the HA group it is added to.
+    - Every item gets its own result, a failing item does not stop the others.
+    - The C(margays.proxmox.batch) action plugin checks the items on the controller before anything is sent.
+
+options:
+    items:
+        required: true
+        type: list
+        elements: dict
+        description:
+            - Module invocations, each with the module name, short or fully qualified, as C(module)
+              and its options as C(args). Options are checked and default as in the module itself.
+    workers:
+        required: false
+        type: int
+        default: 8
+        description: Number of items reconciled at the same time.
+
+extends_documentation_fragment:
+    - margays.proxmox.client
+    - margays.proxmox.result
+
+author:
+    - Lukasz Wencel (@lwencel-priv)
+'''
+
+EXAMPLES = '''
+- name: Create pools and HA resources in one task
+  margays.proxmox.batch:
+    items:
+      - module: margays.proxmox.cluster_ha_group
+        args:
+          group: "web"
+          nodes:
+            - name: "pve1"
+              priority: 2
+      - module: pool
+        args:
+          poolid: "web"
+          comment: "Web servers"
+      - module: cluster_ha_resource
+        args:
+          sid: "vm:101"
+          group: "web"
+'''
+
+RETURN = '''
+results:
+    description: Result of every item, in order, with the module name as C(module).
+    returned: always
+    type: list
+changed_count:
+    description: Number of items that changed.
+    returned: always
+    type: int
+failed_count:
+    description: Number of items that failed.
+    returned: always
+    type: int
+metrics:
+    description: Calls made by the module, in total, per phase and per method, plus the slowest ones.
+    returned: when I(metrics) is enabled
+    type: dict
+'''
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.common.arg_spec import ArgumentSpecValidator
+from ansible_collections.margays.proxmox.plugins.module_utils.proxmox.client.factory import (
+    CLIENT_ARGUMENT_SPEC,
+    client_from_params,
+    metrics_from_params,
+)
+from ansible_collections.margays.proxmox.plugins.module_utils.proxmox.handlers.base import RESULT_ARGUMENT_SPEC
+from ansible_collections.margays.proxmox.plugins.module_utils.proxmox.batch import (
+    BATCH_MODULES,
+    batch_module_name,
+    run_batch,
+)
+
+
+def main():
+    module = AnsibleModule(
+        argument_spec=dict(
+            items=dict(type='list', elements='dict', required=True),
+            workers=dict(type='int', default=8),
+            **RESULT_ARGUMENT_SPEC,
+            **CLIENT_ARGUMENT_SPEC,
+        ),
+        supports_check_mode=True,
+        required_together=[('api_token_id', 'api_token_secret')],
+    )
+
+    collector = metrics_from_params(module.params)
+    try:
+        items = validate_items(module.params['items'])
+        client = client_from_params(module.params, collector)
+        result = run_batch(
+            client,
+            items,
+            module.check_mode,
+            workers=module.params['workers'],
+            collector=collector,
+            return_mode=module.params['return_mode'],
+        )
+    except Exception as e:
+        module.fail_json(msg=str(e))
+
+    if collector:
+        result['metrics'] = collector.summary()
+
+    if result['failed_count']:
+        module.fail_json(msg=f"{result['failed_count']} of {len(module.params['items'])} items failed", **result)
+
+    module.exit_json(**result)
+
+
+def validate_items(items):
+    """Check and convert the args of every item like AnsibleModule does for the module of the item."""
+    validated = []
+    for index, item in enumerate(items):
+        name = batch_module_name(item.get('module') or '')
+        result = ArgumentSpecValidator(BATCH_MODULES[name].argument_spec).validate(item.get('args') or {})
+        if result.error_messages:
+            raise ValueError(f"Item {index} ({name}): {'; '.join(result.error_messages)}")
+
+        validated.append({'module': name, 'args': result.validated_parameters})
+
+    return validated
+
+
+if __name__ == '__main__':
+    main()
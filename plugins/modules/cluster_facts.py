@@ -0,0 +1,107 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+ANSIBLE_METADATA = {
+    'metadata_version': '1.0',
+    'status': ['stableinterface'],
+    'supported_by': 'Margays'
+}
+
+DOCUMENTATION = '''
+---
+module: cluster_facts
+
+short_description: Gathers the state of a Proxmox cluster as facts
+
+description:
+    - Reads pools, HA groups and resources, cluster options, ACME accounts and plugins and the VM index
+      in one module run, every section on its own thread, and returns them as the C(proxmox_cluster) fact.
+    - Resources have the same form as the C(data) returned by the modules managing them,
+      so later tasks and templates can use them without more calls.
+    - ACME plugins are returned without their C(data), which holds the credentials of the DNS API.
+
+options:
+    sections:
+        required: false
+        type: list
+        elements: str
+        default: [ "pools", "ha_groups", "ha_resources", "options", "acme_accounts", "acme_plugins", "vms" ]
+        choices: [ "pools", "ha_groups", "ha_resources", "options", "acme_accounts", "acme_plugins", "vms" ]
+        description:
+            - Parts of the cluster state to gather. Leave out the ones the cluster does not support,
+              like C(ha_groups) on Proxmox VE 9.
+
+extends_documentation_fragment:
+    - margays.proxmox.client
+
+author:
+    - Lukasz Wencel (@lwencel-priv)
+'''
+
+EXAMPLES = '''
+- name: Gather cluster facts
+  margays.proxmox.cluster_facts:
+
+- name: Create the pools that are missing
+  margays.proxmox.pool:
+    poolid: "{{ item }}"
+  loop: "{{ ['web', 'db'] | difference(proxmox_cluster.pools | map(attribute='poolid')) }}"
+
+- name: Gather the VM index only
+  margays.proxmox.cluster_facts:
+    sections: [ "vms" ]
+'''
+
+RETURN = '''
+ansible_facts:
+    description: Facts set by the module.
+    returned: always
+    type: complex
+    contains:
+        proxmox_cluster:
+            description:
+                - The gathered sections. C(pools), C(ha_groups), C(ha_resources), C(acme_accounts) and C(acme_plugins)
+                  are lists, C(options) is a dict and C(vms) maps vmids to their node, type, name, status, pool,
+                  tags and HA state.
+            returned: always
+            type: dict
+metrics:
+    description: Calls made by the module, in total, per phase and per method, plus the slowest ones.
+    returned: when I(metrics) is enabled
+    type: dict
+'''
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.margays.proxmox.plugins.module_utils.proxmox.client.factory import (
+    CLIENT_ARGUMENT_SPEC,
+    client_from_params,
+    metrics_from_params,
+)
+from ansible_collections.margays.proxmox.plugins.module_utils.proxmox.facts import SECTIONS, collect_cluster_facts
+
+
+def main():
+    module = AnsibleModule(
+        argument_spec=dict(
+            sections=dict(type='list', elements='str', default=list(SECTIONS), choices=list(SECTIONS)),
+            **CLIENT_ARGUMENT_SPEC,
+        ),
+        supports_check_mode=True,
+        required_together=[('api_token_id', 'api_token_secret')],
+    )
+
+    collector = metrics_from_params(module.params)
+    try:
+        facts = collect_cluster_facts(client_from_params(module.params, collector), module.params['sections'])
+    except Exception as e:
+        module.fail_json(msg=str(e))
+
+    result = dict(changed=False, ansible_facts=dict(proxmox_cluster=facts))
+    if collector:
+        result['metrics'] = collector.summary()
+
+    module.exit_json(**result)
+
+
+if __name__ == '__main__':
+    main()
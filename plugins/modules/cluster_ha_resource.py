@@ -42,6 +42,10 @@ options:
         type: str
         choices: ['present', 'absent']
 
+extends_documentation_fragment:
+    - margays.proxmox.client
+    - margays.proxmox.result
+
 author:
     - Lukasz Wencel (@lwencel-priv)
 '''
@@ -61,56 +65,49 @@ EXAMPLES = '''
 '''
 
 RETURN = '''
+metrics:
+    description: Calls made by the module, in total, per phase and per method, plus the slowest ones.
+    returned: when I(metrics) is enabled
+    type: dict
 '''
 
 from ansible.module_utils.basic import AnsibleModule
-from ansible_collections.margays.proxmox.plugins.module_utils.proxmox.client.pvesh import Pvesh
-from ansible_collections.margays.proxmox.plugins.module_utils.utils import AnsibleResult
-from ansible_collections.margays.proxmox.plugins.module_utils.proxmox.handlers.cluster_ha_resource_handler import ClusterHAResourceHandler
+from ansible_collections.margays.proxmox.plugins.module_utils.proxmox.client.factory import (
+    CLIENT_ARGUMENT_SPEC,
+    client_from_params,
+    metrics_from_params,
+)
+from ansible_collections.margays.proxmox.plugins.module_utils.proxmox.handlers.base import RESULT_ARGUMENT_SPEC
+from ansible_collections.margays.proxmox.plugins.module_utils.proxmox.handlers.cluster_ha_resource_handler import (
+    HA_RESOURCE_ARGUMENT_SPEC,
+    ClusterHAResourceHandler,
+)
 
 
 def main():
     argument_spec = dict(
-        sid=dict(type='str', required=True),
-        comment=dict(type='str'),
-        group=dict(type='str'),
-        max_relocate=dict(type='str'),
-        max_restart=dict(type='str'),
-        resource_state=dict(type='str'),
-
-        state=dict(default='present', choices=['present', 'absent'], type='str'),
+        **HA_RESOURCE_ARGUMENT_SPEC,
+        **RESULT_ARGUMENT_SPEC,
+        **CLIENT_ARGUMENT_SPEC,
     )
     module = AnsibleModule(
         argument_spec = argument_spec,
-        supports_check_mode=True
+        supports_check_mode=True,
+        required_together=[('api_token_id', 'api_token_secret')],
     )
 
 
-    handler = ClusterHAResourceHandler(Pvesh, module.params)
+    collector = metrics_from_params(module.params)
+    client = client_from_params(module.params, collector)
+    handler = ClusterHAResourceHandler(client, module.params).collect_metrics(collector)
     try:
-        lookup = handler.lookup()
-        result = AnsibleResult()
-        state = module.params['state']
-        if state == 'absent':
-            if lookup:
-                result = handler.remove(module.check_mode)
-
-        elif state == 'present':
-            if not lookup:
-                result = handler.create(module.check_mode)
-            else:
-                result = handler.modify(module.check_mode)
-
+        result = handler.reconcile(module.params['state'], module.check_mode, module.params['return_mode'])
     except Exception as e:
         module.fail_json(msg=str(e))
 
-    changed = result.status
-    lookup = handler.lookup()
-    result = {
-        "data": lookup.to_dict() if lookup else None,
-        "updated_fields": result.changes,
-        "changed": changed,
-    }
+    if collector:
+        result['metrics'] = collector.summary()
+
     module.exit_json(**result)
 
 
@@ -12,6 +12,10 @@ DOCUMENTATION = '''
 module: cluster_options
 
 
+extends_documentation_fragment:
+    - margays.proxmox.client
+    - margays.proxmox.result
+
 author:
     - Lukasz Wencel (@lwencel-priv)
 '''
@@ -24,54 +28,48 @@ EXAMPLES = '''
 '''
 
 RETURN = '''
+metrics:
+    description: Calls made by the module, in total, per phase and per method, plus the slowest ones.
+    returned: when I(metrics) is enabled
+    type: dict
 '''
 
 from ansible.module_utils.basic import AnsibleModule
-from ansible_collections.margays.proxmox.plugins.module_utils.proxmox.client.pvesh import Pvesh
-from ansible_collections.margays.proxmox.plugins.module_utils.proxmox.handlers.cluster_options_handler import ClusterOptionsHandler
+from ansible_collections.margays.proxmox.plugins.module_utils.proxmox.client.factory import (
+    CLIENT_ARGUMENT_SPEC,
+    client_from_params,
+    metrics_from_params,
+)
+from ansible_collections.margays.proxmox.plugins.module_utils.proxmox.handlers.base import RESULT_ARGUMENT_SPEC
+from ansible_collections.margays.proxmox.plugins.module_utils.proxmox.handlers.cluster_options_handler import (
+    OPTIONS_ARGUMENT_SPEC,
+    ClusterOptionsHandler,
+)
 
 
 def main():
     argument_spec = dict(
-        bwlimit=dict(type='str'),
-        console=dict(type='str'),
-        crs=dict(type='str'),
-        description=dict(type='str'),
-        email_from=dict(type='str'),
-        fencing=dict(type='str'),
-        ha=dict(type='str'),
-        http_proxy=dict(type='str'),
-        keyboard=dict(type='str'),
-        language=dict(type='str'),
-        mac_prefix=dict(type='str'),
-        max_workers=dict(type='str'),
-        migration=dict(type='str'),
-        migration_unsecure=dict(type='str'),
-        next_id=dict(type='str'),
-        notify=dict(type='str'),
-        registred_tags=dict(type='str'),
-        tag_style=dict(type='str'),
-        u2f=dict(type='str'),
-        user_tag_access=dict(type='str'),
-        webauthn=dict(type='str'),
+        **OPTIONS_ARGUMENT_SPEC,
+        **RESULT_ARGUMENT_SPEC,
+        **CLIENT_ARGUMENT_SPEC,
     )
     module = AnsibleModule(
         argument_spec = argument_spec,
-        supports_check_mode=True
+        supports_check_mode=True,
+        required_together=[('api_token_id', 'api_token_secret')],
     )
 
+    collector = metrics_from_params(module.params)
     try:
-        handler = ClusterOptionsHandler(Pvesh, module.params)
-        result = handler.modify(module.check_mode)
+        handler = ClusterOptionsHandler(client_from_params(module.params, collector), module.params)
+        handler.collect_metrics(collector)
+        result = handler.reconcile('present', module.check_mode, module.params['return_mode'])
     except Exception as e:
         module.fail_json(msg=str(e))
 
-    changed = result.status
-    result = {
-        "data": handler.lookup().to_dict(),
-        "updated_fields": result.changes,
-        "changed": changed,
-    }
+    if collector:
+        result['metrics'] = collector.summary()
+
     module.exit_json(**result)
 
 
@@ -19,6 +19,44 @@ options:
         default: "present"
         choices: [ "present", "absent" ]
         description: Specifies whether the resource should exist or not.
+    vms:
+        required: false
+        type: list
+        elements: dict
+        description:
+            - Reconcile many VMs in one module run instead of a single I(vmid).
+            - Each item takes the same options as the module, module level options are defaults for every item.
+            - Items are checked and converted against the module options, like module level options are.
+            - An item with C(vmid_range) (C("200-209") or C([200, 209])) stands for one VM per vmid,
+              C({vmid}) and C({index}) in its C(name) are replaced for each of them.
+    fleet_workers:
+        required: false
+        type: int
+        default: 8
+        description: Number of VMs from I(vms) reconciled at the same time.
+    resize_concurrency:
+        required: false
+        type: int
+        default: 2
+        description:
+            - Number of disks resized at the same time on one storage, once the config update is applied.
+            - Disks on different storages are resized independently, failures are reported per disk.
+    wait_for_task:
+        required: false
+        type: bool
+        default: false
+        description:
+            - Wait for the tasks started by create, delete and disk resize to finish before returning,
+              so follow-up tasks do not race the VM lock.
+    task_timeout:
+        required: false
+        type: int
+        default: 300
+        description: Seconds to wait for the tasks when I(wait_for_task) is set.
+
+extends_documentation_fragment:
+    - margays.proxmox.client
+    - margays.proxmox.result
 
 author:
     - Lukasz Wencel (@lwencel-priv)
@@ -74,22 +112,62 @@ EXAMPLES = '''
         size: 1
         cache: writeback
     state: present
+
+- name: Create web VMs 200-209 in one module run
+  margays.proxmox.node_qemu:
+    node: "testprox"
+    cores: 2
+    memory: 2048
+    pool: "web"
+    vms:
+      - vmid_range: "200-209"
+        name: "web-{index}"
+      - vmid: 220
+        name: "db"
+        memory: 8192
+    state: present
 '''
 
 RETURN = '''
+results:
+    description: Per-VM results when I(vms) is used.
+    type: list
+changed_count:
+    description: Number of VMs from I(vms) that changed.
+    type: int
+failed_count:
+    description: Number of VMs from I(vms) that failed.
+    type: int
+metrics:
+    description: Calls made by the module, in total, per phase and per method, plus the slowest ones.
+    returned: when I(metrics) is enabled
+    type: dict
 '''
 
 from ansible.module_utils.basic import AnsibleModule
-from ansible_collections.margays.proxmox.plugins.module_utils.proxmox.client.pvesh import Pvesh
-from ansible_collections.margays.proxmox.plugins.module_utils.utils import AnsibleResult
+from ansible.module_utils.common.arg_spec import ArgumentSpecValidator
+from ansible_collections.margays.proxmox.plugins.module_utils.proxmox.client.factory import (
+    CLIENT_ARGUMENT_SPEC,
+    client_from_params,
+    metrics_from_params,
+)
+from ansible_collections.margays.proxmox.plugins.module_utils.proxmox.handlers.base import RESULT_ARGUMENT_SPEC
+from ansible_collections.margays.proxmox.plugins.module_utils.proxmox.fleet import expand_vms, reconcile_many
 from ansible_collections.margays.proxmox.plugins.module_utils.proxmox.handlers.node_qemu_handler import NodeQemuHandler
+from ansible_collections.margays.proxmox.plugins.module_utils.proxmox.snapshot import ClusterSnapshot
+
+# options of the fleet run itself, not of the VMs
+FLEET_OPTIONS = ('vms', 'fleet_workers', 'return_mode')
 
 
 def main():
     module = AnsibleModule(
         argument_spec = dict(
-            node=dict(type='str', required=True),
-            vmid=dict(type='int', required=True),
+            node=dict(type='str'),
+            vmid=dict(type='int'),
+            vms=dict(type='list', elements='dict'),
+            fleet_workers=dict(type='int', default=8),
+            resize_concurrency=dict(type='int', default=2),
 
             # Create options
             acpi=dict(type='bool'),
@@ -182,36 +260,77 @@ def main():
             skiplock=dict(type='bool'),
 
             state=dict(default='present', choices=['present', 'absent'], type='str'),
+            wait_for_task=dict(type='bool', default=False),
+            task_timeout=dict(type='int', default=300),
+            **RESULT_ARGUMENT_SPEC,
+            **CLIENT_ARGUMENT_SPEC,
         ),
-        supports_check_mode=True
+        supports_check_mode=True,
+        required_together=[('api_token_id', 'api_token_secret')],
+        required_one_of=[('vmid', 'vms')],
+        mutually_exclusive=[('vmid', 'vms')],
+        required_by={'vmid': 'node'},
     )
 
-    handler = NodeQemuHandler(Pvesh, module.params)
+    collector = metrics_from_params(module.params)
+    client = client_from_params(module.params, collector)
+    if module.params['vms']:
+        run_fleet(module, client, collector)
+
+    handler = NodeQemuHandler(client, module.params).collect_metrics(collector)
     try:
-        lookup = handler.lookup()
-        result = AnsibleResult()
-        state = module.params['state']
-        if state == 'absent':
-            if lookup:
-                result = handler.remove(module.check_mode)
-
-        elif state == 'present':
-            if not lookup:
-                result = handler.create(module.check_mode)
-            else:
-                result = handler.modify(module.check_mode)
+        result = handler.reconcile(module.params['state'], module.check_mode, module.params['return_mode'])
     except Exception as e:
         module.fail_json(msg=str(e))
 
-    changed = result.status
-    lookup = handler.lookup()
-    result = {
-        "data": lookup.to_dict() if lookup else None,
-        "updated_fields": result.changes,
-        "changed": changed,
-    }
+    if collector:
+        result['metrics'] = collector.summary()
+
     module.exit_json(**result)
 
 
+def run_fleet(module, client, collector):
+    defaults = {key: value for key, value in module.params.items() if key not in FLEET_OPTIONS}
+    try:
+        vms = validate_vms(module, expand_vms(module.params['vms'], defaults))
+    except ValueError as e:
+        module.fail_json(msg=str(e))
+
+    result = reconcile_many(
+        NodeQemuHandler,
+        client,
+        vms,
+        module.check_mode,
+        workers=module.params['fleet_workers'],
+        snapshot=ClusterSnapshot(client),
+        keys=('node', 'vmid'),
+        collector=collector,
+        return_mode=module.params['return_mode'],
+    )
+    if collector:
+        result['metrics'] = collector.summary()
+
+    if result['failed_count']:
+        module.fail_json(msg=f"{result['failed_count']} of {len(vms)} VMs failed", **result)
+
+    module.exit_json(**result)
+
+
+def validate_vms(module, vms):
+    """Check and convert every VM like AnsibleModule does with the module level options."""
+    validator = ArgumentSpecValidator(
+        {key: value for key, value in module.argument_spec.items() if key not in FLEET_OPTIONS}
+    )
+    validated = []
+    for vm in vms:
+        result = validator.validate(vm)
+        if result.error_messages:
+            raise ValueError(f"VM {vm.get('vmid')}: {'; '.join(result.error_messages)}")
+
+        validated.append(result.validated_parameters)
+
+    return validated
+
+
 if __name__ == '__main__':
     main()
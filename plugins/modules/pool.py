@@ -29,6 +29,10 @@ options:
         description:
             - Specifies whether the pool should exist or not.
 
+extends_documentation_fragment:
+    - margays.proxmox.client
+    - margays.proxmox.result
+
 author:
     - Lukasz Wencel (@lwencel-priv)
 '''
@@ -54,54 +58,52 @@ EXAMPLES = '''
 RETURN = '''
 data:
     description: Information about the pool.
+    returned: when I(return_mode) is C(full) or C(verified)
     type: json
 updated_fields:
     description: Fields that were modified in existing pool
+    returned: unless I(return_mode) is C(minimal)
     type: list
+metrics:
+    description: Calls made by the module, in total, per phase and per method, plus the slowest ones.
+    returned: when I(metrics) is enabled
+    type: dict
 '''
 
 from ansible.module_utils.basic import AnsibleModule
-from ansible_collections.margays.proxmox.plugins.module_utils.proxmox.client import Pvesh
-from ansible_collections.margays.proxmox.plugins.module_utils.utils import AnsibleResult
-from ansible_collections.margays.proxmox.plugins.module_utils.proxmox.handlers.pool_handler import PoolHandler
+from ansible_collections.margays.proxmox.plugins.module_utils.proxmox.client.factory import (
+    CLIENT_ARGUMENT_SPEC,
+    client_from_params,
+    metrics_from_params,
+)
+from ansible_collections.margays.proxmox.plugins.module_utils.proxmox.handlers.base import RESULT_ARGUMENT_SPEC
+from ansible_collections.margays.proxmox.plugins.module_utils.proxmox.handlers.pool_handler import (
+    POOL_ARGUMENT_SPEC,
+    PoolHandler,
+)
 
 
 def main():
     module = AnsibleModule(
-        argument_spec = dict(
-            poolid=dict(type='str', required=True),
-            comment=dict(default="", type='str'),
-
-            state=dict(default='present', choices=['present', 'absent'], type='str'),
+        argument_spec=dict(
+            **POOL_ARGUMENT_SPEC,
+            **RESULT_ARGUMENT_SPEC,
+            **CLIENT_ARGUMENT_SPEC,
         ),
-        supports_check_mode=True
+        supports_check_mode=True,
+        required_together=[('api_token_id', 'api_token_secret')],
     )
 
-    handler = PoolHandler(Pvesh, module.params)
+    collector = metrics_from_params(module.params)
+    handler = PoolHandler(client_from_params(module.params, collector), module.params).collect_metrics(collector)
     try:
-        lookup = handler.lookup()
-        result = AnsibleResult()
-        state = module.params['state']
-        if state == 'absent':
-            if lookup:
-                result = handler.remove(module.check_mode)
-
-        elif state == 'present':
-            if not lookup:
-                result = handler.create(module.check_mode)
-            else:
-                result = handler.modify(module.check_mode)
-
+        result = handler.reconcile(module.params['state'], module.check_mode, module.params['return_mode'])
     except Exception as e:
         module.fail_json(msg=str(e))
 
-    changed = result.status
-    lookup = handler.lookup()
-    result = {
-        "data": lookup.to_dict() if lookup else None,
-        "updated_fields": result.changes,
-        "changed": changed,
-    }
+    if collector:
+        result['metrics'] = collector.summary()
+
     module.exit_json(**result)
 
 
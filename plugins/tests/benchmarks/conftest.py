@@ -0,0 +1,17 @@
+import json
+from pathlib import Path
+from typing import Any, Dict
+import pytest
+
+# quantities that do not depend on the machine: API calls per handler operation and peak bytes per VM of loading
+# a whole synthetic cluster, recorded with CPython 3.11. Timings are compared against runs saved on the same machine.
+# tracemalloc peaks move a little between Python builds, hence `peak_bytes_tolerance`, calls have to match exactly.
+BASELINE = Path(__file__).parent / "baseline.json"
+
+
+@pytest.fixture(scope="session")
+def baseline() -> Dict[str, Any]:
+    with open(BASELINE) as f:
+        data: Dict[str, Any] = json.load(f)
+
+    return data
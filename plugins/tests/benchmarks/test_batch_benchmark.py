@@ -0,0 +1,83 @@
+import itertools
+import os
+import threading
+import pytest
+from module_utils.proxmox.batch import run_batch
+from module_utils.proxmox.client.pvesh import CommandResult, Pvesh
+from module_utils.proxmox.client.pvesh_session import PveshSession
+from ..fakes.simulated_cluster import SimulatedCluster
+
+# BATCH_ITEMS=1000 pytest --benchmark-only plugins/tests/benchmarks/test_batch_benchmark.py for a full size run
+ITEMS = int(os.environ.get("BATCH_ITEMS", "60"))
+# seconds per call, about what pvesh spends on a small API call
+LATENCY = 0.02
+
+
+def _in_process_client(root: str) -> type[Pvesh]:
+    """Calls served by the simulated cluster in this process, the time is the call latency, not process starts.
+
+    `peak` is the most calls that were in flight at once.
+    """
+
+    class SimulatedPvesh(Pvesh):
+        _stream = PveshSession._stream
+        _lock = threading.Lock()
+        running = 0
+        peak = 0
+
+        def _run(self, command: list[str]) -> CommandResult:
+            with SimulatedPvesh._lock:
+                SimulatedPvesh.running += 1
+                SimulatedPvesh.peak = max(SimulatedPvesh.peak, SimulatedPvesh.running)
+            try:
+                result = SimulatedCluster(root).call(command[1:])
+            finally:
+                with SimulatedPvesh._lock:
+                    SimulatedPvesh.running -= 1
+
+            stdout, stderr = result["stdout"].encode(), result["stderr"].encode()
+            return CommandResult(return_code=result["return_code"], stderr=stderr, stdout=stdout)
+
+    return SimulatedPvesh
+
+
+def _items() -> list:
+    items = []
+    for index in range(ITEMS // 3):
+        items.append({"module": "pool", "args": {"poolid": f"pool{index}", "comment": f"Pool {index}"}})
+        items.append({"module": "cluster_ha_group", "args": {"group": f"group{index}", "nodes": [{"name": "pve1"}]}})
+        items.append({"module": "cluster_ha_resource", "args": {"sid": f"vm:{100 + index}", "group": f"group{index}"}})
+
+    return items
+
+
+def _run(root: str, items: list, workers: int) -> tuple[dict, type[Pvesh]]:
+    SimulatedCluster.init(root, nodes=2, vms=ITEMS // 3, latency=LATENCY)
+    client = _in_process_client(root)
+    return run_batch(client, items, check=False, workers=workers), client
+
+
+@pytest.mark.parametrize("workers", [1, 8])
+def test_batch_runs_items_alongside(tmp_path, workers: int) -> None:
+    items = _items()
+    result, client = _run(str(tmp_path), items, workers)
+
+    assert (result["changed_count"], result["failed_count"]) == (len(items), 0)
+    # HA resources wait for their group and writes queue on the cluster lock, the rest runs alongside
+    if workers == 1:
+        assert client.peak == 1
+    else:
+        assert 1 < client.peak <= workers
+
+
+@pytest.mark.parametrize("workers", [1, 8])
+def test_batch_benchmark(benchmark, tmp_path, workers: int) -> None:
+    benchmark.group = f"batch of {ITEMS} items"
+    rounds = itertools.count()
+
+    def setup() -> tuple:
+        # a fresh cluster every round, the items would find everything in place otherwise
+        return (str(tmp_path / str(next(rounds))), _items(), workers), {}
+
+    result, _ = benchmark.pedantic(_run, setup=setup, rounds=3)
+    assert result["failed_count"] == 0
@@ -0,0 +1,47 @@
+import subprocess
+import pytest
+from module_utils.proxmox.client import Cassette, create_recording_client, create_replay_client
+from module_utils.proxmox.client.client import Client
+from module_utils.proxmox.handlers.node_qemu_handler import NodeQemuHandler
+from ..module_utils.proxmox.utils import create_fake_pvesh
+
+VMS = 20
+
+
+def _lookups(client: type[Client]) -> list:
+    NodeQemuHandler.parse_cache.clear()
+    return [NodeQemuHandler(client, {"node": "testprox", "vmid": vmid}).lookup() for vmid in range(100, 100 + VMS)]
+
+
+def _recorded(tmp_path) -> Cassette:
+    cassette = Cassette()
+    _lookups(create_recording_client(create_fake_pvesh(), cassette))
+    cassette.save(str(tmp_path / "lookups.json.gz"))
+    return Cassette.load(str(tmp_path / "lookups.json.gz"))
+
+
+def test_cassette_replay_starts_no_process(tmp_path, monkeypatch) -> None:
+    cassette = _recorded(tmp_path)
+    expected = [lookup and lookup.serialize() for lookup in _lookups(create_fake_pvesh())]
+    started = []
+
+    class CountingPopen(subprocess.Popen):
+        def __init__(self, *args, **kwargs) -> None:
+            started.append(args[0])
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr(subprocess, "Popen", CountingPopen)
+    sleeps: list = []
+    replay = create_replay_client(cassette, latency=1.0)
+    replay._sleep = staticmethod(sleeps.append)
+
+    assert [lookup and lookup.serialize() for lookup in _lookups(replay)] == expected
+    assert started == []
+    assert sum(sleeps) == pytest.approx(sum(interaction["seconds"] for interaction in cassette.interactions))
+
+
+@pytest.mark.parametrize("replayed", [False, True], ids=["pvesh", "replay"])
+def test_cassette_benchmark(benchmark, tmp_path, replayed: bool) -> None:
+    benchmark.group = f"{VMS} lookups"
+    client = create_replay_client(_recorded(tmp_path)) if replayed else create_fake_pvesh()
+    assert len(benchmark(_lookups, client)) == VMS
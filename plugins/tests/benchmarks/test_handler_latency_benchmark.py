@@ -0,0 +1,90 @@
+import os
+from typing import Any, Callable, Dict, Tuple
+import pytest
+from module_utils.proxmox.handlers.base import BaseHandler
+from module_utils.proxmox.handlers.cluster_ha_group_handler import ClusterHAGroupHandler
+from module_utils.proxmox.handlers.cluster_ha_resource_handler import ClusterHAResourceHandler
+from module_utils.proxmox.handlers.node_qemu_handler import NodeQemuHandler
+from module_utils.proxmox.handlers.pool_handler import PoolHandler
+from ..fakes.latency_client import create_latency_client
+from ..fakes.synthetic_cluster import SyntheticCluster, generate_cluster
+
+SIZES = os.environ.get("BENCHMARK_SIZES", "small").split(",")
+ROUNDS = int(os.environ.get("BENCHMARK_ROUNDS", "5"))
+# seconds per API call, about a pvesh call on an idle node
+LATENCY = float(os.environ.get("BENCHMARK_LATENCY", "0.002"))
+
+Params = Dict[str, Any]
+
+
+def _qemu(cluster: SyntheticCluster, existing: bool) -> Params:
+    vm = cluster.vms[0]
+    if not existing:
+        return {
+            "node": vm["node"],
+            "vmid": 99999,
+            "name": "bench",
+            "cores": 2,
+            "scsi": [{"idx": 0, "storage": "local-lvm", "size": 32}],
+            "net": [{"idx": 0, "model": "virtio", "bridge": "vmbr0"}],
+        }
+
+    storage = vm["config"]["scsi0"].split(":")[0]
+    # every generated disk is smaller, so the disk is resized on top of the config change
+    return {"node": vm["node"], "vmid": vm["vmid"], "cores": 32, "scsi": [{"idx": 0, "storage": storage, "size": "2T"}]}
+
+
+def _pool(cluster: SyntheticCluster, existing: bool) -> Params:
+    return {"poolid": cluster.pools[0]["poolid"] if existing else "bench", "comment": "Benchmark"}
+
+
+def _ha_group(cluster: SyntheticCluster, existing: bool) -> Params:
+    group = cluster.ha_groups[0]["group"] if existing else "bench"
+    return {"group": group, "nodes": [{"name": cluster.nodes[0], "priority": 1}], "comment": "Benchmark"}
+
+
+def _ha_resource(cluster: SyntheticCluster, existing: bool) -> Params:
+    sid = cluster.ha_resources[0]["sid"] if existing else "vm:99999"
+    return {"sid": sid, "group": cluster.ha_groups[0]["group"], "max_restart": 3}
+
+
+HANDLERS: Dict[str, Tuple[type[BaseHandler], Callable[[SyntheticCluster, bool], Params]]] = {
+    "qemu": (NodeQemuHandler, _qemu),
+    "pool": (PoolHandler, _pool),
+    "ha_group": (ClusterHAGroupHandler, _ha_group),
+    "ha_resource": (ClusterHAResourceHandler, _ha_resource),
+}
+
+# the operation, and whether it runs against an existing resource
+OPERATIONS: Dict[str, Tuple[Callable[[BaseHandler], Any], bool]] = {
+    "lookup": (lambda handler: handler.lookup(), True),
+    "modify": (lambda handler: handler.reconcile("present", False), True),
+    "create": (lambda handler: handler.reconcile("present", False), False),
+}
+
+
+@pytest.fixture(scope="module", params=SIZES)
+def cluster(request) -> Tuple[str, SyntheticCluster, Dict[str, Any]]:
+    synthetic = generate_cluster(request.param)
+    return request.param, synthetic, synthetic.responses()
+
+
+@pytest.mark.parametrize("operation", OPERATIONS)
+@pytest.mark.parametrize("kind", HANDLERS)
+def test_handler_latency(benchmark, baseline, cluster, kind: str, operation: str) -> None:
+    size, synthetic, responses = cluster
+    handler_class, params = HANDLERS[kind]
+    run, existing = OPERATIONS[operation]
+    client = create_latency_client(responses, LATENCY)
+    handler = handler_class(client, params(synthetic, existing))
+
+    benchmark.group = f"{operation} {size}"
+    # parsed configs are cached by digest, every round looks the VM up as a fresh module run would
+    result = benchmark.pedantic(run, args=(handler,), setup=NodeQemuHandler.parse_cache.clear, rounds=ROUNDS)
+    calls = len(client.calls) // ROUNDS
+    benchmark.extra_info.update({"latency": LATENCY, "calls_per_round": calls})
+    assert calls == baseline["calls_per_round"][f"{kind} {operation}"]
+    if operation == "lookup":
+        assert result is not None
+    else:
+        assert result["changed"]
@@ -0,0 +1,68 @@
+from typing import Callable, Dict, List, Optional
+import pytest
+from module_utils.proxmox.property_string import parse_property_string, property_dict
+
+VALUES = 20000
+
+
+def _values() -> List[str]:
+    values = []
+    for index in range(VALUES):
+        vmid = 100 + index // 2
+        disk = f"local-lvm:vm-{vmid}-disk-{index % 2}"
+        values.append(f"{disk},cache=writeback,discard=on,iothread=1,size={32 + index % 4}G")
+
+    return values
+
+
+def _multi_pass(value: str) -> Dict[str, Optional[str]]:
+    """Lookups as the handler did them before the tokenizer, one `split`/`filter` pass per key."""
+    parts = {}
+    for key in ("file=", "size=", "import-from="):
+        part = next(filter(lambda x: key in x, value.split(",")), None)
+        parts[key] = part.split("=")[1] if part else None
+
+    return parts
+
+
+def _parse_all(parse: Callable[[str], object], values: List[str]) -> None:
+    for value in values:
+        parse(value)
+
+
+def test_property_string_cache() -> None:
+    values = _values()
+    # a fleet reconciled again sees the configs it already parsed, the cache holds the most recent 4096 values
+    warm_values = values[-4096:]
+    parse_property_string.cache_clear()
+
+    _parse_all(property_dict, values)
+    _parse_all(property_dict, warm_values)
+
+    info = parse_property_string.cache_info()
+    assert (info.misses, info.hits) == (VALUES, len(warm_values))
+    assert property_dict(values[0]) == {
+        None: "local-lvm:vm-100-disk-0",
+        "cache": "writeback",
+        "discard": "on",
+        "iothread": "1",
+        "size": "32G",
+    }
+
+
+@pytest.mark.parametrize(
+    "parse,cached",
+    [
+        pytest.param(_multi_pass, False, id="split-filter"),
+        pytest.param(property_dict, False, id="tokenizer"),
+        pytest.param(property_dict, True, id="tokenizer-cached"),
+    ],
+)
+def test_property_string_benchmark(benchmark, parse: Callable[[str], object], cached: bool) -> None:
+    benchmark.group = "property strings"
+    values = _values()[: 4096 if cached else VALUES]
+    if cached:
+        _parse_all(parse, values)
+
+    setup = None if cached else parse_property_string.cache_clear
+    benchmark.pedantic(_parse_all, args=(parse, values), setup=setup, rounds=3)
@@ -0,0 +1,51 @@
+import subprocess
+from typing import Iterator
+import pytest
+from module_utils.proxmox.client.client import Client
+from ..module_utils.proxmox.utils import create_fake_pvesh, create_fake_session
+
+CALLS = 20
+
+
+def _calls(client: type[Client]) -> None:
+    for idx in range(CALLS):
+        client(f"nodes/testprox/qemu/{idx}/config").get()
+
+
+@pytest.fixture(params=["popen", "session"])
+def client(request) -> Iterator[type[Client]]:
+    if request.param == "popen":
+        yield create_fake_pvesh()
+        return
+
+    session = create_fake_session()
+    try:
+        session("version").get()
+        yield session
+    finally:
+        session.close()
+
+
+def test_pvesh_session_starts_one_process(monkeypatch) -> None:
+    started = []
+
+    class CountingPopen(subprocess.Popen):
+        def __init__(self, *args, **kwargs) -> None:
+            started.append(args[0])
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr(subprocess, "Popen", CountingPopen)
+    session = create_fake_session()
+    try:
+        _calls(session)
+    finally:
+        session.close()
+
+    assert len(started) == 1
+    _calls(create_fake_pvesh())
+    assert len(started) == 1 + CALLS
+
+
+def test_pvesh_session_benchmark(benchmark, client: type[Client]) -> None:
+    benchmark.group = f"{CALLS} pvesh calls"
+    benchmark(_calls, client)
@@ -0,0 +1,187 @@
+import tracemalloc
+from typing import Any, Dict, List
+import pytest
+from module_utils.proxmox.resources.node.qemu import Qemu
+from module_utils.proxmox.resources.node.qemu import view
+from module_utils.proxmox.resources.node.qemu.view import QemuView
+from module_utils.proxmox.resources.resource import Resource, ResourceField
+
+INVENTORY_VMS = 2000
+
+
+def _qemu(disk_size: int) -> Qemu:
+    raw: Dict[str, Any] = {"name": "bench", "cores": 8, "memory": "16384", "tags": "bench", "ostype": "l26"}
+    for idx in range(20):
+        disk = f"scsi{idx}" if idx < 16 else f"virtio{idx - 16}"
+        raw[disk] = f"local-lvm:vm-100-disk-{idx},cache=writeback,discard=on,iothread=1,size={disk_size}G"
+
+    for idx in range(8):
+        raw[f"net{idx}"] = f"virtio=BC:24:11:00:00:{idx:02X},bridge=vmbr0,firewall=1,tag={100 + idx}"
+
+    return Qemu("pve1", raw)
+
+
+def _metadata(resource: Any, name: str) -> Dict[str, Any]:
+    """Class level `name` merged over the class hierarchy, skip lists become dicts with `None` values."""
+    merged: Dict[str, Any] = {}
+    for cls in reversed(type(resource).__mro__):
+        value = cls.__dict__.get(name, ())
+        merged.update(value if isinstance(value, dict) else dict.fromkeys(value))
+
+    return merged
+
+
+def _walk_serialize(resource: Any) -> Dict[str, str]:
+    """Serialization walking the attributes on every call, as `Resource.serialize` did before schemas."""
+    mappings, skip = _metadata(resource, "_mappings"), _metadata(resource, "_serialize_skip")
+    fields = [(key, getattr(resource, key)) for key in resource._schema.keys]
+    if not hasattr(resource, "key"):
+        data: Dict[str, str] = {}
+        for key, value in fields:
+            if key in skip or value is None:
+                continue
+
+            for item in value if isinstance(value, list) else [value]:
+                if hasattr(item, "serialize"):
+                    data.update(_walk_serialize(item))
+                elif item is not None:
+                    data[mappings.get(key, key)] = str(item)
+
+        return data
+
+    params = [f"{mappings.get(key, key)}={value}" for key, value in fields if key not in skip and value]
+    return {resource.key(): ",".join(params)}
+
+
+def _walk_diff(resource: Qemu, other: Qemu) -> Dict[str, str]:
+    diff: Dict[str, str] = {}
+    serialized_other = _walk_serialize(other)
+    for key, value in _walk_serialize(resource).items():
+        if key in _metadata(resource, "_diff_skip"):
+            continue
+
+        if serialized_other.get(key) is None or value.strip() != serialized_other[key].strip():
+            diff[key] = value
+
+    return diff
+
+
+def test_resource_schema_matches_attribute_walk() -> None:
+    desired, current = _qemu(64), _qemu(32)
+    assert desired.serialize() == _walk_serialize(desired)
+    assert desired.diff(current) == _walk_diff(desired, current)
+    assert len(desired.diff(current)) == 20
+
+
+@pytest.mark.parametrize(
+    "diff",
+    [
+        pytest.param(_walk_diff, id="walk"),
+        pytest.param(lambda desired, current: desired.diff(current), id="schema"),
+    ],
+)
+def test_resource_serializer_benchmark(benchmark, diff) -> None:
+    benchmark.group = "diff of a Qemu with 20 disks and 8 NICs"
+    assert len(benchmark(diff, _qemu(64), _qemu(32))) == 20
+
+
+def _with_dict(value: Any, classes: Dict[type, type]) -> Any:
+    """Copy of a resource laid out as before slots, fields and metadata lists in a per instance `__dict__`."""
+    if isinstance(value, list):
+        return [_with_dict(item, classes) for item in value]
+
+    if not isinstance(value, (Resource, ResourceField)):
+        return value
+
+    cls = classes.setdefault(type(value), type(type(value).__name__, (), {}))
+    legacy = cls()
+    legacy._mappings = _metadata(value, "_mappings")
+    legacy._serialize_skip = ["_mappings", "_serialize_skip", "_diff_skip", *_metadata(value, "_serialize_skip")]
+    legacy._diff_skip = list(_metadata(value, "_diff_skip"))
+    for key in value._schema.keys:
+        setattr(legacy, key, _with_dict(getattr(value, key), classes))
+
+    return legacy
+
+
+def _inventory() -> List[Dict[str, str]]:
+    raws = []
+    for vmid in range(100, 100 + INVENTORY_VMS):
+        raws.append(
+            {
+                "vmid": str(vmid),
+                "name": f"vm{vmid}",
+                "cores": "2",
+                "memory": "4096",
+                "ostype": "l26",
+                "scsi0": f"local-lvm:vm-{vmid}-disk-0,discard=on,size=32G",
+                "scsi1": f"local-lvm:vm-{vmid}-disk-1,discard=on,size=64G",
+                "net0": f"virtio=BC:24:11:{vmid // 256 % 256:02X}:{vmid % 256:02X}:00,bridge=vmbr0",
+            }
+        )
+
+    return raws
+
+
+def _retained(build) -> int:
+    """Bytes still allocated after `build` returned, the inventory it built is kept alive until measured."""
+    tracemalloc.start()
+    try:
+        start = tracemalloc.get_traced_memory()[0]
+        inventory = build()
+        retained = tracemalloc.get_traced_memory()[0] - start
+    finally:
+        tracemalloc.stop()
+
+    assert len(inventory) == INVENTORY_VMS
+    return retained
+
+
+def test_resource_memory_benchmark() -> None:
+    raws = _inventory()
+    classes: Dict[type, type] = {}
+    _with_dict(Qemu("pve1", raws[0]), classes)
+
+    slots = _retained(lambda: [Qemu("pve1", raw) for raw in raws])
+    with_dict = _retained(lambda: [_with_dict(Qemu("pve1", raw), classes) for raw in raws])
+    # traced bytes, the same on every run of the same Python build
+    assert slots * 2 < with_dict
+
+
+def _scan(cls: type, raws: List[Dict[str, str]]) -> List[tuple]:
+    """Read the fields an inventory listing needs from every config."""
+    rows = []
+    for raw in raws:
+        vm = cls("pve1", raw)
+        rows.append((vm.vmid, vm.name, vm.pool, vm.tags))
+
+    return rows
+
+
+def test_qemu_view_scan_parses_no_config(monkeypatch) -> None:
+    parsed = []
+
+    class CountingQemu(Qemu):
+        __slots__ = ()
+
+        def __init__(self, node: str, raw: Dict[str, Any]) -> None:
+            parsed.append(raw["vmid"])
+            super().__init__(node, raw)
+
+    monkeypatch.setattr(view, "Qemu", CountingQemu)
+    raws = _inventory()
+    rows = _scan(QemuView, raws)
+
+    assert rows[0] == ("100", "vm100", None, None)
+    assert parsed == []
+    vm = QemuView("pve1", raws[0])
+    # disks and NICs parse the config, once
+    assert (len(vm.scsi), len(vm.net)) == (2, 1)
+    assert parsed == ["100"]
+
+
+@pytest.mark.parametrize("cls", [Qemu, QemuView], ids=["Qemu", "QemuView"])
+def test_qemu_view_scan_benchmark(benchmark, cls: type) -> None:
+    benchmark.group = f"scan of {INVENTORY_VMS} VM configs"
+    raws = _inventory()
+    assert benchmark(_scan, cls, raws)[0] == ("100", "vm100", None, None)
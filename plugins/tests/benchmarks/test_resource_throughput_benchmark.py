@@ -0,0 +1,98 @@
+import os
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+import pytest
+from module_utils.proxmox.resources.cluster.acme import ClusterAcmeAccount, ClusterAcmePlugin
+from module_utils.proxmox.resources.cluster.ha import ClusterHAGroup, ClusterHAResource
+from module_utils.proxmox.resources.cluster.options import ClusterOptions
+from module_utils.proxmox.resources.node.qemu import Qemu
+from module_utils.proxmox.resources.pool import Pool
+from module_utils.proxmox.snapshot import ClusterSnapshot
+from ..fakes.synthetic_cluster import SyntheticCluster, generate_cluster
+
+# BENCHMARK_SIZES=small,medium,large,huge pytest plugins/tests/benchmarks --benchmark-only for the full range
+SIZES = os.environ.get("BENCHMARK_SIZES", "small").split(",")
+ROUNDS = int(os.environ.get("BENCHMARK_ROUNDS", "5"))
+
+
+def _qemu(vm: Dict[str, Any]) -> Qemu:
+    return Qemu(vm["node"], vm["config"])
+
+
+# raw API data of each resource class in a cluster, and how the class is built from it
+RESOURCES: Dict[str, Tuple[Callable[[SyntheticCluster], List[Any]], Callable[[Any], Any]]] = {
+    "qemu": (lambda cluster: cluster.vms, _qemu),
+    "pool": (lambda cluster: cluster.pools, Pool),
+    "ha_group": (lambda cluster: cluster.ha_groups, ClusterHAGroup),
+    "ha_resource": (lambda cluster: cluster.ha_resources, ClusterHAResource),
+    "options": (lambda cluster: [cluster.options], ClusterOptions),
+    "acme_account": (lambda cluster: cluster.acme_accounts, ClusterAcmeAccount),
+    "acme_plugin": (lambda cluster: cluster.acme_plugins, ClusterAcmePlugin),
+}
+
+
+@pytest.fixture(scope="module", params=SIZES)
+def cluster(request) -> Tuple[str, SyntheticCluster]:
+    return request.param, generate_cluster(request.param)
+
+
+def _prepare(benchmark, operation: str, cluster: Tuple[str, SyntheticCluster], kind: str) -> Tuple[list, Callable]:
+    size, synthetic = cluster
+    raw, parse = RESOURCES[kind]
+    items = raw(synthetic)
+    benchmark.group = f"{operation} {size}"
+    benchmark.extra_info["items"] = len(items)
+    return items, parse
+
+
+@pytest.mark.parametrize("kind", RESOURCES)
+def test_parse_throughput(benchmark, cluster, kind: str) -> None:
+    items, parse = _prepare(benchmark, "parse", cluster, kind)
+
+    parsed = benchmark.pedantic(lambda: [parse(item) for item in items], rounds=ROUNDS, warmup_rounds=1)
+    assert len(parsed) == len(items)
+
+
+@pytest.mark.parametrize("kind", RESOURCES)
+def test_serialize_throughput(benchmark, cluster, kind: str) -> None:
+    items, parse = _prepare(benchmark, "serialize", cluster, kind)
+    resources = [parse(item) for item in items]
+
+    serialized = benchmark.pedantic(lambda: [resource.serialize() for resource in resources], rounds=ROUNDS)
+    assert all(serialized) or kind == "acme_account"
+
+
+@pytest.mark.parametrize("kind", RESOURCES)
+def test_diff_throughput(benchmark, cluster, kind: str) -> None:
+    items, parse = _prepare(benchmark, "diff", cluster, kind)
+    resources = [parse(item) for item in items]
+    # every resource against its neighbour, the first one against itself
+    pairs = list(zip(resources, resources[-1:] + resources[:-1]))
+
+    diffs = benchmark.pedantic(lambda: [resource.diff(other) for resource, other in pairs], rounds=ROUNDS)
+    assert len(diffs) == len(pairs)
+
+
+def _load_cluster(synthetic: SyntheticCluster) -> int:
+    """What a run over the whole cluster holds at once: the snapshot, every VM parsed and serialized."""
+    snapshot = ClusterSnapshot.from_entries(synthetic.resources())
+    vms = [_qemu(vm) for vm in synthetic.vms]
+    serialized = [vm.serialize() for vm in vms]
+    return len(snapshot.guests()) + len(serialized)
+
+
+def test_cluster_peak_memory(benchmark, baseline, cluster) -> None:
+    size, synthetic = cluster
+    tracemalloc.start()
+    try:
+        _load_cluster(synthetic)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    benchmark.group = f"memory {size}"
+    benchmark.extra_info.update(
+        {"vms": len(synthetic.vms), "peak_bytes": peak, "peak_bytes_per_vm": peak // len(synthetic.vms)}
+    )
+    assert benchmark.pedantic(_load_cluster, args=(synthetic,), rounds=ROUNDS) == 2 * len(synthetic.vms)
+    assert peak // len(synthetic.vms) <= baseline["peak_bytes_per_vm"][size] * (1 + baseline["peak_bytes_tolerance"])
@@ -0,0 +1,40 @@
+import os
+from module_utils.proxmox.client import MetricsCollector, with_collector
+from module_utils.proxmox.fleet import expand_vms, reconcile_many
+from module_utils.proxmox.handlers.node_qemu_handler import NodeQemuHandler
+from module_utils.proxmox.snapshot import ClusterSnapshot
+from ..fakes.simulated_cluster import STATE_ENV, SimulatedCluster
+from ..module_utils.proxmox.utils import create_fake_session
+
+# LOAD_TEST_VMS=10000 pytest plugins/tests/benchmarks/test_simulator_benchmark.py for a full size run
+VMS = int(os.environ.get("LOAD_TEST_VMS", "200"))
+WORKERS = int(os.environ.get("LOAD_TEST_WORKERS", "8"))
+
+
+def _run(client, vms: list) -> dict:
+    return reconcile_many(
+        NodeQemuHandler, client, vms, check=False, workers=WORKERS, snapshot=ClusterSnapshot(client).load()
+    )
+
+
+def test_simulated_fleet_load(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv(STATE_ENV, str(tmp_path))
+    SimulatedCluster.init(str(tmp_path), nodes=4, vms=VMS // 2)
+    collector = MetricsCollector()
+    client = with_collector(create_fake_session(), collector)
+    vms = expand_vms([{"vmid_range": [100, 99 + VMS], "name": "vm{vmid}"}], {"node": "pve1", "cores": 2})
+    for index, vm in enumerate(vms):
+        vm["node"] = f"pve{index % 4 + 1}"
+
+    try:
+        converge = _run(client, vms)
+        converge_writes = collector.count("set") + collector.count("create")
+        steady = _run(client, vms)
+    finally:
+        client.close()
+
+    assert (converge["changed_count"], converge["failed_count"]) == (VMS, 0)
+    assert (steady["changed_count"], steady["failed_count"]) == (0, 0)
+    # a converged fleet only reads
+    assert converge_writes >= VMS
+    assert collector.count("set") + collector.count("create") == converge_writes
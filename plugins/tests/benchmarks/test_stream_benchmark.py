@@ -0,0 +1,27 @@
+import tracemalloc
+from typing import Callable
+from ..module_utils.proxmox.utils import create_fake_pvesh
+
+RECORDS = 50000
+
+
+def _peak(consume: Callable[[], int]) -> tuple[int, int]:
+    tracemalloc.start()
+    try:
+        count = consume()
+        return count, tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def test_stream_benchmark() -> None:
+    client = create_fake_pvesh()
+    count, get_peak = _peak(lambda: len(client("cluster/resources").add_option("records", RECORDS).get()))
+    assert count == RECORDS
+
+    def stream() -> int:
+        return sum(1 for _ in client("cluster/resources").add_option("records", RECORDS).get_iter())
+
+    count, stream_peak = _peak(stream)
+    assert count == RECORDS
+    assert stream_peak * 4 < get_peak
@@ -0,0 +1,16 @@
+from typing import List
+
+
+class FakeClock:
+    """Clock for code taking `clock` and `sleep` callables, sleeping moves the clock on without waiting."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: List[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
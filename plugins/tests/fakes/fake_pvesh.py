@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""Fake pvesh executable for tests and benchmarks.
+
+Runs one call per process like pvesh (`fake_pvesh.py get <path> --key=value ...`), or serves calls read from
+stdin with `--worker`, speaking the `PveshSession` protocol. `get` calls with `--records=<count>` return a list.
+
+With `FAKE_PVESH_STATE` pointing at a state directory, calls are served by the `SimulatedCluster` stored there,
+create one with `fake_pvesh.py --init <directory> [--nodes=3] [--vms=0] [--latency=0.0] ...`.
+"""
+import argparse
+import json
+import os
+import sys
+from simulated_cluster import DEFAULT_SETTINGS, STATE_ENV, SimulatedCluster
+
+
+def echo(argv: list[str]) -> dict:
+    method, path, *args = argv
+    options = dict(arg[2:].split("=", 1) for arg in args if arg.startswith("--") and "=" in arg)
+    options.pop("output-format", None)
+    if "missing" in path:
+        return {"return_code": 2, "stdout": "", "stderr": f"Configuration file '{path}' does not exist\n"}
+
+    if method != "get":
+        return {"return_code": 0, "stdout": "", "stderr": ""}
+
+    if "records" in options:
+        records = [{"path": path, "index": index} for index in range(int(options["records"]))]
+        return {"return_code": 0, "stdout": json.dumps(records), "stderr": ""}
+
+    return {"return_code": 0, "stdout": json.dumps({"path": path, "options": options}), "stderr": ""}
+
+
+def serve(call) -> None:
+    for line in sys.stdin:
+        sys.stdout.write(json.dumps(call(json.loads(line)["argv"])) + "\n")
+        sys.stdout.flush()
+
+
+def init(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(prog="fake_pvesh.py --init")
+    parser.add_argument("directory")
+    parser.add_argument("--nodes", type=int, default=3)
+    parser.add_argument("--vms", type=int, default=0)
+    parser.add_argument("--pool", action="append", default=[])
+    for name, default in DEFAULT_SETTINGS.items():
+        parser.add_argument(f"--{name.replace('_', '-')}", type=int if name == "seed" else float, default=default)
+
+    args = vars(parser.parse_args(argv))
+    SimulatedCluster.init(args.pop("directory"), pools=tuple(args.pop("pool")), **args)
+    return 0
+
+
+def main() -> int:
+    if sys.argv[1:2] == ["--init"]:
+        return init(sys.argv[2:])
+
+    call = SimulatedCluster(os.environ[STATE_ENV]).call if os.environ.get(STATE_ENV) else echo
+    if sys.argv[1:] == ["--worker"]:
+        serve(call)
+        return 0
+
+    result = call(sys.argv[1:])
+    sys.stdout.write(result["stdout"])
+    sys.stderr.write(result["stderr"])
+    return result["return_code"]
+
+
+if __name__ == "__main__":
+    sys.exit(main())
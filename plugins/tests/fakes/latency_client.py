@@ -0,0 +1,36 @@
+import json
+import threading
+import time
+from typing import Any, Dict, List
+from module_utils.proxmox.client.pvesh import CommandResult, Pvesh
+from module_utils.proxmox.client.pvesh_session import PveshSession
+
+
+def create_latency_client(responses: Dict[str, Any], latency: float = 0.001) -> type[Pvesh]:
+    """pvesh client answering after `latency` seconds per call, `get` calls from `responses` by path.
+
+    Missing paths fail like a missing resource, writes succeed without changing `responses`. Calls are recorded
+    in `calls`, without the pvesh binary and the output format.
+    """
+
+    class LatencyPvesh(Pvesh):
+        _stream = PveshSession._stream
+        calls: List[List[str]] = []
+        _lock = threading.Lock()
+
+        def _run(self, command: List[str]) -> CommandResult:
+            time.sleep(latency)
+            method, path = command[1], command[2]
+            with LatencyPvesh._lock:
+                LatencyPvesh.calls.append(command[1:-1])
+
+            if method != "get":
+                return CommandResult(return_code=0, stderr=b"", stdout=b"")
+
+            if path not in responses:
+                stderr = f"Configuration file '{path}' does not exist\n".encode()
+                return CommandResult(return_code=255, stderr=stderr, stdout=b"")
+
+            return CommandResult(return_code=0, stderr=b"", stdout=json.dumps(responses[path]).encode())
+
+    return LatencyPvesh
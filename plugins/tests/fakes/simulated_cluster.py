@@ -0,0 +1,438 @@
+"""Simulated Proxmox VE cluster behind `fake_pvesh.py`, kept as JSON files in a state directory.
+
+`settings.json` holds the latency and failure injection settings, `cluster.json` the nodes, pools, HA, ACME and
+cluster options, and every VM has its own `qemu/<vmid>.json` so writes to different VMs do not contend.
+Writes take file locks like pmxcfs does, calls failing to get one within `lock_timeout` fail as on a real cluster.
+"""
+
+import fcntl
+import hashlib
+import json
+import os
+import random
+import re
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+STATE_ENV = "FAKE_PVESH_STATE"
+
+DEFAULT_SETTINGS: Dict[str, Any] = {
+    # seconds added to every call, and to writes while they hold their lock
+    "latency": 0.0,
+    "write_latency": 0.0,
+    # probability of a write failing on a lock held elsewhere, and of any call failing transiently
+    "lock_probability": 0.0,
+    "failure_probability": 0.0,
+    "lock_timeout": 2.0,
+    "seed": None,
+}
+
+# create option of every keyed collection, with the error raised for missing entries
+COLLECTIONS: Dict[str, Tuple[str, str, str]] = {
+    "cluster/ha/groups": ("ha_groups", "group", "no such ha group '{}'"),
+    "cluster/ha/resources": ("ha_resources", "sid", "no such resource '{}'"),
+    "cluster/acme/account": ("acme_accounts", "name", "ACME account config file '{}' does not exist"),
+    "cluster/acme/plugins": ("acme_plugins", "id", "ACME plugin '{}' not defined"),
+}
+
+DISK_REGEX = re.compile(r"^(ide|sata|scsi|virtio)\d+$|^(efidisk|tpmstate)0$")
+NEW_VOLUME_REGEX = re.compile(r"^([\w.-]+):(\d+)$")
+
+Options = Dict[str, str]
+Route = Tuple[str, re.Pattern, Callable[..., Any]]
+
+
+class CallError(Exception):
+    pass
+
+
+def _parse_options(args: List[str]) -> Options:
+    options = dict(arg[2:].split("=", 1) for arg in args if arg.startswith("--") and "=" in arg)
+    options.pop("output-format", None)
+    return options
+
+
+def _digest(config: Dict[str, Any]) -> str:
+    return hashlib.sha1(json.dumps(config, sort_keys=True).encode()).hexdigest()
+
+
+class SimulatedCluster:
+    def __init__(self, root: str) -> None:
+        self.root = root
+        self.settings = {**DEFAULT_SETTINGS, **self._read("settings.json", {})}
+        self._random = random.Random(self.settings["seed"])
+        self._routes: List[Route] = [
+            ("get", re.compile(r"^cluster/resources$"), self.resources),
+            ("get", re.compile(r"^cluster/options$"), self.options_get),
+            ("set", re.compile(r"^cluster/options$"), self.options_set),
+            ("get", re.compile(r"^pools$"), self.pools_get),
+            ("create", re.compile(r"^pools$"), self.pools_create),
+            ("set", re.compile(r"^pools$"), self.pools_set),
+            ("delete", re.compile(r"^pools$"), self.pools_delete),
+            ("get", re.compile(r"^nodes/([^/]+)/qemu$"), self.qemu_list),
+            ("create", re.compile(r"^nodes/([^/]+)/qemu$"), self.qemu_create),
+            ("get", re.compile(r"^nodes/([^/]+)/qemu/(\d+)/config$"), self.qemu_config_get),
+            ("set", re.compile(r"^nodes/([^/]+)/qemu/(\d+)/config$"), self.qemu_config_set),
+            ("set", re.compile(r"^nodes/([^/]+)/qemu/(\d+)/resize$"), self.qemu_resize),
+            ("delete", re.compile(r"^nodes/([^/]+)/qemu/(\d+)$"), self.qemu_delete),
+            ("get", re.compile(r"^nodes/([^/]+)/tasks/([^/]+)/status$"), self.task_status),
+        ]
+        for collection in COLLECTIONS:
+            self._routes.extend(
+                [
+                    ("get", re.compile(rf"^{collection}$"), self._collection_call(collection, "list")),
+                    ("get", re.compile(rf"^{collection}/([^/]+)$"), self._collection_call(collection, "get")),
+                    ("create", re.compile(rf"^{collection}$"), self._collection_call(collection, "create")),
+                    ("set", re.compile(rf"^{collection}/([^/]+)$"), self._collection_call(collection, "set")),
+                    ("delete", re.compile(rf"^{collection}/([^/]+)$"), self._collection_call(collection, "delete")),
+                ]
+            )
+
+    @classmethod
+    def init(
+        cls,
+        root: str,
+        nodes: int = 3,
+        vms: int = 0,
+        first_vmid: int = 100,
+        pools: Tuple[str, ...] = (),
+        **settings: Any,
+    ) -> "SimulatedCluster":
+        """Create a cluster with `nodes` nodes and `vms` VMs spread over them."""
+        os.makedirs(os.path.join(root, "qemu"), exist_ok=True)
+        os.makedirs(os.path.join(root, "locks"), exist_ok=True)
+        node_names = [f"pve{index + 1}" for index in range(nodes)]
+        cluster = cls(root)
+        cluster._write("settings.json", {**DEFAULT_SETTINGS, **settings})
+        cluster._write(
+            "cluster.json",
+            {
+                "nodes": node_names,
+                "pools": {pool: {"comment": "", "members": []} for pool in pools},
+                "options": {},
+                **{name: {} for name, _, _ in COLLECTIONS.values()},
+            },
+        )
+        for index in range(vms):
+            vmid = first_vmid + index
+            config = {"name": f"vm{vmid}", "cores": 1, "memory": "1024", "scsi0": f"local-lvm:vm-{vmid}-disk-0,size=8G"}
+            cluster._write(f"qemu/{vmid}.json", {"node": node_names[index % nodes], "config": config})
+
+        return cls(root)
+
+    # state files
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.root, name)
+
+    def _read(self, name: str, default: Any = None) -> Any:
+        try:
+            with open(self._path(name)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return default
+
+    def _write(self, name: str, data: Any) -> None:
+        tmp_path = f"{self._path(name)}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+
+        os.replace(tmp_path, self._path(name))
+
+    @contextmanager
+    def _lock(self, name: str, error: str) -> Iterator[None]:
+        if self._random.random() < self.settings["lock_probability"]:
+            raise CallError(error)
+
+        with open(self._path(f"locks/{name}.lock"), "w") as lock:
+            deadline = time.monotonic() + self.settings["lock_timeout"]
+            while True:
+                try:
+                    fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    if time.monotonic() > deadline:
+                        raise CallError(error)
+
+                    time.sleep(0.005)
+
+            try:
+                time.sleep(self.settings["write_latency"])
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _cluster_lock(self) -> Any:
+        return self._lock("cluster", "cfs-lock 'file-cluster_cfg' error: got lock request timeout")
+
+    def _qemu_lock(self, vmid: str) -> Any:
+        return self._lock(f"qemu-{vmid}", f"can't lock file '/var/lock/qemu-server/lock-{vmid}.conf' - got timeout")
+
+    # dispatch
+
+    def call(self, argv: List[str]) -> Dict[str, Any]:
+        """Run one pvesh call, the result holds the exit code and the pvesh stdout and stderr."""
+        method, path, *args = argv
+        time.sleep(self.settings["latency"])
+        try:
+            if self._random.random() < self.settings["failure_probability"]:
+                raise CallError("ipcc_send_rec[1] failed: Connection refused")
+
+            data = self._dispatch(method, path.strip("/"), _parse_options(args))
+        except CallError as e:
+            return {"return_code": 255, "stdout": "", "stderr": f"{e}\n"}
+
+        return {"return_code": 0, "stdout": "" if data is None else json.dumps(data), "stderr": ""}
+
+    def _dispatch(self, method: str, path: str, options: Options) -> Any:
+        for route_method, regex, handler in self._routes:
+            match = regex.match(path)
+            if match and route_method == method:
+                return handler(options, *match.groups())
+
+        raise CallError(f"No '{method}' handler defined for '{path}'")
+
+    def _cluster(self) -> Dict[str, Any]:
+        return self._read("cluster.json")
+
+    def _upid(self, node: str, task: str, vmid: str) -> str:
+        now = int(time.time())
+        return f"UPID:{node}:{os.getpid():08X}:{now:08X}:{now:08X}:{task}:{vmid}:root@pam:"
+
+    # cluster
+
+    def resources(self, options: Options) -> List[Dict[str, Any]]:
+        cluster = self._cluster()
+        pools = {vmid: pool for pool, entry in cluster["pools"].items() for vmid in entry["members"]}
+        entries: List[Dict[str, Any]] = [
+            {"id": f"node/{node}", "type": "node", "node": node, "status": "online"} for node in cluster["nodes"]
+        ]
+        entries.extend({"id": f"/pool/{pool}", "type": "pool", "pool": pool} for pool in cluster["pools"])
+        for name in sorted(os.listdir(self._path("qemu")), key=lambda name: int(name.split(".")[0])):
+            vmid = int(name.split(".")[0])
+            vm = self._read(f"qemu/{name}")
+            entry = {"id": f"qemu/{vmid}", "type": "qemu", "vmid": vmid, "node": vm["node"], "status": "stopped"}
+            entry.update({key: vm["config"][key] for key in ("name", "tags") if key in vm["config"]})
+            if vmid in pools:
+                entry["pool"] = pools[vmid]
+
+            ha = cluster["ha_resources"].get(f"vm:{vmid}")
+            if ha:
+                entry["hastate"] = ha.get("state", "started")
+
+            entries.append(entry)
+
+        return entries
+
+    def options_get(self, options: Options) -> Dict[str, Any]:
+        return self._cluster()["options"]
+
+    def options_set(self, options: Options) -> None:
+        with self._cluster_lock():
+            cluster = self._cluster()
+            cluster["options"] = self._apply(cluster["options"], options)
+            self._write("cluster.json", cluster)
+
+    def _apply(self, entry: Dict[str, Any], options: Options) -> Dict[str, Any]:
+        for key in options.pop("delete", "").split(","):
+            entry.pop(key, None)
+
+        entry.update(options)
+        return entry
+
+    # pools
+
+    def _pool(self, cluster: Dict[str, Any], poolid: str) -> Dict[str, Any]:
+        if poolid not in cluster["pools"]:
+            raise CallError(f"pool '{poolid}' does not exist")
+
+        return cluster["pools"][poolid]
+
+    def pools_get(self, options: Options) -> List[Dict[str, Any]]:
+        cluster = self._cluster()
+        poolids = [options["poolid"]] if "poolid" in options else sorted(cluster["pools"])
+        return [
+            {"poolid": poolid, "comment": pool["comment"], "members": [{"vmid": vmid} for vmid in pool["members"]]}
+            for poolid, pool in ((poolid, self._pool(cluster, poolid)) for poolid in poolids)
+        ]
+
+    def pools_create(self, options: Options) -> None:
+        with self._cluster_lock():
+            cluster = self._cluster()
+            if options["poolid"] in cluster["pools"]:
+                raise CallError(f"pool '{options['poolid']}' already exists")
+
+            cluster["pools"][options["poolid"]] = {"comment": options.get("comment", ""), "members": []}
+            self._write("cluster.json", cluster)
+
+    def pools_set(self, options: Options) -> None:
+        with self._cluster_lock():
+            cluster = self._cluster()
+            self._pool(cluster, options["poolid"])["comment"] = options.get("comment", "")
+            self._write("cluster.json", cluster)
+
+    def pools_delete(self, options: Options) -> None:
+        with self._cluster_lock():
+            cluster = self._cluster()
+            if self._pool(cluster, options["poolid"])["members"]:
+                raise CallError(f"pool '{options['poolid']}' is not empty")
+
+            del cluster["pools"][options["poolid"]]
+            self._write("cluster.json", cluster)
+
+    # keyed collections: HA groups and resources, ACME accounts and plugins
+
+    def _collection_call(self, collection: str, method: str) -> Callable[..., Any]:
+        name, id_option, missing = COLLECTIONS[collection]
+
+        def call(options: Options, entry_id: Optional[str] = None) -> Any:
+            if method == "list":
+                return [{id_option: entry_id, **entry} for entry_id, entry in sorted(self._cluster()[name].items())]
+
+            if method == "get":
+                entries = self._cluster()[name]
+                if entry_id not in entries:
+                    raise CallError(missing.format(entry_id))
+
+                return {id_option: entry_id, **entries[entry_id]}
+
+            with self._cluster_lock():
+                cluster = self._cluster()
+                entries = cluster[name]
+                entry_id = entry_id or options.pop(id_option, None)
+                if method == "create" and entry_id in entries:
+                    raise CallError(f"{collection.rsplit('/', 1)[-1]} '{entry_id}' already exists")
+
+                if method != "create" and entry_id not in entries:
+                    raise CallError(missing.format(entry_id))
+
+                if method == "delete":
+                    del entries[entry_id]
+                else:
+                    entries[entry_id] = self._apply(entries.get(entry_id, {}), options)
+
+                self._write("cluster.json", cluster)
+
+        return call
+
+    # qemu
+
+    def _vm(self, node: str, vmid: str) -> Dict[str, Any]:
+        vm = self._read(f"qemu/{vmid}.json")
+        if vm is None or vm["node"] != node:
+            raise CallError(f"Configuration file 'nodes/{node}/qemu-server/{vmid}.conf' does not exist")
+
+        return vm
+
+    def _check_node(self, node: str) -> None:
+        if node not in self._cluster()["nodes"]:
+            raise CallError(f"hostname lookup '{node}' failed - failed to get address info for: {node}")
+
+    def _disk(self, vmid: str, key: str, value: str, config: Dict[str, Any]) -> str:
+        """Allocate volumes for `storage:<size>` disks, keep the volume of disks that already exist."""
+        parts = [part for part in value.split(",") if part]
+        volume = next((part for part in parts if "=" not in part), None)
+        volume = volume or next((part[5:] for part in parts if part.startswith("file=")), "")
+        options = [part for part in parts if "=" in part and not part.startswith(("file=", "size="))]
+        size = next((part[5:] for part in parts if part.startswith("size=")), None)
+        if match := NEW_VOLUME_REGEX.match(volume):
+            existing = config.get(key, "").split(",")[0]
+            volume = existing or f"{match.group(1)}:vm-{vmid}-disk-{len(self._disks(config))}"
+            size = size or match.group(2)
+
+        if size:
+            options.append(f"size={size}G" if size.isdigit() else f"size={size}")
+
+        return ",".join([volume, *options])
+
+    def _disks(self, config: Dict[str, Any]) -> List[str]:
+        return [key for key in config if DISK_REGEX.match(key)]
+
+    def _configure(self, vmid: str, config: Dict[str, Any], options: Options) -> Dict[str, Any]:
+        for key in options.pop("delete", "").split(","):
+            config.pop(key, None)
+
+        for key, value in options.items():
+            config[key] = self._disk(vmid, key, value, config) if DISK_REGEX.match(key) else value
+
+        return config
+
+    def qemu_list(self, options: Options, node: str) -> List[Dict[str, Any]]:
+        self._check_node(node)
+        return [
+            {"vmid": int(entry["vmid"]), "name": entry.get("name"), "status": "stopped"}
+            for entry in self.resources({})
+            if entry["type"] == "qemu" and entry["node"] == node
+        ]
+
+    def qemu_create(self, options: Options, node: str) -> str:
+        self._check_node(node)
+        vmid = options.pop("vmid")
+        pool = options.pop("pool", None)
+        with self._qemu_lock(vmid):
+            if self._read(f"qemu/{vmid}.json") is not None:
+                raise CallError(f"unable to create VM {vmid} - VM {vmid} already exists on node '{node}'")
+
+            if pool:
+                with self._cluster_lock():
+                    cluster = self._cluster()
+                    self._pool(cluster, pool)["members"].append(int(vmid))
+                    self._write("cluster.json", cluster)
+
+            config = self._configure(vmid, {}, {key: value for key, value in options.items() if value != ""})
+            self._write(f"qemu/{vmid}.json", {"node": node, "config": config})
+
+        return self._upid(node, "qmcreate", vmid)
+
+    def qemu_config_get(self, options: Options, node: str, vmid: str) -> Dict[str, Any]:
+        config = self._vm(node, vmid)["config"]
+        return {**config, "digest": _digest(config)}
+
+    def qemu_config_set(self, options: Options, node: str, vmid: str) -> None:
+        digest = options.pop("digest", None)
+        with self._qemu_lock(vmid):
+            vm = self._vm(node, vmid)
+            if digest and digest != _digest(vm["config"]):
+                raise CallError("detected modified configuration - file changed by other user? Try again.")
+
+            vm["config"] = self._configure(vmid, vm["config"], options)
+            self._write(f"qemu/{vmid}.json", vm)
+
+    def qemu_resize(self, options: Options, node: str, vmid: str) -> str:
+        with self._qemu_lock(vmid):
+            vm = self._vm(node, vmid)
+            disk = options["disk"]
+            if disk not in vm["config"]:
+                raise CallError(f"disk '{disk}' does not exist")
+
+            parts = vm["config"][disk].split(",")
+            current = next((int(part[5:-1]) for part in parts if part.startswith("size=")), 0)
+            size = options["size"]
+            new_size = current + int(size[1:-1]) if size.startswith("+") else int(size.rstrip("G"))
+            if new_size < current:
+                raise CallError(f"unable to shrink disk size from {current}G to {new_size}G")
+
+            parts = [part for part in parts if not part.startswith("size=")] + [f"size={new_size}G"]
+            vm["config"][disk] = ",".join(parts)
+            self._write(f"qemu/{vmid}.json", vm)
+
+        return self._upid(node, "resize", vmid)
+
+    def qemu_delete(self, options: Options, node: str, vmid: str) -> str:
+        with self._qemu_lock(vmid):
+            self._vm(node, vmid)
+            with self._cluster_lock():
+                cluster = self._cluster()
+                for pool in cluster["pools"].values():
+                    pool["members"] = [member for member in pool["members"] if member != int(vmid)]
+
+                cluster["ha_resources"].pop(f"vm:{vmid}", None)
+                self._write("cluster.json", cluster)
+
+            os.remove(self._path(f"qemu/{vmid}.json"))
+
+        return self._upid(node, "qmdestroy", vmid)
+
+    def task_status(self, options: Options, node: str, upid: str) -> Dict[str, Any]:
+        return {"upid": upid, "node": node, "status": "stopped", "exitstatus": "OK"}
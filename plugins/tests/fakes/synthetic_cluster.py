@@ -0,0 +1,170 @@
+"""Synthetic Proxmox VE clusters for benchmarks, from a few dozen VMs to a large datacenter.
+
+Clusters are generated from a seed, so every run and every baseline sees the same VMs. VM configs carry many disks
+and NICs in the formats the API returns, pools, HA groups and HA resources are spread over the VMs and nodes.
+"""
+
+import hashlib
+import random
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Union
+
+
+@dataclass(frozen=True)
+class ClusterSize:
+    nodes: int
+    vms: int
+    disks: int
+    nics: int
+    pools: int
+    ha_groups: int
+
+
+SIZES: Dict[str, ClusterSize] = {
+    "small": ClusterSize(nodes=3, vms=50, disks=4, nics=2, pools=5, ha_groups=2),
+    "medium": ClusterSize(nodes=8, vms=500, disks=8, nics=4, pools=20, ha_groups=6),
+    "large": ClusterSize(nodes=32, vms=5000, disks=16, nics=6, pools=80, ha_groups=16),
+    "huge": ClusterSize(nodes=64, vms=20000, disks=24, nics=8, pools=200, ha_groups=32),
+}
+
+_STORAGES = ("local-lvm", "ceph-ssd", "ceph-hdd", "nfs-backup")
+_DISK_SIZES = ("512M", "8G", "32G", "100G", "250G", "1T")
+
+
+@dataclass
+class SyntheticCluster:
+    nodes: List[str]
+    # `{"vmid", "node", "pool", "config"}`, configs as returned by `nodes/{node}/qemu/{vmid}/config`
+    vms: List[Dict[str, Any]] = field(default_factory=list)
+    pools: List[Dict[str, Any]] = field(default_factory=list)
+    ha_groups: List[Dict[str, Any]] = field(default_factory=list)
+    ha_resources: List[Dict[str, Any]] = field(default_factory=list)
+    options: Dict[str, Any] = field(default_factory=dict)
+    acme_accounts: List[Dict[str, Any]] = field(default_factory=list)
+    acme_plugins: List[Dict[str, Any]] = field(default_factory=list)
+
+    def resources(self) -> List[Dict[str, Any]]:
+        """The `cluster/resources` listing."""
+        hastate = {resource["sid"]: resource["state"] for resource in self.ha_resources}
+        entries: List[Dict[str, Any]] = [{"id": f"node/{node}", "type": "node", "node": node} for node in self.nodes]
+        entries.extend({"id": f"/pool/{pool['poolid']}", "type": "pool", "pool": pool["poolid"]} for pool in self.pools)
+        for vm in self.vms:
+            entry = {"id": f"qemu/{vm['vmid']}", "type": "qemu", "vmid": vm["vmid"], "node": vm["node"]}
+            entry.update({"name": vm["config"]["name"], "tags": vm["config"]["tags"], "status": "running"})
+            if vm["pool"]:
+                entry["pool"] = vm["pool"]
+
+            if f"vm:{vm['vmid']}" in hastate:
+                entry["hastate"] = hastate[f"vm:{vm['vmid']}"]
+
+            entries.append(entry)
+
+        return entries
+
+    def responses(self) -> Dict[str, Any]:
+        """`get` responses by path, as the handlers read them."""
+        responses: Dict[str, Any] = {
+            "cluster/resources": self.resources(),
+            "cluster/options": self.options,
+            "pools": self.pools,
+            "cluster/ha/groups": self.ha_groups,
+            "cluster/ha/resources": self.ha_resources,
+            "cluster/acme/account": [{"name": account["name"]} for account in self.acme_accounts],
+            "cluster/acme/plugins": self.acme_plugins,
+        }
+        responses.update((f"nodes/{vm['node']}/qemu/{vm['vmid']}/config", vm["config"]) for vm in self.vms)
+        responses.update((f"cluster/ha/groups/{group['group']}", group) for group in self.ha_groups)
+        responses.update((f"cluster/ha/resources/{resource['sid']}", resource) for resource in self.ha_resources)
+        responses.update((f"cluster/acme/account/{account['name']}", account) for account in self.acme_accounts)
+        responses.update((f"cluster/acme/plugins/{plugin['id']}", plugin) for plugin in self.acme_plugins)
+        return responses
+
+
+def _disks(rng: random.Random, vmid: int, count: int) -> Dict[str, str]:
+    disks = {}
+    for idx in range(count):
+        # SCSI first, then VirtIO, like the VMs created from the web interface
+        key = f"scsi{idx}" if idx < 16 else f"virtio{idx - 16}"
+        options = [f"{rng.choice(_STORAGES)}:vm-{vmid}-disk-{idx}"]
+        options.extend(rng.sample(["cache=writeback", "discard=on", "iothread=1", "ssd=1", "backup=0"], 3))
+        options.append(f"size={rng.choice(_DISK_SIZES)}")
+        disks[key] = ",".join(options)
+
+    disks["ide2"] = "none,media=cdrom"
+    return disks
+
+
+def _nics(rng: random.Random, vmid: int, count: int) -> Dict[str, str]:
+    nics = {}
+    for idx in range(count):
+        mac = f"BC:24:11:{vmid >> 8 & 0xFF:02X}:{vmid & 0xFF:02X}:{idx:02X}"
+        nics[f"net{idx}"] = f"virtio={mac},bridge=vmbr{idx % 2},firewall=1,tag={rng.randint(2, 4094)}"
+
+    return nics
+
+
+def _vm(rng: random.Random, vmid: int, node: str, pool: str, size: ClusterSize) -> Dict[str, Any]:
+    config: Dict[str, Any] = {
+        "name": f"vm{vmid}",
+        "cores": rng.choice([1, 2, 4, 8, 16]),
+        "sockets": 1,
+        "memory": str(rng.choice([1024, 2048, 4096, 8192, 16384])),
+        "ostype": "l26",
+        "tags": ";".join(rng.sample(["prod", "dev", "web", "db", "cache", "batch"], 2)),
+        "boot": "order=scsi0;net0",
+        "agent": "1",
+        "onboot": 1,
+        **_disks(rng, vmid, size.disks),
+        **_nics(rng, vmid, size.nics),
+    }
+    config["digest"] = hashlib.sha1(repr(sorted(config.items())).encode()).hexdigest()
+    return {"vmid": vmid, "node": node, "pool": pool, "config": config}
+
+
+def generate_cluster(size: Union[str, ClusterSize], seed: int = 0, first_vmid: int = 100) -> SyntheticCluster:
+    """Cluster of the given size, a name from `SIZES` or a `ClusterSize`, the same for the same seed."""
+    size = SIZES[size] if isinstance(size, str) else size
+    rng = random.Random(seed)
+    nodes = [f"pve{index + 1}" for index in range(size.nodes)]
+    cluster = SyntheticCluster(nodes=nodes)
+    cluster.pools = [{"poolid": f"pool{index}", "comment": f"Pool {index}"} for index in range(size.pools)]
+    for index in range(size.vms):
+        pool = cluster.pools[index % size.pools]["poolid"] if size.pools and index % 4 else ""
+        cluster.vms.append(_vm(rng, first_vmid + index, nodes[index % size.nodes], pool, size))
+
+    for index in range(size.ha_groups):
+        members = rng.sample(nodes, min(3, len(nodes)))
+        cluster.ha_groups.append(
+            {
+                "group": f"group{index}",
+                "nodes": ",".join(f"{node}:{priority}" for priority, node in enumerate(members, 1)),
+                "restricted": index % 2,
+                "nofailback": 0,
+                "comment": f"HA group {index}",
+            }
+        )
+
+    # every tenth VM is HA managed
+    for vm in cluster.vms[:: 10 if size.ha_groups else len(cluster.vms) + 1]:
+        cluster.ha_resources.append(
+            {
+                "sid": f"vm:{vm['vmid']}",
+                "group": f"group{vm['vmid'] % size.ha_groups}",
+                "state": "started",
+                "max_restart": 1,
+                "max_relocate": 1,
+            }
+        )
+
+    cluster.options = {
+        "keyboard": "en-us",
+        "max_workers": 4,
+        "migration": "type=secure,network=10.10.0.0/24",
+        "ha": "shutdown_policy=migrate",
+        "description": "Synthetic cluster",
+    }
+    cluster.acme_accounts = [
+        {"name": "default", "directory": "https://acme-v02.api.letsencrypt.org/directory", "tos_url": "tos.pdf"}
+    ]
+    cluster.acme_plugins = [{"id": "dns", "type": "dns", "api": "cf", "data": "Q0ZfVG9rZW49eHh4", "nodes": nodes[:2]}]
+    return cluster
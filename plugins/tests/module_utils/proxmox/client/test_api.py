@@ -0,0 +1,113 @@
+import pytest
+from module_utils.proxmox.client.api import PveApi
+from module_utils.proxmox.handlers.node_qemu_handler import NodeQemuHandler
+from module_utils.proxmox.handlers.pool_handler import PoolHandler
+from ..utils import ApiStandIn, ApiResponse
+
+
+def test_api_client_get_returns_data() -> None:
+    responses = [
+        ApiResponse(
+            method="GET",
+            path="/api2/json/pools",
+            options={"poolid": "testpool"},
+            data=[{"poolid": "testpool"}],
+        ),
+    ]
+    with ApiStandIn(responses) as api:
+        client = api.client(token_id="root@pam!ansible", token_secret="secret")
+        data = client("pools").add_option("poolid", "testpool").get()
+
+    assert data == [{"poolid": "testpool"}]
+    assert api.requests[0].authorization == "PVEAPIToken=root@pam!ansible=secret"
+    assert api.responses.empty()
+
+
+def test_api_client_sends_options_as_form_body() -> None:
+    responses = [
+        ApiResponse(method="POST", path="/api2/json/pools", options={"poolid": "testpool", "comment": "Test pool"}),
+        ApiResponse(method="PUT", path="/api2/json/pools", options={"poolid": "testpool", "comment": "Updated"}),
+        ApiResponse(method="DELETE", path="/api2/json/pools", options={"poolid": "testpool"}),
+    ]
+    with ApiStandIn(responses) as api:
+        client = api.client()
+        assert client("pools").add_option("poolid", "testpool").add_option("comment", "Test pool").create() == {}
+        assert client("pools").add_option("poolid", "testpool").add_option("comment", "Updated").set() == {}
+        assert client("pools").add_option("poolid", "testpool").delete() == {}
+
+    assert api.responses.empty()
+
+
+def test_api_client_reuses_connection() -> None:
+    responses = [ApiResponse(method="GET", path="/api2/json/version", data={"version": "8.2.4"}) for _ in range(5)]
+    with ApiStandIn(responses) as api:
+        client = api.client()
+        for _ in range(5):
+            assert client("version").get() == {"version": "8.2.4"}
+
+    assert api.connections == 1
+    assert client._pool.connections_created == 1
+
+
+def test_api_client_raises_error_message() -> None:
+    responses = [
+        ApiResponse(
+            method="GET",
+            path="/api2/json/nodes/testprox/qemu/101/config",
+            status=500,
+            reason="Configuration file 'nodes/testprox/qemu-server/101.conf' does not exist",
+        ),
+    ]
+    with ApiStandIn(responses) as api:
+        with pytest.raises(Exception, match="Configuration file '.*' does not exist"):
+            api.client()("nodes/testprox/qemu/101/config").get()
+
+
+def test_api_client_requires_endpoint() -> None:
+    with pytest.raises(RuntimeError):
+        PveApi("pools")
+
+
+def test_node_qemu_handler_lookup_over_api() -> None:
+    responses = [
+        ApiResponse(
+            method="GET",
+            path="/api2/json/nodes/testprox/qemu/101/config",
+            data={"name": "testvm", "cores": 4, "scsi0": "local-lvm:vm-101-disk-0,cache=writeback,size=32G"},
+        ),
+        ApiResponse(
+            method="GET",
+            path="/api2/json/nodes/testprox/qemu/102/config",
+            status=500,
+            reason="Configuration file 'nodes/testprox/qemu-server/102.conf' does not exist",
+        ),
+    ]
+    with ApiStandIn(responses) as api:
+        client = api.client()
+        result = NodeQemuHandler(client, {"node": "testprox", "vmid": "101"}).lookup()
+        missing = NodeQemuHandler(client, {"node": "testprox", "vmid": "102"}).lookup()
+
+    assert result.name == "testvm"
+    assert result.scsi[0].file == "local-lvm:vm-101-disk-0"
+    assert result.scsi[0].size == "32"
+    assert missing is None
+    assert api.connections == 1
+
+
+def test_pool_handler_modify_over_api() -> None:
+    responses = [
+        ApiResponse(
+            method="GET",
+            path="/api2/json/pools",
+            options={"poolid": "testpool"},
+            data=[{"poolid": "testpool", "comment": "Test pool"}],
+        ),
+        ApiResponse(method="PUT", path="/api2/json/pools", options={"poolid": "testpool", "comment": "Updated"}),
+    ]
+    with ApiStandIn(responses) as api:
+        handler = PoolHandler(api.client(), {"poolid": "testpool", "comment": "Updated"})
+        ansible_result = handler.modify(check=False)
+
+    assert ansible_result.status
+    assert ansible_result.changes == {"comment": "Updated"}
+    assert api.responses.empty()
@@ -0,0 +1,69 @@
+import asyncio
+import pytest
+from module_utils.proxmox.client import NotFoundError
+from module_utils.proxmox.client.async_pvesh import AsyncPvesh, create_async_pvesh
+from module_utils.proxmox.client.pvesh import CommandResult
+from ..utils import create_fake_pvesh
+
+
+def test_async_pvesh_matches_pvesh_output() -> None:
+    pvesh = create_fake_pvesh()
+    client = create_async_pvesh(pvesh=pvesh)
+
+    async def run() -> list:
+        return await asyncio.gather(
+            client("pools").add_option("poolid", "test").get(),
+            client("pools").add_option("poolid", "test").set(),
+        )
+
+    assert asyncio.run(run()) == [pvesh("pools").add_option("poolid", "test").get(), {}]
+
+
+def test_async_pvesh_raises_pvesh_error() -> None:
+    client = create_async_pvesh(pvesh=create_fake_pvesh())
+
+    with pytest.raises(Exception, match="Configuration file 'nodes/missing/qemu/101/config' does not exist"):
+        asyncio.run(client("nodes/missing/qemu/101/config").get())
+
+
+def test_async_pvesh_bounds_calls_in_flight() -> None:
+    class CountingPvesh(AsyncPvesh):
+        _max_in_flight = 3
+        running = 0
+        peak = 0
+
+        async def _exec(self, command: list[str]) -> CommandResult:
+            CountingPvesh.running += 1
+            CountingPvesh.peak = max(CountingPvesh.peak, CountingPvesh.running)
+            await asyncio.sleep(0.01)
+            CountingPvesh.running -= 1
+            return CommandResult(return_code=0, stderr=b"", stdout=b"{}")
+
+    async def run() -> None:
+        await asyncio.gather(*[CountingPvesh(f"nodes/testprox/qemu/{i}/config").get() for i in range(10)])
+
+    asyncio.run(run())
+    asyncio.run(run())
+    assert CountingPvesh.peak == 3
+
+
+def test_async_pvesh_get_iter_matches_get() -> None:
+    pvesh = create_fake_pvesh()
+    client = create_async_pvesh(pvesh=pvesh)
+
+    async def run() -> tuple:
+        records = [record async for record in client("cluster/resources").add_option("records", 1000).get_iter()]
+        stream = client("cluster/resources").add_option("records", 100000).get_iter()
+        first = await stream.__anext__()
+        await stream.aclose()
+        return records, first
+
+    records, first = asyncio.run(run())
+    assert records == pvesh("cluster/resources").add_option("records", 1000).get()
+    assert first == {"path": "cluster/resources", "index": 0}
+
+    async def missing() -> list:
+        return [record async for record in client("nodes/missing/qemu").get_iter()]
+
+    with pytest.raises(NotFoundError, match="Configuration file 'nodes/missing/qemu' does not exist"):
+        asyncio.run(missing())
@@ -0,0 +1,136 @@
+import pytest
+from module_utils.proxmox.client.cache import ResponseCache, create_caching_client
+from module_utils.proxmox.handlers.pool_handler import PoolHandler
+from ....fakes.fake_clock import FakeClock
+from ..utils import create_client, Response
+
+
+def _get(path: str, stdout: bytes) -> Response:
+    return Response(
+        command=["/usr/bin/pvesh", "get", path, "--output-format=json"], return_code=0, stdout=stdout, stderr=b""
+    )
+
+
+def _set(path: str, *options: str) -> Response:
+    command = ["/usr/bin/pvesh", "set", path, *options, "--output-format=json"]
+    return Response(command=command, return_code=0, stdout=b"", stderr=b"")
+
+
+def test_caching_client_serves_repeated_gets() -> None:
+    client = create_client([_get("nodes/testprox/qemu/101/config", b'{"name": "testvm"}')])
+    cached = create_caching_client(client)
+
+    for _ in range(3):
+        assert cached("nodes/testprox/qemu/101/config").get() == {"name": "testvm"}
+
+    assert client.responses.empty()
+    assert cached.cache.stats() == {"hits": 2, "misses": 1, "size": 1}
+
+
+def test_caching_client_returns_copies() -> None:
+    cached = create_caching_client(create_client([_get("cluster/options", b'{"keyboard": "en-us"}')]))
+    cached("cluster/options").get()["keyboard"] = "de"
+
+    assert cached("cluster/options").get() == {"keyboard": "en-us"}
+
+
+def test_caching_client_keys_by_options() -> None:
+    client = create_client(
+        [
+            Response(
+                ["/usr/bin/pvesh", "get", "pools", "--poolid=a", "--output-format=json"], 0, b'[{"poolid": "a"}]', b""
+            ),
+            Response(
+                ["/usr/bin/pvesh", "get", "pools", "--poolid=b", "--output-format=json"], 0, b'[{"poolid": "b"}]', b""
+            ),
+        ]
+    )
+    cached = create_caching_client(client)
+
+    assert cached("pools").add_option("poolid", "a").get() == [{"poolid": "a"}]
+    assert cached("pools").add_option("poolid", "b").get() == [{"poolid": "b"}]
+    assert cached("pools").add_option("poolid", "a").get() == [{"poolid": "a"}]
+    assert client.responses.empty()
+
+
+def test_caching_client_invalidates_on_write() -> None:
+    client = create_client(
+        [
+            _get("nodes/testprox/qemu/101/config", b'{"memory": "4096"}'),
+            _get("nodes/testprox/qemu/102/config", b'{"memory": "4096"}'),
+            _set("nodes/testprox/qemu/101/resize", "--disk=scsi0", "--size=2G"),
+            _get("nodes/testprox/qemu/101/config", b'{"memory": "8192"}'),
+        ]
+    )
+    cached = create_caching_client(client)
+    cached("nodes/testprox/qemu/101/config").get()
+    cached("nodes/testprox/qemu/102/config").get()
+    cached("nodes/testprox/qemu/101/resize").add_option("disk", "scsi0").add_option("size", "2G").set()
+
+    assert cached("nodes/testprox/qemu/101/config").get() == {"memory": "8192"}
+    assert cached("nodes/testprox/qemu/102/config").get() == {"memory": "4096"}
+    assert client.responses.empty()
+
+
+@pytest.mark.parametrize(
+    "path",
+    ["nodes/testprox/qemu/101/config", "nodes/testprox/lxc/200/config", "pools/test", "cluster/ha/resources/vm:101"],
+)
+def test_caching_client_invalidates_cluster_resources_on_guest_writes(path: str) -> None:
+    client = create_client(
+        [
+            _get("cluster/resources", b'[{"vmid": 101}]'),
+            _get("cluster/options", b'{"keyboard": "en-us"}'),
+            _set(path),
+            _get("cluster/resources", b'[{"vmid": 101}, {"vmid": 102}]'),
+        ]
+    )
+    cached = create_caching_client(client)
+    cached("cluster/resources").get()
+    cached("cluster/options").get()
+    cached(path).set()
+
+    assert cached("cluster/resources").get() == [{"vmid": 101}, {"vmid": 102}]
+    assert cached("cluster/options").get() == {"keyboard": "en-us"}
+    assert client.responses.empty()
+
+
+def test_response_cache_expires_entries(fake_clock: FakeClock) -> None:
+    cache = ResponseCache(ttl=10, clock=fake_clock)
+    cache.put(("version", ()), {"version": "8.2.4"})
+
+    fake_clock.now = 9
+    assert cache.get(("version", ())) == (True, {"version": "8.2.4"})
+    fake_clock.now = 10
+    assert cache.get(("version", ())) == (False, None)
+
+
+def test_response_cache_evicts_least_recently_used() -> None:
+    cache = ResponseCache(maxsize=2)
+    cache.put(("a", ()), 1)
+    cache.put(("b", ()), 2)
+    cache.get(("a", ()))
+    cache.put(("c", ()), 3)
+
+    assert cache.get(("b", ())) == (False, None)
+    assert cache.get(("a", ())) == (True, 1)
+    assert cache.get(("c", ())) == (True, 3)
+
+
+def test_pool_handler_module_run_with_cache() -> None:
+    client = create_client(
+        [
+            Response(
+                command=["/usr/bin/pvesh", "get", "pools", "--poolid=testpool", "--output-format=json"],
+                return_code=0,
+                stdout=b'[{"poolid": "testpool", "comment": "Test pool"}]',
+                stderr=b"",
+            ),
+        ]
+    )
+    handler = PoolHandler(create_caching_client(client), {"poolid": "testpool", "comment": "Test pool"})
+
+    assert handler.lookup() is not None
+    assert not handler.modify(check=False).status
+    assert handler.lookup().comment == "Test pool"
+    assert client.responses.empty()
@@ -0,0 +1,144 @@
+import pytest
+from module_utils.proxmox.client import (
+    Cassette,
+    CassetteMiss,
+    NotFoundError,
+    create_recording_client,
+    create_replay_client,
+)
+from module_utils.proxmox.handlers.node_qemu_handler import NodeQemuHandler
+from module_utils.proxmox.handlers.pool_handler import PoolHandler
+from ..utils import Response, create_client
+
+RESPONSES = [
+    Response(
+        command=["/usr/bin/pvesh", "get", "pools", "--poolid=testpool", "--output-format=json"],
+        return_code=0,
+        stdout=b'[{"poolid": "testpool", "comment": "Test pool"}]',
+        stderr=b"",
+    ),
+    Response(
+        command=["/usr/bin/pvesh", "set", "pools", "--poolid=testpool", "--comment=Updated", "--output-format=json"],
+        return_code=0,
+        stdout=b"",
+        stderr=b"",
+    ),
+    Response(
+        command=["/usr/bin/pvesh", "get", "pools", "--poolid=testpool", "--output-format=json"],
+        return_code=0,
+        stdout=b'[{"poolid": "testpool", "comment": "Updated"}]',
+        stderr=b"",
+    ),
+    Response(
+        command=["/usr/bin/pvesh", "get", "nodes/testprox/qemu/101/config", "--output-format=json"],
+        return_code=255,
+        stdout=b"",
+        stderr=b"Configuration file 'nodes/testprox/qemu-server/101.conf' does not exist\n",
+    ),
+]
+
+
+def _run(client) -> tuple:
+    pool = PoolHandler(client, {"poolid": "testpool", "comment": "Updated"})
+    changes = pool.modify(check=False).changes
+    after = pool.lookup().to_dict()
+    missing = NodeQemuHandler(client, {"node": "testprox", "vmid": 101}).lookup()
+    return changes, after, missing
+
+
+@pytest.mark.parametrize("name", ["cassette.json", "cassette.json.gz"])
+def test_cassette_record_and_replay(tmp_path, name: str) -> None:
+    cassette = Cassette()
+    recorded = _run(create_recording_client(create_client(RESPONSES), cassette))
+    assert len(cassette) == 4
+    assert cassette.interactions[3]["error"]["type"] == "NotFoundError"
+
+    cassette.save(str(tmp_path / name))
+    replayed = _run(create_replay_client(Cassette.load(str(tmp_path / name))))
+
+    assert replayed == recorded
+    assert recorded[0] == {"comment": "Updated"}
+    assert recorded[1]["comment"] == "Updated"
+    assert recorded[2] is None
+
+
+def test_replay_repeats_last_response_and_raises_errors() -> None:
+    cassette = Cassette()
+    client = create_recording_client(create_client(RESPONSES), cassette)
+    client("pools").add_option("poolid", "testpool").get()
+    client("pools").add_option("poolid", "testpool").add_option("comment", "Updated").set()
+    client("pools").add_option("poolid", "testpool").get()
+    with pytest.raises(NotFoundError):
+        client("nodes/testprox/qemu/101/config").get()
+
+    replay = create_replay_client(cassette)
+    for comment in ["Test pool", "Updated", "Updated"]:
+        assert replay("pools").add_option("poolid", "testpool").get() == [{"poolid": "testpool", "comment": comment}]
+
+    with pytest.raises(NotFoundError, match="does not exist"):
+        replay("nodes/testprox/qemu/101/config").get()
+
+    with pytest.raises(CassetteMiss):
+        replay("pools").add_option("poolid", "other").get()
+
+
+def test_replay_latency() -> None:
+    cassette = Cassette([{"method": "get", "path": "version", "options": {}, "response": {}, "seconds": 0.2}])
+    sleeps = []
+    replay = create_replay_client(cassette, latency=0.5)
+    replay._sleep = staticmethod(sleeps.append)
+    replay("version").get()
+    assert sleeps == [0.1]
+
+
+def test_recorded_cassette_holds_no_secrets(tmp_path) -> None:
+    secrets = ["s3cr3t-password", "ssh-ed25519 AAAAC3Nz", "hmac-key-value", "CF_Token=t0k3n"]
+    responses = [
+        Response(
+            command=[
+                "/usr/bin/pvesh",
+                "set",
+                "nodes/testprox/qemu/101/config",
+                f"--cipassword={secrets[0]}",
+                f"--sshkeys={secrets[1]}",
+                "--output-format=json",
+            ],
+            return_code=0,
+            stdout=b"",
+            stderr=b"",
+        ),
+        Response(
+            command=[
+                "/usr/bin/pvesh",
+                "create",
+                "cluster/acme/account",
+                f"--eab-hmac-key={secrets[2]}",
+                "--name=default",
+                "--output-format=json",
+            ],
+            return_code=0,
+            stdout=b"",
+            stderr=b"",
+        ),
+        Response(
+            command=["/usr/bin/pvesh", "get", "cluster/acme/plugins", "--output-format=json"],
+            return_code=0,
+            stdout=f'[{{"plugin": "dns", "type": "dns", "data": "{secrets[3]}"}}]'.encode(),
+            stderr=b"",
+        ),
+    ]
+    cassette = Cassette()
+    client = create_recording_client(create_client(responses), cassette)
+    config = client("nodes/testprox/qemu/101/config")
+    config.add_option("cipassword", secrets[0]).add_option("sshkeys", secrets[1]).set()
+    client("cluster/acme/account").add_option("eab-hmac-key", secrets[2]).add_option("name", "default").create()
+    assert client("cluster/acme/plugins").get()[0]["data"] == secrets[3]
+
+    cassette.save(str(tmp_path / "cassette.json"))
+    text = (tmp_path / "cassette.json").read_text()
+    assert not [secret for secret in secrets if secret in text]
+
+    # calls with the real secrets still match the redacted recording
+    replay = create_replay_client(Cassette.load(str(tmp_path / "cassette.json")))
+    replay("cluster/acme/account").add_option("eab-hmac-key", secrets[2]).add_option("name", "default").create()
+    assert replay("cluster/acme/plugins").get() == [{"plugin": "dns", "type": "dns", "data": "**********"}]
@@ -0,0 +1,86 @@
+import pytest
+from module_utils.proxmox.client import (
+    ConflictError,
+    LockedError,
+    NotFoundError,
+    PermissionDeniedError,
+    ProxmoxError,
+    TransientError,
+    ValidationError,
+    classify_error,
+)
+from module_utils.proxmox.handlers.node_qemu_handler import NodeQemuHandler
+from ..utils import ApiResponse, ApiStandIn, Response, create_client
+
+
+@pytest.mark.parametrize(
+    "message,status,error",
+    [
+        pytest.param("Configuration file 'nodes/pve/qemu-server/101.conf' does not exist", None, NotFoundError),
+        pytest.param("pool 'testpool' does not exist", None, NotFoundError),
+        pytest.param("no such ha group 'group1'", None, NotFoundError),
+        pytest.param("no such resource 'vm:101'", None, NotFoundError),
+        pytest.param("ACME plugin 'dns1' not defined", None, NotFoundError),
+        pytest.param("ACME account config file 'default' does not exist", None, NotFoundError),
+        pytest.param("can't lock file '/var/lock/qemu-server/lock-101.conf' - got timeout", None, LockedError),
+        pytest.param("cfs-lock 'file-user_cfg' error: got lock request timeout", None, LockedError),
+        pytest.param("VM is locked (backup)", None, LockedError),
+        pytest.param("Permission check failed (/vms/101, VM.Config.Disk)", None, PermissionDeniedError),
+        pytest.param("Parameter verification failed.", 400, ValidationError),
+        pytest.param("Parameter verification failed. (400)\nscsi0: storage 'x' does not exist", 400, ValidationError),
+        pytest.param("400 Parameter verification failed.\nstorage: storage 'x' does not exist", None, ValidationError),
+        pytest.param("ipcc_send_rec[1] failed: Connection refused", None, TransientError),
+        pytest.param("Service Unavailable", 503, TransientError),
+        pytest.param("detected modified configuration - file changed by other user? Try again.", 500, ConflictError),
+        pytest.param("Forbidden", 403, PermissionDeniedError),
+        pytest.param("something went wrong", 500, ProxmoxError),
+    ],
+)
+def test_classify_error(message: str, status: int, error: type[ProxmoxError]) -> None:
+    assert classify_error(message, status) is error
+
+
+def test_pvesh_raises_classified_error() -> None:
+    responses = [
+        Response(
+            command=["/usr/bin/pvesh", "get", "nodes/testprox/qemu/101/config", "--output-format=json"],
+            return_code=255,
+            stdout=b"",
+            stderr=b"Configuration file 'nodes/testprox/qemu-server/101.conf' does not exist\n",
+        ),
+    ]
+    client = create_client(responses)
+    with pytest.raises(NotFoundError, match="Pvesh command .* failed with error: Configuration file"):
+        client("nodes/testprox/qemu/101/config").get()
+
+
+def test_lookup_raises_validation_error_quoting_a_missing_value() -> None:
+    responses = [
+        Response(
+            command=["/usr/bin/pvesh", "get", "nodes/testprox/qemu/101/config", "--output-format=json"],
+            return_code=255,
+            stdout=b"",
+            stderr=b"400 Parameter verification failed.\nstorage: storage 'x' does not exist\n",
+        ),
+    ]
+    handler = NodeQemuHandler(create_client(responses), {"node": "testprox", "vmid": 101})
+    # a NotFoundError would make the lookup return None and the handler create the VM
+    with pytest.raises(ValidationError, match="storage 'x' does not exist"):
+        handler.lookup()
+
+
+def test_api_client_raises_classified_error() -> None:
+    responses = [
+        ApiResponse(
+            method="PUT",
+            path="/api2/json/pools",
+            options={"poolid": "testpool"},
+            status=403,
+            reason="Permission check failed",
+        ),
+    ]
+    with ApiStandIn(responses) as api:
+        with pytest.raises(PermissionDeniedError) as error:
+            api.client()("pools").add_option("poolid", "testpool").set()
+
+    assert error.value.status == 403
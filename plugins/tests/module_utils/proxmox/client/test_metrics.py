@@ -0,0 +1,100 @@
+import threading
+import pytest
+from module_utils.proxmox.client import MetricsCollector, NO_RETRY, with_collector, with_retry_policy
+from module_utils.proxmox.handlers.pool_handler import PoolHandler
+from ..utils import ApiResponse, ApiStandIn, Response, create_client, create_fake_pvesh
+
+
+def test_collector_records_pvesh_calls() -> None:
+    responses = [
+        Response(
+            command=["/usr/bin/pvesh", "get", "pools", "--poolid=testpool", "--output-format=json"],
+            return_code=0,
+            stdout=b'[{"poolid": "testpool", "comment": "Test pool"}]',
+            stderr=b"",
+        ),
+        Response(
+            command=[
+                "/usr/bin/pvesh",
+                "set",
+                "pools",
+                "--poolid=testpool",
+                "--comment=Updated",
+                "--output-format=json",
+            ],
+            return_code=255,
+            stdout=b"",
+            stderr=b"Permission check failed (/pool/testpool, Pool.Allocate)\n",
+        ),
+    ]
+    collector = MetricsCollector()
+    client = with_collector(create_client(responses), collector)
+    handler = PoolHandler(client, {"poolid": "testpool", "comment": "Updated"}).collect_metrics(collector)
+    with pytest.raises(Exception, match="Permission check failed"):
+        with handler.phase("apply"):
+            handler.modify(check=False)
+
+    get, set = collector.records
+    assert (get.method, get.path, get.return_code, get.size, get.phase) == ("get", "pools", 0, 48, "diff")
+    assert (set.method, set.return_code, set.size, set.phase, set.failed) == ("set", 255, 0, "apply", True)
+
+    summary = collector.summary()
+    assert (summary["calls"], summary["bytes"], summary["errors"]) == (2, 48, 1)
+    assert summary["phases"]["diff"]["calls"] == 1
+    assert summary["phases"]["apply"]["calls"] == 1
+    assert summary["phases"]["apply"]["wall_seconds"] >= summary["phases"]["diff"]["wall_seconds"]
+    assert summary["methods"]["get"]["calls"] == 1
+    assert len(summary["slowest"]) == 2
+
+
+def test_collector_records_retries_and_streams() -> None:
+    collector = MetricsCollector()
+    client = with_retry_policy(with_collector(create_fake_pvesh(), collector), NO_RETRY)
+    records = list(client("cluster/resources").add_option("records", 10).get_iter())
+    with pytest.raises(Exception, match="does not exist"):
+        client("nodes/missing/qemu/101/config").get()
+
+    stream, failed = collector.records
+    assert (stream.method, stream.path, stream.return_code, len(records)) == ("get", "cluster/resources", 0, 10)
+    assert stream.size > 0
+    assert (failed.return_code, failed.failed) == (2, True)
+
+
+def test_collector_records_api_calls() -> None:
+    responses = [
+        ApiResponse(method="GET", path="/api2/json/version", data={"version": "8.2.4"}),
+        ApiResponse(method="DELETE", path="/api2/json/pools", options={"poolid": "x"}, status=403, reason="Forbidden"),
+    ]
+    collector = MetricsCollector()
+    with ApiStandIn(responses) as api:
+        client = with_collector(api.client(), collector)
+        client("version").get()
+        with pytest.raises(Exception, match="status 403"):
+            client("pools").add_option("poolid", "x").delete()
+
+    get, delete = collector.records
+    assert (get.method, get.return_code, get.failed) == ("get", 200, False)
+    assert (delete.method, delete.return_code, delete.failed) == ("delete", 403, True)
+
+
+def test_collector_phases_are_per_thread() -> None:
+    collector = MetricsCollector()
+    barrier = threading.Barrier(2)
+
+    def run(phase: str) -> None:
+        with collector.phase(phase):
+            barrier.wait()
+            collector.record("get", phase, 0.1, 0, 1)
+
+    threads = [threading.Thread(target=run, args=(phase,)) for phase in ("lookup", "apply")]
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    assert sorted((record.path, record.phase) for record in collector.records) == [
+        ("apply", "apply"),
+        ("lookup", "lookup"),
+    ]
+    assert collector.current_phase() is None
@@ -0,0 +1,126 @@
+import atexit
+import shutil
+import subprocess
+import textwrap
+import pytest
+from module_utils.proxmox.client.pvesh_session import _WORKER_SCRIPT, PveshSession
+from module_utils.proxmox.handlers.node_qemu_handler import NodeQemuHandler
+from ..utils import FAKE_PVESH, create_fake_pvesh, create_fake_session
+
+
+@pytest.fixture
+def session():
+    client = create_fake_session()
+    yield client
+    client.close()
+
+
+def test_pvesh_session_matches_pvesh_output(session) -> None:
+    pvesh = create_fake_pvesh()
+    for method in ["get", "set", "create", "delete"]:
+        expected = getattr(pvesh("pools").add_option("poolid", "test"), method)()
+        result = getattr(session("pools").add_option("poolid", "test"), method)()
+        assert result == expected
+
+    assert session("pools").add_option("poolid", "test").get() == {"path": "pools", "options": {"poolid": "test"}}
+
+
+def test_pvesh_session_raises_pvesh_error(session) -> None:
+    with pytest.raises(Exception, match="Configuration file 'nodes/missing/qemu/101/config' does not exist"):
+        session("nodes/missing/qemu/101/config").get()
+
+
+def test_pvesh_session_reuses_worker(session) -> None:
+    session("version").get()
+    worker = session._process
+    NodeQemuHandler(session, {"node": "testprox", "vmid": "101"}).lookup()
+    assert NodeQemuHandler(session, {"node": "missing", "vmid": "101"}).lookup() is None
+    assert session._process is worker
+
+
+def test_pvesh_session_restarts_worker(session) -> None:
+    session("version").get()
+    worker = session._process
+    worker.kill()
+    worker.wait()
+
+    assert session("version").get() == {"path": "version", "options": {}}
+    assert session._process is not worker
+
+
+def test_pvesh_session_registers_close_once(session, monkeypatch) -> None:
+    registered = []
+    monkeypatch.setattr(atexit, "register", registered.append)
+    for _ in range(3):
+        session("version").get()
+        session._process.kill()
+        session._process.wait()
+
+    assert registered == [session.close]
+
+
+# Stand-ins for the PVE Perl modules the worker script loads, nodes/{node}/status is proxied to {node}.
+PERL_MODULES = {
+    "JSON.pm": "package JSON; use parent 'JSON::PP'; 1;",
+    "PVE/Cluster.pm": "package PVE::Cluster; our $updates = 0; sub cfs_update { $updates++ } 1;",
+    "PVE/INotify.pm": "package PVE::INotify; sub nodename { 'pve1' } 1;",
+    "PVE/RPCEnvironment.pm": """
+        package PVE::RPCEnvironment;
+        sub init { return bless {}, shift }
+        sub set_language {}
+        sub set_user {}
+        sub init_request {}
+        1;
+    """,
+    "PVE/API2.pm": """
+        package PVE::API2;
+        sub find_handler {
+            my ($class, $method, $path, $uri_param) = @_;
+            return ('PVE::API2', {}) if $method eq 'GET' && $path eq 'version';
+            return if $path !~ m!^nodes/([^/]+)/status$!;
+            $uri_param->{node} = $1;
+            return ('PVE::API2', { proxyto => 'node' });
+        }
+        sub handle {
+            my ($class, $info, $param) = @_;
+            print "handler output\\n";
+            return { param => $param, cfs_updates => $PVE::Cluster::updates };
+        }
+        1;
+    """,
+}
+
+
+@pytest.fixture
+def perl_session(tmp_path):
+    if shutil.which("perl") is None or subprocess.run(["perl", "-MJSON::PP", "-e", "1"]).returncode != 0:
+        pytest.skip("perl with JSON::PP is not available")
+
+    for name, source in PERL_MODULES.items():
+        (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / name).write_text(textwrap.dedent(source))
+
+    class PerlSession(PveshSession):
+        _worker_command = ["perl", f"-I{tmp_path}", "-e", _WORKER_SCRIPT]
+        _command = FAKE_PVESH
+
+    yield PerlSession
+    PerlSession.close()
+
+
+def test_pvesh_session_worker_script_compiles(perl_session) -> None:
+    check = subprocess.run(perl_session._worker_command[:2] + ["-c", "-e", _WORKER_SCRIPT], capture_output=True)
+    assert check.returncode == 0, check.stderr.decode()
+
+
+def test_pvesh_session_worker_script_serves_requests(perl_session) -> None:
+    assert perl_session("version").add_option("full", "1").get() == {"param": {"full": "1"}, "cfs_updates": 1}
+    assert perl_session("version").get() == {"param": {}, "cfs_updates": 2}
+    assert perl_session("nodes/pve1/status").get() == {"param": {"node": "pve1"}, "cfs_updates": 3}
+    with pytest.raises(Exception, match="no 'get' handler for 'cluster/missing'"):
+        perl_session("cluster/missing").get()
+
+
+def test_pvesh_session_worker_script_forwards_other_nodes(perl_session) -> None:
+    # pvesh forwards the request, here the fake pvesh answers it
+    assert perl_session("nodes/pve2/status").get() == {"path": "nodes/pve2/status", "options": {}}
@@ -0,0 +1,76 @@
+import pytest
+from module_utils.proxmox.client import LockedError, RetryPolicy, TransientError, ValidationError, with_retry_policy
+from ....fakes.fake_clock import FakeClock
+from ..utils import Response, create_client
+
+
+def create_policy(clock: FakeClock, **kwargs) -> RetryPolicy:
+    return RetryPolicy(clock=clock, sleep=clock.sleep, rand=lambda: 0.5, **kwargs)
+
+
+def failing(errors: list[Exception], result: object = "done"):
+    def call() -> object:
+        if errors:
+            raise errors.pop(0)
+
+        return result
+
+    return call
+
+
+def test_retry_policy_retries_with_backoff(fake_clock: FakeClock) -> None:
+    policy = create_policy(fake_clock, initial_delay=0.5, backoff=2.0)
+    call = failing([LockedError("can't lock file"), TransientError("Connection refused")])
+    assert policy.run("get", call) == "done"
+    assert fake_clock.sleeps == [0.5, 1.0]
+
+
+def test_retry_policy_stops_after_attempts(fake_clock: FakeClock) -> None:
+    policy = create_policy(fake_clock, attempts=3)
+    with pytest.raises(LockedError):
+        policy.run("get", failing([LockedError("can't lock file") for _ in range(5)]))
+
+    assert len(fake_clock.sleeps) == 2
+
+
+def test_retry_policy_respects_budget(fake_clock: FakeClock) -> None:
+    policy = create_policy(fake_clock, attempts=10, initial_delay=1.0, max_delay=4.0, budget=5.0)
+    with pytest.raises(LockedError):
+        policy.run("set", failing([LockedError("can't lock file") for _ in range(10)]))
+
+    assert fake_clock.sleeps == [1.0, 2.0]
+
+
+@pytest.mark.parametrize(
+    "method,error,retried",
+    [
+        pytest.param("get", TransientError("Connection refused"), True),
+        pytest.param("set", TransientError("Connection refused"), False),
+        pytest.param("create", LockedError("can't lock file"), True),
+        pytest.param("get", ValidationError("Parameter verification failed."), False),
+    ],
+)
+def test_retry_policy_retryable_errors(method: str, error: Exception, retried: bool, fake_clock: FakeClock) -> None:
+    policy = create_policy(fake_clock)
+    if retried:
+        assert policy.run(method, failing([error])) == "done"
+    else:
+        with pytest.raises(type(error)):
+            policy.run(method, failing([error]))
+
+
+def test_pvesh_retries_locked_write(fake_clock: FakeClock) -> None:
+    command = ["/usr/bin/pvesh", "set", "nodes/testprox/qemu/101/config", "--cores=4", "--output-format=json"]
+    responses = [
+        Response(
+            command=command,
+            return_code=255,
+            stdout=b"",
+            stderr=b"can't lock file '/var/lock/qemu-server/lock-101.conf' - got timeout\n",
+        ),
+        Response(command=command, return_code=0, stdout=b"", stderr=b""),
+    ]
+    client = with_retry_policy(create_client(responses), create_policy(fake_clock))
+    assert client("nodes/testprox/qemu/101/config").add_option("cores", 4).set() == {}
+    assert client.responses.empty()
+    assert len(fake_clock.sleeps) == 1
@@ -0,0 +1,210 @@
+import json
+import os
+import pytest
+import re
+from module_utils.proxmox.client import ApiSchema, SchemaCache, ValidationError, create_validating_client
+from module_utils.proxmox.client import Pvesh, load_api_schema, parse_apidoc, read_apidoc
+from module_utils.proxmox.handlers.node_qemu_handler import NodeQemuHandler
+from ..utils import create_client, Response
+
+DISK_FORMAT = {
+    "file": {"type": "string", "default_key": 1, "format": "pve-volume-id-or-qm-path"},
+    "cache": {"type": "string", "optional": 1, "enum": ["directsync", "none", "unsafe", "writeback", "writethrough"]},
+    "discard": {"type": "string", "optional": 1, "enum": ["ignore", "on"]},
+    "iothread": {"type": "boolean", "optional": 1},
+    "size": {"type": "string", "optional": 1, "format": "disk-size"},
+    "volume": {"alias": "file"},
+}
+QEMU_PARAMETERS = {
+    "additionalProperties": 0,
+    "properties": {
+        "node": {"type": "string", "format": "pve-node"},
+        "vmid": {"type": "integer", "minimum": 100, "maximum": 999999999},
+        "name": {"type": "string", "optional": 1, "format": "dns-name"},
+        "cores": {"type": "integer", "optional": 1, "minimum": 1, "default": 1},
+        "acpi": {"type": "boolean", "optional": 1, "default": 1},
+        "amd-sev": {"type": "string", "optional": 1},
+        "ostype": {"type": "string", "optional": 1, "enum": ["l24", "l26", "win11"]},
+        "digest": {"type": "string", "optional": 1, "maxLength": 40},
+        "efidisk0": {
+            "type": "string",
+            "optional": 1,
+            "format": {
+                "file": {"type": "string", "default_key": 1},
+                "efitype": {"type": "string", "optional": 1, "enum": ["2m", "4m"]},
+                "pre-enrolled-keys": {"type": "boolean", "optional": 1},
+            },
+        },
+        "scsi[n]": {"type": "string", "optional": 1, "format": DISK_FORMAT},
+    },
+}
+TREE = [
+    {
+        "path": "/nodes",
+        "text": "nodes",
+        "children": [
+            {
+                "path": "/nodes/{node}",
+                "text": "{node}",
+                "children": [
+                    {
+                        "path": "/nodes/{node}/qemu",
+                        "text": "qemu",
+                        "info": {"POST": {"method": "POST", "parameters": QEMU_PARAMETERS}},
+                        "children": [
+                            {
+                                "path": "/nodes/{node}/qemu/{vmid}",
+                                "text": "{vmid}",
+                                "children": [
+                                    {
+                                        "path": "/nodes/{node}/qemu/{vmid}/config",
+                                        "text": "config",
+                                        "info": {"PUT": {"method": "PUT", "parameters": QEMU_PARAMETERS}},
+                                    }
+                                ],
+                            }
+                        ],
+                    }
+                ],
+            }
+        ],
+    },
+    {"path": "/version", "text": "version", "info": {"GET": {"method": "GET", "parameters": {}}}},
+]
+APIDOC = f"const apiSchema = {json.dumps(TREE)};\nlet method2cmd = {{ GET: 'get' }};\n"
+
+
+def test_schema_coerces_options() -> None:
+    schema = ApiSchema(TREE)
+    options = {"cores": 4, "acpi": True, "ostype": "l26", "scsi0": "local-lvm:vm-101-disk-0,iothread=on,size=8G"}
+
+    assert schema.validate("nodes/pve1/qemu/101/config", "PUT", options) == {
+        "cores": "4",
+        "acpi": "1",
+        "ostype": "l26",
+        "scsi0": "local-lvm:vm-101-disk-0,iothread=1,size=8G",
+    }
+
+
+@pytest.mark.parametrize(
+    "options,message",
+    [
+        pytest.param({"scsi0": "local-lvm:8,cahce=writeback"}, "scsi0: invalid format - property 'cahce'", id="typo"),
+        pytest.param({"scsi1": "local-lvm:8,cache=fast"}, "scsi1.cache: value 'fast' does not have", id="enum"),
+        pytest.param({"cores": 0}, "cores: value must have a minimum value of 1", id="minimum"),
+        pytest.param({"cores": "four"}, "cores: type check ('integer') failed", id="integer"),
+        pytest.param({"acpi": "maybe"}, "acpi: type check ('boolean') failed", id="boolean"),
+        pytest.param({"coers": 4}, "coers: property is not defined in schema", id="unknown"),
+    ],
+)
+def test_schema_rejects_invalid_options(options: dict, message: str) -> None:
+    with pytest.raises(ValidationError, match=re.escape(message)):
+        ApiSchema(TREE).validate("nodes/pve1/qemu", "POST", options)
+
+
+def test_schema_passes_unknown_paths_through() -> None:
+    assert ApiSchema(TREE).validate("cluster/options", "PUT", {"keyboard": "de"}) == {"keyboard": "de"}
+
+
+def test_schema_generates_argument_spec() -> None:
+    spec = ApiSchema(TREE).argument_spec("nodes/{node}/qemu", "POST", exclude=("node",))
+
+    assert spec == {
+        "acpi": dict(type="bool"),
+        "amd_sev": dict(type="str"),
+        "cores": dict(type="int"),
+        "digest": dict(type="str"),
+        "efidisk0": dict(type="str"),
+        "name": dict(type="str"),
+        "ostype": dict(type="str", choices=["l24", "l26", "win11"]),
+        "scsi": dict(type="list", elements="dict", default=[]),
+        "vmid": dict(type="int"),
+    }
+
+
+def test_schema_cache_fetches_once_per_version(tmp_path) -> None:
+    fetches = []
+
+    def fetch() -> str:
+        fetches.append(1)
+        return APIDOC
+
+    cache = SchemaCache(str(tmp_path))
+    for version in ("8.2.4", "8.2.4", "8.3.0"):
+        assert cache.load(version, fetch).method("nodes/pve1/qemu", "POST") is not None
+
+    assert len(fetches) == 2
+    assert json.loads((tmp_path / "apidoc-8.2.4.json").read_text()) == parse_apidoc(APIDOC)
+
+
+def test_invalid_resource_fails_before_any_call(tmp_path) -> None:
+    version = Response(
+        command=["/usr/bin/pvesh", "get", "version", "--output-format=json"],
+        return_code=0,
+        stdout=b'{"version": "8.2.4", "repoid": "faa83925c9641325"}',
+        stderr=b"",
+    )
+    client = create_client([version])
+    schema = load_api_schema(client, str(tmp_path), lambda: APIDOC)
+    params = {
+        "node": "testprox",
+        "vmid": 101,
+        "name": "testvm",
+        "efidisk0": "local-lvm:1,efitype=4m,pre-enroled-keys=1",
+    }
+
+    with pytest.raises(ValidationError, match="property 'pre-enroled-keys' is not defined"):
+        NodeQemuHandler(create_validating_client(client, schema), params).reconcile("present", False)
+
+    assert client.responses.empty()
+    assert (tmp_path / "apidoc-8.2.4-faa83925c9641325.json").exists()
+
+
+def test_load_api_schema_reads_a_valid_cache_without_any_call(tmp_path) -> None:
+    version = Response(
+        command=["/usr/bin/pvesh", "get", "version", "--output-format=json"],
+        return_code=0,
+        stdout=b'{"version": "8.2.4", "repoid": "faa83925c9641325"}',
+        stderr=b"",
+    )
+    client = create_client([version, version])
+
+    for _ in range(3):
+        assert load_api_schema(client, str(tmp_path), lambda: APIDOC).method("nodes/pve1/qemu", "POST") is not None
+
+    assert client.responses.qsize() == 1
+    # an outdated version is looked up again
+    os.utime(tmp_path / "version-localhost", (0, 0))
+    load_api_schema(client, str(tmp_path), lambda: APIDOC)
+    assert client.responses.empty()
+
+
+def test_validating_client_sends_coerced_options() -> None:
+    client = create_client(
+        [
+            Response(
+                command=["/usr/bin/pvesh", "set", "nodes/pve1/qemu/101/config", "--acpi=0", "--output-format=json"],
+                return_code=0,
+                stdout=b"",
+                stderr=b"",
+            ),
+        ]
+    )
+    validating = create_validating_client(client, ApiSchema(TREE))
+
+    with pytest.raises(ValidationError, match="cores: value must have a minimum value of 1"):
+        validating("nodes/pve1/qemu/101/config").add_option("cores", 0).set()
+
+    validating("nodes/pve1/qemu/101/config").add_option("acpi", False).set()
+    assert client.responses.empty()
+
+
+def test_read_apidoc_reads_the_node_document_through_pvesh(tmp_path) -> None:
+    apidoc = tmp_path / "pve-docs" / "api-viewer" / "apidoc.js"
+    apidoc.parent.mkdir(parents=True)
+    apidoc.write_text("const apiSchema = [];")
+
+    class NodePvesh(Pvesh):
+        _document_root = str(tmp_path)
+
+    assert read_apidoc(create_validating_client(NodePvesh, ApiSchema([]))) == "const apiSchema = [];"
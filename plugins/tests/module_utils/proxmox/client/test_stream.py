@@ -0,0 +1,146 @@
+import asyncio
+import json
+import pytest
+from typing import AsyncIterator
+from module_utils.proxmox.client import NotFoundError, aiter_json_array, create_caching_client, iter_json_array
+from ..utils import ApiResponse, ApiStandIn, Response, create_client, create_fake_pvesh, create_fake_session
+
+RECORDS = [
+    {"id": "qemu/101", "name": "vm-ü", "maxmem": 4294967296, "tags": "a;b", "template": 0},
+    {"id": "qemu/102", "name": 'vm "quoted" ]', "cpu": 0.125, "hastate": None},
+    12345,
+    "text",
+    [1, [2, {"3": []}]],
+]
+
+
+def _chunks(data: bytes, size: int) -> list[bytes]:
+    view = memoryview(data)
+    return [bytes(view[idx:][:size]) for idx in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, 1 << 20])
+def test_iter_json_array_any_chunk_boundary(size: int) -> None:
+    data = json.dumps(RECORDS, ensure_ascii=False, indent=1).encode()
+    assert list(iter_json_array(_chunks(data, size))) == RECORDS
+
+
+@pytest.mark.parametrize("size", [1, 5, 1 << 20])
+def test_iter_json_array_key(size: int) -> None:
+    data = json.dumps({"total": 2, "meta": {"data": "no"}, "data": RECORDS, "success": 1}).encode()
+    assert list(iter_json_array(_chunks(data, size), key="data")) == RECORDS
+
+
+@pytest.mark.parametrize(
+    "data,records",
+    [
+        pytest.param(b"", []),
+        pytest.param(b"[]", []),
+        pytest.param(b" [ ] ", []),
+        pytest.param(b"null", []),
+        pytest.param(b'{"version": "8.2.4"}', [{"version": "8.2.4"}]),
+        pytest.param(b"42", [42]),
+    ],
+)
+def test_iter_json_array_documents(data: bytes, records: list) -> None:
+    assert list(iter_json_array(_chunks(data, 1))) == records
+
+
+@pytest.mark.parametrize(
+    "data,key",
+    [
+        pytest.param(b'{"data": null}', "data"),
+        pytest.param(b'{"other": [1]}', "data"),
+        pytest.param(b"{}", "data"),
+        pytest.param(b"", "data"),
+    ],
+)
+def test_iter_json_array_missing_key(data: bytes, key: str) -> None:
+    assert list(iter_json_array([data], key=key)) == []
+
+
+@pytest.mark.parametrize("data", [b'[{"a": 1} {"b": 2}]', b'[{"a": 1},', b"[1, 2"])
+def test_iter_json_array_malformed(data: bytes) -> None:
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_array(_chunks(data, 2)))
+
+
+@pytest.mark.parametrize("size", [1, 7, 1 << 20])
+def test_aiter_json_array_matches_iter_json_array(size: int) -> None:
+    data = json.dumps({"data": RECORDS}).encode()
+
+    async def chunks() -> AsyncIterator[bytes]:
+        for chunk in _chunks(data, size):
+            yield chunk
+
+    async def run() -> list:
+        return [record async for record in aiter_json_array(chunks(), key="data")]
+
+    assert asyncio.run(run()) == RECORDS
+
+
+def test_iter_json_array_is_lazy() -> None:
+    consumed = []
+
+    def chunks():
+        for chunk in (b'[{"a": 1}, ', b'{"b": 2}, ', b'{"c": 3}]'):
+            consumed.append(chunk)
+            yield chunk
+
+    records = iter_json_array(chunks())
+    assert next(records) == {"a": 1}
+    assert len(consumed) == 1
+
+
+@pytest.mark.parametrize("factory", [create_fake_pvesh, create_fake_session])
+def test_pvesh_get_iter_matches_get(factory) -> None:
+    client = factory()
+    try:
+        expected = client("cluster/resources").add_option("records", 1000).get()
+        records = list(client("cluster/resources").add_option("records", 1000).get_iter())
+        with pytest.raises(NotFoundError, match="Configuration file 'nodes/missing/qemu' does not exist"):
+            list(client("nodes/missing/qemu").get_iter())
+    finally:
+        getattr(client, "close", lambda: None)()
+
+    assert records == expected
+    assert len(records) == 1000
+
+
+def test_pvesh_get_iter_stops_early() -> None:
+    records = create_fake_pvesh()("cluster/resources").add_option("records", 100000).get_iter()
+    assert next(records) == {"path": "cluster/resources", "index": 0}
+    records.close()
+
+
+def test_api_client_get_iter() -> None:
+    resources = [{"id": f"qemu/{vmid}", "vmid": vmid} for vmid in range(100, 600)]
+    responses = [
+        ApiResponse(method="GET", path="/api2/json/cluster/resources", data=resources),
+        ApiResponse(method="GET", path="/api2/json/version", data={"version": "8.2.4"}),
+        ApiResponse(method="GET", path="/api2/json/cluster/resources", status=403, reason="Permission check failed"),
+    ]
+    with ApiStandIn(responses) as api:
+        client = api.client()
+        assert list(client("cluster/resources").get_iter()) == resources
+        assert client("version").get() == {"version": "8.2.4"}
+        with pytest.raises(Exception, match="status 403"):
+            list(client("cluster/resources").get_iter())
+
+    assert api.connections == 1
+
+
+def test_caching_client_get_iter_reuses_cached_response() -> None:
+    resources = [{"id": "qemu/101"}, {"id": "qemu/102"}]
+    responses = [
+        Response(
+            command=["/usr/bin/pvesh", "get", "cluster/resources", "--output-format=json"],
+            return_code=0,
+            stdout=json.dumps(resources).encode(),
+            stderr=b"",
+        ),
+    ]
+    client = create_caching_client(create_client(responses))
+    assert client("cluster/resources").get() == resources
+    assert list(client("cluster/resources").get_iter()) == resources
+    assert client.cache.stats()["hits"] == 1
@@ -0,0 +1,7 @@
+import pytest
+from ...fakes.fake_clock import FakeClock
+
+
+@pytest.fixture
+def fake_clock() -> FakeClock:
+    return FakeClock()
@@ -0,0 +1,143 @@
+import asyncio
+import time
+from typing import AsyncIterator
+from module_utils.proxmox.client import NotFoundError
+from module_utils.proxmox.client.sync_bridge import create_sync_bridge
+from module_utils.proxmox.handlers.async_handler import AsyncHandler
+from module_utils.proxmox.handlers.node_qemu_handler import NodeQemuHandler
+from module_utils.proxmox.handlers.pool_handler import PoolHandler
+
+
+class FakeAsyncClient:
+    responses: dict[str, object] = {}
+    delay: float = 0.0
+    # calls wait, up to a few seconds, until that many of them ran at once
+    together: int = 0
+    calls: list[tuple[str, str, dict]]
+    streamed: list[object]
+    running: int = 0
+    peak: int = 0
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+        self._options: dict[str, str] = {}
+
+    def add_option(self, name: str, value: str = "") -> "FakeAsyncClient":
+        self._options[name] = str(value)
+        return self
+
+    async def _call(self, method: str) -> object:
+        cls = type(self)
+        self.calls.append((method, self._path, self._options))
+        cls.running += 1
+        cls.peak = max(cls.peak, cls.running)
+        deadline = time.monotonic() + 5
+        try:
+            await asyncio.sleep(self.delay)
+            while cls.peak < self.together and time.monotonic() < deadline:
+                await asyncio.sleep(0.001)
+        finally:
+            cls.running -= 1
+
+        if method != "get":
+            return {}
+
+        if self._path not in self.responses:
+            raise NotFoundError(f"Configuration file '{self._path}' does not exist")
+
+        return self.responses[self._path]
+
+    async def get(self) -> object:
+        return await self._call("get")
+
+    async def get_iter(self) -> AsyncIterator[object]:
+        data = await self._call("get")
+        for record in data if isinstance(data, list) else [data]:
+            self.streamed.append(record)
+            yield record
+
+    async def get_document(self, url: str) -> bytes:
+        return f"document {url}".encode()
+
+    async def create(self) -> object:
+        return await self._call("create")
+
+    async def set(self) -> object:
+        return await self._call("set")
+
+    async def delete(self) -> object:
+        return await self._call("delete")
+
+
+def create_async_client(responses: dict[str, object], **attributes: object) -> type[FakeAsyncClient]:
+    return type(
+        "FakeAsyncClient", (FakeAsyncClient,), {"responses": responses, "calls": [], "streamed": [], **attributes}
+    )
+
+
+def test_async_handler_lookups_overlap() -> None:
+    responses = {f"nodes/testprox/qemu/{vmid}/config": {"name": f"vm{vmid}"} for vmid in range(100, 139)}
+    # more handlers than the default executor of the loop has threads, all of them run at once
+    client = create_async_client(responses, _max_in_flight=40, together=40)
+    handlers = [AsyncHandler(NodeQemuHandler, client, {"node": "testprox", "vmid": vmid}) for vmid in range(100, 140)]
+
+    async def run() -> list:
+        return await asyncio.gather(*[handler.lookup() for handler in handlers])
+
+    lookups = asyncio.run(run())
+
+    assert [lookup.name for lookup in lookups[:-1]] == [f"vm{vmid}" for vmid in range(100, 139)]
+    assert lookups[-1] is None
+    assert client.peak == 40
+
+
+def test_async_handler_runs_as_many_handlers_as_the_client_bound() -> None:
+    responses = {f"nodes/testprox/qemu/{vmid}/config": {"name": f"vm{vmid}"} for vmid in range(100, 110)}
+    client = create_async_client(responses, _max_in_flight=3, delay=0.01)
+    handlers = [AsyncHandler(NodeQemuHandler, client, {"node": "testprox", "vmid": vmid}) for vmid in range(100, 110)]
+
+    async def run() -> list:
+        return await asyncio.gather(*[handler.lookup() for handler in handlers])
+
+    assert len(asyncio.run(run())) == 10
+    assert client.peak == 3
+
+
+def test_sync_bridge_streams_records_and_reads_documents() -> None:
+    client = create_async_client({"cluster/resources": [{"vmid": vmid} for vmid in range(100, 110)]})
+
+    async def run() -> tuple:
+        bridge = create_sync_bridge(client, asyncio.get_running_loop())
+
+        def read() -> tuple:
+            records = bridge("cluster/resources").get_iter()
+            first = next(records)
+            records.close()
+            return first, bridge("").get_document("/pve-docs/api-viewer/apidoc.js")
+
+        return await asyncio.to_thread(read)
+
+    assert asyncio.run(run()) == ({"vmid": 100}, b"document /pve-docs/api-viewer/apidoc.js")
+    assert client.streamed == [{"vmid": 100}]
+
+
+def test_async_handler_modify_create_remove() -> None:
+    client = create_async_client({"pools": [{"poolid": "a", "comment": "old"}]})
+
+    async def run() -> list:
+        return await asyncio.gather(
+            AsyncHandler(PoolHandler, client, {"poolid": "a", "comment": "new"}).modify(False),
+            AsyncHandler(PoolHandler, client, {"poolid": "b", "comment": ""}).create(False),
+            AsyncHandler(PoolHandler, client, {"poolid": "c"}).remove(False),
+        )
+
+    modified, created, removed = asyncio.run(run())
+
+    assert modified.changes == {"comment": "new"}
+    assert created.status and removed.status
+    assert sorted((method, options["poolid"]) for method, _, options in client.calls) == [
+        ("create", "b"),
+        ("delete", "c"),
+        ("get", "a"),
+        ("set", "a"),
+    ]
@@ -0,0 +1,90 @@
+import pytest
+from module_utils.proxmox.client import MetricsCollector, with_collector
+from module_utils.proxmox.handlers.node_qemu_handler import NodeQemuHandler
+from module_utils.proxmox.handlers.pool_handler import PoolHandler
+from ..utils import Response, assert_call_budget, create_client
+
+POOL_GET = Response(
+    command=["/usr/bin/pvesh", "get", "pools", "--poolid=testpool", "--output-format=json"],
+    return_code=0,
+    stdout=b'[{"poolid": "testpool", "comment": "Test pool"}]',
+    stderr=b"",
+)
+POOL_MISSING = Response(
+    command=["/usr/bin/pvesh", "get", "pools", "--poolid=testpool", "--output-format=json"],
+    return_code=255,
+    stdout=b"",
+    stderr=b"pool 'testpool' does not exist\n",
+)
+QEMU_GET = Response(
+    command=["/usr/bin/pvesh", "get", "nodes/testprox/qemu/101/config", "--output-format=json"],
+    return_code=0,
+    stdout=b'{"name": "testvm", "cores": 2}',
+    stderr=b"",
+)
+
+
+def _write(method: str, *options: str) -> Response:
+    return Response(
+        command=["/usr/bin/pvesh", method, "pools", "--poolid=testpool", *options, "--output-format=json"],
+        return_code=0,
+        stdout=b"",
+        stderr=b"",
+    )
+
+
+@pytest.mark.parametrize(
+    "params,state,responses,budget",
+    [
+        pytest.param(
+            {"poolid": "testpool", "comment": "Test pool"},
+            "present",
+            [POOL_GET],
+            dict(total=1, lookup=1, diff=0, apply=0, final_lookup=0),
+            id="pool-unchanged",
+        ),
+        pytest.param(
+            {"poolid": "testpool", "comment": "Updated"},
+            "present",
+            [POOL_GET, _write("set", "--comment=Updated")],
+            dict(total=2, lookup=1, diff=0, apply=1, final_lookup=0),
+            id="pool-modified",
+        ),
+        pytest.param(
+            {"poolid": "testpool", "comment": "Test pool"},
+            "present",
+            [POOL_MISSING, _write("create", "--comment=Test pool")],
+            dict(total=2, lookup=1, diff=0, apply=1, final_lookup=0),
+            id="pool-created",
+        ),
+        pytest.param(
+            {"poolid": "testpool"},
+            "absent",
+            [POOL_GET, _write("delete")],
+            dict(total=2, lookup=1, apply=1, final_lookup=0),
+            id="pool-removed",
+        ),
+    ],
+)
+def test_pool_reconcile_call_budget(params: dict, state: str, responses: list[Response], budget: dict) -> None:
+    collector = MetricsCollector()
+    client = with_collector(create_client(responses), collector)
+    PoolHandler(client, params).collect_metrics(collector).reconcile(state, check=False)
+    assert_call_budget(collector, **budget)
+    assert client.responses.empty()
+
+
+def test_pool_reconcile_verified_call_budget() -> None:
+    collector = MetricsCollector()
+    client = with_collector(create_client([POOL_GET, POOL_GET]), collector)
+    handler = PoolHandler(client, {"poolid": "testpool", "comment": "Test pool"}).collect_metrics(collector)
+    handler.reconcile("present", check=False, return_mode="verified")
+    assert_call_budget(collector, total=2, lookup=1, diff=0, apply=0, final_lookup=1)
+
+
+def test_node_qemu_reconcile_call_budget() -> None:
+    collector = MetricsCollector()
+    client = with_collector(create_client([QEMU_GET]), collector)
+    handler = NodeQemuHandler(client, {"node": "testprox", "vmid": 101, "name": "testvm", "cores": 2})
+    handler.collect_metrics(collector).reconcile("present", check=True)
+    assert_call_budget(collector, total=1, lookup=1, diff=0, apply=0, final_lookup=0)
@@ -1,6 +1,12 @@
+import json
+import threading
 import pytest
 from typing import Iterable
+from module_utils.proxmox.client import MetricsCollector, NotFoundError, with_collector
+from module_utils.proxmox.client.pvesh import CommandResult, Pvesh
 from module_utils.proxmox.handlers.node_qemu_handler import NodeQemuHandler
+from module_utils.proxmox.resources.node.qemu import Qemu
+from module_utils.proxmox.scheduler import ApplyError
 from ..utils import create_client, Response
 
 
@@ -263,3 +269,184 @@ def test_node_qemu_handler_lookup() -> None:
     assert result.virtio[0].size == "32"
     assert result.virtio[0].cache == "writeback"
     assert client.responses.empty()
+
+
+def test_node_qemu_handler_resizes_disks_concurrently() -> None:
+    storages = ["ssd", "ssd", "ssd", "hdd"]
+    lookup = {
+        "name": "testvm",
+        **{f"scsi{idx}": f"{storage}:vm-101-disk-{idx},size=1" for idx, storage in enumerate(storages)},
+    }
+    calls = []
+    lock = threading.Lock()
+    in_flight = {"ssd": 0, "hdd": 0}
+    peak = {"ssd": 0, "hdd": 0}
+    # the first wave, two ssd resizes and the hdd one, only gets past the barrier if it runs together
+    first_wave = threading.Barrier(3, timeout=5)
+
+    class ConcurrentPvesh(Pvesh):
+        def _run(self, command: list[str]) -> CommandResult:
+            calls.append(command[1:-1])
+            if not command[2].endswith("/resize"):
+                stdout = json.dumps(lookup).encode() if command[1] == "get" else b""
+                return CommandResult(return_code=0, stderr=b"", stdout=stdout)
+
+            storage = storages[int(command[3].removeprefix("--disk=scsi"))]
+            with lock:
+                resizes = sum(1 for call in calls if call[1].endswith("/resize"))
+                in_flight[storage] += 1
+                peak[storage] = max(peak[storage], in_flight[storage])
+            try:
+                if resizes <= 3:
+                    first_wave.wait()
+            finally:
+                with lock:
+                    in_flight[storage] -= 1
+
+            if "--disk=scsi2" in command:
+                return CommandResult(return_code=255, stderr=b"storage full\n", stdout=b"")
+
+            return CommandResult(return_code=0, stderr=b"", stdout=b"")
+
+    params = {
+        "node": "testprox",
+        "vmid": 101,
+        "name": "testvm",
+        "resize_concurrency": 2,
+        "scsi": [{"idx": idx, "storage": storage, "size": 2} for idx, storage in enumerate(storages)],
+    }
+
+    with pytest.raises(ApplyError, match="1 of 4 steps failed - scsi2: .*storage full"):
+        NodeQemuHandler(ConcurrentPvesh, params).modify(check=False)
+
+    assert calls[1][:2] == ["set", "nodes/testprox/qemu/101/config"]
+    assert sorted(call[2] for call in calls[2:]) == ["--disk=scsi0", "--disk=scsi1", "--disk=scsi2", "--disk=scsi3"]
+    # config update, then at most two resizes at a time on ssd while hdd resizes alongside
+    assert peak == {"ssd": 2, "hdd": 1}
+
+
+def test_node_qemu_handler_keeps_the_phase_on_concurrent_resizes() -> None:
+    lookup = {"name": "testvm", "scsi0": "ssd:vm-101-disk-0,size=1", "scsi1": "hdd:vm-101-disk-1,size=1"}
+
+    class FakePvesh(Pvesh):
+        def _run(self, command: list[str]) -> CommandResult:
+            stdout = json.dumps(lookup).encode() if command[1] == "get" else b""
+            return CommandResult(return_code=0, stderr=b"", stdout=stdout)
+
+    params = {
+        "node": "testprox",
+        "vmid": 101,
+        "name": "testvm",
+        "scsi": [{"idx": 0, "storage": "ssd", "size": 2}, {"idx": 1, "storage": "hdd", "size": 2}],
+    }
+    collector = MetricsCollector()
+    handler = NodeQemuHandler(with_collector(FakePvesh, collector), params).collect_metrics(collector)
+    with handler.phase("apply"):
+        handler.modify(check=False)
+
+    resizes = [record for record in collector.calls("set") if record.path.endswith("/resize")]
+    assert len(resizes) == 2
+    assert [record.phase for record in resizes] == ["apply", "apply"]
+
+
+def test_node_qemu_handler_writes_with_lookup_digest() -> None:
+    NodeQemuHandler.parse_cache.clear()
+    config = Response(
+        command=["/usr/bin/pvesh", "get", "nodes/testprox/qemu/101/config", "--output-format=json"],
+        return_code=0,
+        stdout=b'{"name": "testvm", "cores": 2, "digest": "4a1f"}',
+        stderr=b'',
+    )
+    responses = [
+        config,
+        config,
+        config,
+        Response(
+            command=[
+                "/usr/bin/pvesh",
+                "set",
+                "nodes/testprox/qemu/101/config",
+                "--cores=4",
+                "--digest=4a1f",
+                "--output-format=json",
+            ],
+            return_code=0,
+            stdout=b'',
+            stderr=b'',
+        ),
+    ]
+    client = create_client(responses)
+    handler = NodeQemuHandler(client, {"node": "testprox", "vmid": 101, "name": "testvm", "cores": 4})
+
+    lookup = handler.lookup()
+    assert handler.lookup() is lookup
+    assert NodeQemuHandler.parse_cache.stats()["size"] == 1
+
+    result = handler.reconcile("present", check=False)
+    assert result["changed"] and result["data"]["cores"] == "4"
+    assert "digest" not in result["data"]
+    assert client.responses.empty()
+
+
+def test_node_qemu_handler_does_not_share_views_between_vms() -> None:
+    NodeQemuHandler.parse_cache.clear()
+    responses = [
+        Response(
+            command=["/usr/bin/pvesh", "get", f"nodes/testprox/qemu/{vmid}/config", "--output-format=json"],
+            return_code=0,
+            stdout=b'{"cores": 2, "digest": "4a1f"}',
+            stderr=b'',
+        )
+        for vmid in (101, 102)
+    ]
+    client = create_client(responses)
+
+    first = NodeQemuHandler(client, {"node": "testprox", "vmid": 101}).lookup()
+    second = NodeQemuHandler(client, {"node": "testprox", "vmid": 102}).lookup()
+    assert first is not second
+    assert NodeQemuHandler.parse_cache.stats()["size"] == 2
+
+
+@pytest.mark.parametrize(
+    "lookup_size,size,resize",
+    [
+        pytest.param("1T", 1024, None, id="same size in another unit"),
+        pytest.param("32768M", "32G", None, id="same size in megabytes"),
+        pytest.param("512M", 1, "1G", id="grow from megabytes"),
+        pytest.param("9G", 10, "10G", id="grow past a digit"),
+        pytest.param("1536M", "2", "2G", id="grow to whole gibibytes"),
+    ],
+)
+def test_node_qemu_handler_resize_compares_sizes(lookup_size: str, size, resize) -> None:
+    NodeQemuHandler.parse_cache.clear()
+    lookup = Qemu("testprox", {"vmid": 101, "scsi0": f"local-lvm:vm-101-disk-0,size={lookup_size}"})
+    params = {"node": "testprox", "vmid": 101, "scsi": [{"idx": 0, "storage": "local-lvm", "size": size}]}
+    handler = NodeQemuHandler(create_client([]), params)
+
+    request = handler._resize_disk("scsi0", handler._resource.serialize()["scsi0"], lookup.serialize())
+    assert (request and request._options["size"]) == resize
+    assert handler.modify(check=True, lookup=lookup).status == (resize is not None)
+
+
+def test_node_qemu_handler_refuses_to_shrink_disks() -> None:
+    lookup = Qemu("testprox", {"vmid": 101, "scsi0": "local-lvm:vm-101-disk-0,size=10G"})
+    params = {"node": "testprox", "vmid": 101, "scsi": [{"idx": 0, "storage": "local-lvm", "size": 9}]}
+    handler = NodeQemuHandler(create_client([]), params)
+
+    with pytest.raises(ValueError, match="Cannot shrink disk size from size=10G to size=9G"):
+        handler.modify(check=True, lookup=lookup)
+
+
+def test_node_qemu_handler_modify_fails_when_the_vm_is_gone() -> None:
+    responses = [
+        Response(
+            command=["/usr/bin/pvesh", "get", "nodes/testprox/qemu/101/config", "--output-format=json"],
+            return_code=255,
+            stdout=b'',
+            stderr=b"Configuration file 'nodes/testprox/qemu/101.conf' does not exist\n",
+        ),
+    ]
+    handler = NodeQemuHandler(create_client(responses), {"node": "testprox", "vmid": 101, "cores": 4})
+
+    with pytest.raises(NotFoundError, match="VM 101 does not exist on node testprox"):
+        handler.modify(check=False)
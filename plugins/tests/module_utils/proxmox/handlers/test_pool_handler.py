@@ -1,4 +1,5 @@
 import pytest
+from module_utils.proxmox.client import PermissionDeniedError
 from module_utils.proxmox.handlers.pool_handler import PoolHandler
 from ..utils import create_client, Response
 
@@ -126,3 +127,80 @@ def test_pool_handler_lookup() -> None:
     assert result.poolid == "testpool"
     assert result.comment == "Test pool"
     assert client.responses.empty()
+
+
+def test_pool_handler_lookup_missing() -> None:
+    responses = [
+        Response(
+            command=["/usr/bin/pvesh", "get", "pools", "--poolid=testpool", "--output-format=json"],
+            return_code=255,
+            stdout=b'',
+            stderr=b"pool 'testpool' does not exist\n",
+        ),
+    ]
+    client = create_client(responses)
+    handler = PoolHandler(client, {"poolid": "testpool"})
+    assert handler.lookup() is None
+    assert client.responses.empty()
+
+
+def test_pool_handler_lookup_raises_other_errors() -> None:
+    responses = [
+        Response(
+            command=["/usr/bin/pvesh", "get", "pools", "--poolid=testpool", "--output-format=json"],
+            return_code=255,
+            stdout=b'',
+            stderr=b"Permission check failed (/pool/testpool, Pool.Audit)\n",
+        ),
+    ]
+    client = create_client(responses)
+    handler = PoolHandler(client, {"poolid": "testpool"})
+    with pytest.raises(PermissionDeniedError):
+        handler.lookup()
+
+
+@pytest.mark.parametrize(
+    "return_mode,expected",
+    [
+        pytest.param("minimal", {"changed": True}, id="minimal"),
+        pytest.param("diff", {"changed": True, "updated_fields": {"comment": "Updated"}}, id="diff"),
+        pytest.param(
+            "full",
+            {
+                "changed": True,
+                "updated_fields": {"comment": "Updated"},
+                "data": {"poolid": "testpool", "comment": "Updated"},
+            },
+            id="full",
+        ),
+    ],
+)
+def test_pool_handler_reconcile_return_mode(return_mode: str, expected: dict) -> None:
+    responses = [
+        Response(
+            command=["/usr/bin/pvesh", "get", "pools", "--poolid=testpool", "--output-format=json"],
+            return_code=0,
+            stdout=b'[{"poolid": "testpool", "comment": "Test pool"}]',
+            stderr=b'',
+        ),
+        Response(
+            command=[
+                "/usr/bin/pvesh",
+                "set",
+                "pools",
+                "--poolid=testpool",
+                "--comment=Updated",
+                "--output-format=json",
+            ],
+            return_code=0,
+            stdout=b'',
+            stderr=b'',
+        ),
+    ]
+    client = create_client(responses)
+    result = PoolHandler(client, {"poolid": "testpool", "comment": "Updated"}).reconcile("present", False, return_mode)
+    if "data" in result:
+        result["data"] = {key: result["data"][key] for key in ("poolid", "comment")}
+
+    assert result == expected
+    assert client.responses.empty()
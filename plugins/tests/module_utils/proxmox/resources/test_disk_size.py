@@ -0,0 +1,52 @@
+import pytest
+from module_utils.proxmox.resources.node.qemu import Qemu
+from module_utils.proxmox.resources.node.qemu.storage import DiskSize
+
+
+@pytest.mark.parametrize(
+    "text,size_bytes,text_size",
+    [
+        ("32", 32 * 1024**3, "32"),
+        ("32G", 32 * 1024**3, "32"),
+        ("1T", 1024**4, "1024"),
+        ("1.5G", 1536 * 1024**2, "1536M"),
+        ("512M", 512 * 1024**2, "512M"),
+        ("4M", 4 * 1024**2, "4M"),
+        ("528K", 528 * 1024, "528K"),
+        ("8g", 8 * 1024**3, "8"),
+    ],
+)
+def test_disk_size_parse(text: str, size_bytes: int, text_size: str) -> None:
+    size = DiskSize.parse(text)
+
+    assert size.bytes == size_bytes
+    assert str(size) == text_size
+    assert DiskSize.parse(str(size)) == size
+
+
+def test_disk_size_compares_by_value() -> None:
+    assert DiskSize.parse("9") < DiskSize.parse("10")
+    assert DiskSize.parse("1T") == DiskSize.parse("1024G")
+    assert DiskSize.parse("1T") == "1024" and DiskSize.parse("1T") == 1024
+    assert DiskSize.parse("512M") < "1" and DiskSize.parse("2T") > "1025G"
+    assert DiskSize.parse("1G") != "cdrom"
+    assert DiskSize.parse(None) is None
+    assert (DiskSize.parse("2").to_api(), DiskSize.parse("1.5").to_api()) == ("2G", "1536M")
+
+
+def test_disk_size_rejects_invalid_sizes() -> None:
+    with pytest.raises(ValueError, match="Invalid disk size: 10X"):
+        DiskSize.parse("10X")
+
+
+def test_storage_allocates_gibibytes() -> None:
+    qemu = Qemu(
+        "pve1",
+        {
+            "scsi": [{"idx": 0, "storage": "local-lvm", "size": "512M"}],
+            "virtio": [{"idx": 0, "storage": "ssd", "size": 1}],
+        },
+    )
+
+    assert (qemu.scsi[0].file, qemu.virtio[0].file) == ("local-lvm:0.5", "ssd:1")
+    assert qemu.serialize()["scsi0"] == "file=local-lvm:0.5,size=512M"
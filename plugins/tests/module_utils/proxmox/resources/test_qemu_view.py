@@ -0,0 +1,44 @@
+import pytest
+from module_utils.proxmox.resources.node.qemu import Qemu
+from module_utils.proxmox.resources.node.qemu.view import QemuView
+
+RAW = {
+    "vmid": 101,
+    "name": "testvm",
+    "cores": "4",
+    "pool": "web",
+    "tags": "web;prod",
+    "digest": "4a1f",
+    "live-restore": "1",
+    "scsi0": "local-lvm:vm-101-disk-0,cache=writeback,size=32G",
+    "virtio0": "local-lvm:vm-101-disk-1,size=8G",
+    "net0": "virtio=BC:24:11:00:00:01,bridge=vmbr0,tag=101",
+}
+
+
+def test_qemu_view_reads_plain_fields_without_parsing() -> None:
+    view = QemuView("pve1", RAW)
+
+    assert (view.node, view.vmid, view.name, view.pool, view.tags) == ("pve1", "101", "testvm", "web", "web;prod")
+    assert (view.live_restore, view.digest, view.memory) == ("1", "4a1f", None)
+    assert view._qemu is None
+
+    assert [disk.key() for disk in view.scsi + view.virtio] == ["scsi0", "virtio0"]
+    assert view._qemu is not None
+
+
+def test_qemu_view_matches_qemu() -> None:
+    view, qemu = QemuView("pve1", RAW), Qemu("pve1", RAW)
+
+    for field in Qemu._schema.keys:
+        if field not in ("ide", "sata", "scsi", "virtio", "net"):
+            assert getattr(view, field) == getattr(qemu, field), field
+
+    assert view.serialize() == qemu.serialize()
+    assert view.to_dict() == qemu.to_dict()
+    assert view.diff(qemu) == {} and qemu.diff(view) == {}
+
+
+def test_qemu_view_rejects_unknown_fields() -> None:
+    with pytest.raises(AttributeError, match="no attribute 'scsi0'"):
+        QemuView("pve1", RAW).scsi0
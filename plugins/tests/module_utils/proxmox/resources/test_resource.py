@@ -0,0 +1,13 @@
+import sys
+from module_utils.proxmox.resources.node.qemu import Qemu
+from module_utils.proxmox.resources.node.qemu.storage import SCSIStorage
+
+
+def test_unset_fields_take_no_instance_storage() -> None:
+    empty = Qemu("pve1", {})
+    full = Qemu("pve1", {"vmid": 101, "name": "web", "cores": 4, "memory": 4096, "scsi0": "local-lvm:vm-101-disk-0"})
+
+    assert not hasattr(empty, "__dict__")
+    assert sys.getsizeof(empty) == sys.getsizeof(full)
+    disk = {"idx": 0, "storage": "local-lvm"}
+    assert sys.getsizeof(SCSIStorage(disk)) == sys.getsizeof(SCSIStorage(dict(disk, cache="none", size="32G")))
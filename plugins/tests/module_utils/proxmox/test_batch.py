@@ -0,0 +1,108 @@
+import threading
+import time
+import pytest
+from module_utils.proxmox import batch
+from module_utils.proxmox.batch import BatchModule, batch_params, run_batch
+from module_utils.proxmox.handlers.base import BaseHandler
+from ...fakes.simulated_cluster import STATE_ENV, SimulatedCluster
+from .utils import create_fake_session
+
+
+def test_run_batch_against_simulated_cluster(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv(STATE_ENV, str(tmp_path))
+    SimulatedCluster.init(str(tmp_path), nodes=2, vms=2, pools=("db",))
+    client = create_fake_session()
+    items = [
+        {"module": "margays.proxmox.cluster_ha_group", "args": {"group": "web", "nodes": [{"name": "pve1"}]}},
+        {"module": "pool", "args": {"poolid": "web"}},
+        {"module": "cluster_ha_resource", "args": {"sid": "vm:101", "group": "web"}},
+        {"module": "pool", "args": {"poolid": "web", "comment": "Web servers"}},
+        {"module": "pool", "args": {"poolid": "db", "state": "absent"}},
+        {"module": "cluster_ha_resource", "args": {"sid": "vm:102", "group": "missing", "state": "absent"}},
+    ]
+
+    try:
+        first = run_batch(client, items, check=False, workers=4)
+        second = run_batch(client, items, check=False, workers=4)
+        pools = client("pools").get()
+    finally:
+        client.close()
+
+    assert [result["module"] for result in first["results"]] == [
+        "cluster_ha_group",
+        "pool",
+        "cluster_ha_resource",
+        "pool",
+        "pool",
+        "cluster_ha_resource",
+    ]
+    assert [result["changed"] for result in first["results"]] == [True, True, True, True, True, False]
+    assert first["results"][3]["data"] == {"poolid": "web", "comment": "Web servers"}
+    assert (first["changed_count"], first["failed_count"]) == (5, 0)
+    # the two pool items of web disagree on the comment, in order the second one wins every run
+    assert (second["changed_count"], second["failed_count"]) == (2, 0)
+    assert [(pool["poolid"], pool["comment"]) for pool in pools] == [("web", "Web servers")]
+
+
+def test_run_batch_orders_items_sharing_a_resource(monkeypatch) -> None:
+    events = []
+    lock = threading.Lock()
+
+    class SleepHandler(BaseHandler):
+        def __init__(self, client, params) -> None:
+            super().__init__(client, params)
+            self._params = params
+
+        def reconcile(self, state, check, return_mode="full"):
+            with lock:
+                events.append(("start", self._params["name"]))
+
+            time.sleep(0.05)
+            with lock:
+                events.append(("end", self._params["name"]))
+
+            if self._params.get("fail"):
+                raise ValueError("failed on purpose")
+
+            return {"changed": True}
+
+    module = BatchModule(SleepHandler, lambda params: [("thing", params["key"])], {"key": {"required": True}})
+    monkeypatch.setitem(batch.BATCH_MODULES, "thing", module)
+    items = [
+        {"module": "thing", "args": {"name": "a1", "key": "a", "fail": True}},
+        {"module": "thing", "args": {"name": "b1", "key": "b"}},
+        {"module": "thing", "args": {"name": "a2", "key": "a"}},
+        {"module": "thing", "args": {"name": "c1", "key": "c"}},
+    ]
+
+    start = time.perf_counter()
+    result = run_batch(None, items, check=False, workers=4)
+    elapsed = time.perf_counter() - start
+
+    assert events.index(("end", "a1")) < events.index(("start", "a2"))
+    assert sorted(events[:3]) == [("start", "a1"), ("start", "b1"), ("start", "c1")]
+    assert [item["failed"] for item in result["results"]] == [True, False, False, False]
+    assert result["results"][0]["msg"] == "failed on purpose"
+    # a2 waits for a1, everything else runs alongside
+    assert elapsed < 0.05 * 3
+
+
+@pytest.mark.parametrize(
+    "item,error",
+    [
+        ({"module": "node_qemu", "args": {"vmid": 101}}, "Module node_qemu cannot be batched"),
+        ({"module": "other.collection.pool", "args": {"poolid": "web"}}, "cannot be batched"),
+        ({"module": "cluster_acme_account", "args": {"name": "default"}}, "cannot be batched"),
+        ({"module": "pool", "args": {"comment": "web"}}, "Missing required arguments of pool: poolid"),
+    ],
+)
+def test_batch_params_rejects_invalid_items(item: dict, error: str) -> None:
+    with pytest.raises(ValueError, match=error):
+        batch_params(item)
+
+
+def test_batch_params_fills_in_module_defaults() -> None:
+    assert batch_params({"module": "margays.proxmox.pool", "args": {"poolid": "web"}}) == (
+        "pool",
+        {"poolid": "web", "comment": "", "state": "present"},
+    )
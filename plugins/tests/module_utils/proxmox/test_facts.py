@@ -0,0 +1,70 @@
+import time
+import pytest
+from module_utils.proxmox.facts import collect_cluster_facts
+from ...fakes.latency_client import create_latency_client
+from ...fakes.simulated_cluster import STATE_ENV, SimulatedCluster
+from .utils import create_fake_pvesh
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setenv(STATE_ENV, str(tmp_path))
+    SimulatedCluster.init(str(tmp_path), nodes=2, vms=3, pools=("web",))
+    client = create_fake_pvesh()
+    client("pools").add_option("poolid", "web").add_option("comment", "Web servers").set()
+    client("cluster/ha/groups").add_option("group", "pve-1").add_option("nodes", "pve1:2,pve2").create()
+    client("cluster/ha/resources").add_option("sid", "vm:101").add_option("group", "pve-1").create()
+    client("cluster/options").add_option("keyboard", "en-us").set()
+    client("cluster/acme/account").add_option("name", "default").add_option("contact", "admin@example.com").create()
+    plugin = client("cluster/acme/plugins").add_option("id", "dns").add_option("type", "dns")
+    plugin.add_option("data", "T0tFTg==").create()
+    return client
+
+
+def test_collect_cluster_facts(client) -> None:
+    facts = collect_cluster_facts(client)
+
+    assert facts["pools"] == [{"poolid": "web", "comment": "Web servers"}]
+    assert facts["ha_groups"] == [{"group": "pve-1", "nodes": "pve1:2,pve2"}]
+    assert facts["ha_resources"] == [{"sid": "vm:101", "group": "pve-1"}]
+    assert facts["options"] == {"keyboard": "en-us"}
+    assert facts["acme_accounts"] == [{"contact": "admin@example.com", "name": "default"}]
+    assert facts["acme_plugins"] == [{"id": "dns", "type": "dns", "disable": "False", "validation-delay": "0"}]
+    assert facts["vms"] == {
+        "100": {"vmid": 100, "name": "vm100", "type": "qemu", "node": "pve1", "status": "stopped", "tags": []},
+        "101": {
+            "vmid": 101,
+            "name": "vm101",
+            "type": "qemu",
+            "node": "pve2",
+            "status": "stopped",
+            "hastate": "started",
+            "tags": [],
+        },
+        "102": {"vmid": 102, "name": "vm102", "type": "qemu", "node": "pve1", "status": "stopped", "tags": []},
+    }
+
+
+def test_collect_cluster_facts_sections(client) -> None:
+    assert collect_cluster_facts(client, ["options", "pools"]) == {
+        "options": {"keyboard": "en-us"},
+        "pools": [{"poolid": "web", "comment": "Web servers"}],
+    }
+
+    with pytest.raises(ValueError, match="Unknown sections: storage"):
+        collect_cluster_facts(client, ["pools", "storage"])
+
+
+def test_collect_cluster_facts_reads_acme_accounts_concurrently() -> None:
+    names = [f"account{index}" for index in range(6)]
+    responses = {"cluster/acme/account": [{"name": name} for name in names + ["removed"]]}
+    responses.update({f"cluster/acme/account/{name}": {"contact": f"{name}@example.com"} for name in names})
+    client = create_latency_client(responses, latency=0.05)
+
+    start = time.perf_counter()
+    facts = collect_cluster_facts(client, ["acme_accounts"])
+    elapsed = time.perf_counter() - start
+
+    assert [account["name"] for account in facts["acme_accounts"]] == names
+    # the listing, then all accounts at once instead of one after another
+    assert elapsed < 0.05 * 4
@@ -0,0 +1,96 @@
+import json
+import time
+import pytest
+from module_utils.proxmox.client.pvesh import Pvesh, CommandResult
+from module_utils.proxmox.fleet import expand_vms, reconcile_many
+from module_utils.proxmox.handlers.node_qemu_handler import NodeQemuHandler
+from module_utils.proxmox.snapshot import ClusterSnapshot
+from .utils import create_client, Response
+
+
+def _pvesh(method: str, path: str, *options: str, return_code: int = 0, stdout: bytes = b"", stderr: bytes = b""):
+    command = ["/usr/bin/pvesh", method, path, *options, "--output-format=json"]
+    return Response(command=command, return_code=return_code, stdout=stdout, stderr=stderr)
+
+
+def test_expand_vms() -> None:
+    defaults = {"node": "testprox", "cores": 2, "name": None, "state": "present"}
+    items = [
+        {"vmid_range": "200-202", "name": "web-{index}-{vmid}"},
+        {"vmid_range": [300, 301], "node": "other"},
+        {"vmid": 400, "name": "db", "cores": 8, "state": "absent"},
+    ]
+
+    vms = expand_vms(items, defaults)
+
+    assert [(vm["node"], vm["vmid"], vm.get("name")) for vm in vms] == [
+        ("testprox", 200, "web-0-200"),
+        ("testprox", 201, "web-1-201"),
+        ("testprox", 202, "web-2-202"),
+        ("other", 300, None),
+        ("other", 301, None),
+        ("testprox", 400, "db"),
+    ]
+    assert [vm["cores"] for vm in vms] == [2, 2, 2, 2, 2, 8]
+    assert vms[-1]["state"] == "absent"
+    assert all("vmid_range" not in vm for vm in vms)
+
+
+@pytest.mark.parametrize(
+    "items",
+    [
+        pytest.param([{"vmid": 200}, {"vmid_range": "199-201"}], id="duplicated-vmid"),
+        pytest.param([{"name": "test"}], id="missing-vmid"),
+    ],
+)
+def test_expand_vms_rejects_invalid_items(items: list) -> None:
+    with pytest.raises(ValueError):
+        expand_vms(items, {"node": "testprox"})
+
+
+def test_reconcile_many_vms() -> None:
+    config = b'{"name": "vm101", "cores": 2}'
+    client = create_client(
+        [
+            _pvesh("get", "cluster/resources", stdout=b'[{"type": "qemu", "vmid": 101, "node": "testprox"}]'),
+            _pvesh("get", "nodes/testprox/qemu/101/config", stdout=config),
+            _pvesh("create", "nodes/testprox/qemu", "--vmid=102", "--cores=2", "--name=vm102"),
+            _pvesh("create", "nodes/testprox/qemu", "--vmid=103", "--name=vm103", return_code=255, stderr=b"no space"),
+        ]
+    )
+    vms = expand_vms(
+        [{"vmid": 101, "name": "vm101"}, {"vmid_range": "102-103", "name": "vm{vmid}"}],
+        {"node": "testprox", "cores": 2},
+    )
+    vms[-1]["cores"] = None
+
+    result = reconcile_many(
+        NodeQemuHandler, client, vms, check=False, workers=1, snapshot=ClusterSnapshot(client), keys=("node", "vmid")
+    )
+
+    assert [(r["vmid"], r["changed"], r["failed"]) for r in result["results"]] == [
+        (101, False, False),
+        (102, True, False),
+        (103, False, True),
+    ]
+    assert result["results"][1]["data"]["name"] == "vm102"
+    assert "no space" in result["results"][2]["msg"]
+    assert result["changed"]
+    assert (result["changed_count"], result["failed_count"]) == (1, 1)
+    assert client.responses.empty()
+
+
+def test_reconcile_many_runs_concurrently() -> None:
+    class SlowPvesh(Pvesh):
+        def _run(self, command: list[str]) -> CommandResult:
+            time.sleep(0.05)
+            return CommandResult(return_code=0, stderr=b"", stdout=json.dumps({"name": "test"}).encode())
+
+    vms = expand_vms([{"vmid_range": "100-115", "name": "test"}], {"node": "testprox"})
+
+    start = time.perf_counter()
+    result = reconcile_many(NodeQemuHandler, SlowPvesh, vms, check=True, workers=8)
+    elapsed = time.perf_counter() - start
+
+    assert result["changed_count"] == 0 and result["failed_count"] == 0
+    assert elapsed < 0.05 * 3 * len(vms) / 2
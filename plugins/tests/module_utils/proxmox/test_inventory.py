@@ -0,0 +1,110 @@
+import json
+from module_utils.proxmox.client.pvesh import CommandResult, Pvesh
+from module_utils.proxmox.client.pvesh_session import PveshSession
+from module_utils.proxmox.inventory import build_inventory, fetch_inventory
+
+RESOURCES = [
+    {"id": "node/pve1", "type": "node", "node": "pve1"},
+    {"id": "/pool/web", "type": "pool", "pool": "web", "comment": "Web servers"},
+    {
+        "id": "qemu/101",
+        "type": "qemu",
+        "vmid": 101,
+        "name": "web1",
+        "node": "pve1",
+        "pool": "web",
+        "status": "running",
+        "tags": "prod;web",
+        "hastate": "started",
+    },
+    {"id": "qemu/102", "type": "qemu", "vmid": 102, "name": "web1", "node": "pve2", "status": "stopped"},
+    {"id": "qemu/103", "type": "qemu", "vmid": 103, "node": "pve2", "status": "stopped"},
+    {"id": "qemu/9000", "type": "qemu", "vmid": 9000, "name": "debian", "node": "pve1", "template": 1},
+    {"id": "lxc/201", "type": "lxc", "vmid": 201, "name": "dns", "node": "pve1", "tags": "prod"},
+]
+HA_RESOURCES = [{"sid": "vm:101", "group": "pve-1", "state": "started"}]
+CONFIGS = {
+    "nodes/pve1/qemu/101/config": {"name": "web1", "cores": 2, "scsi0": "local-lvm:vm-101-disk-0,size=32G"},
+    "nodes/pve2/qemu/102/config": {"name": "web1", "cores": 1},
+}
+
+
+def _client(calls: list):
+    responses = {"cluster/resources": RESOURCES, "cluster/ha/resources": HA_RESOURCES, **CONFIGS}
+
+    class FakePvesh(Pvesh):
+        _stream = PveshSession._stream
+
+        def _run(self, command: list[str]) -> CommandResult:
+            calls.append(command[2])
+            if command[2] not in responses:
+                stderr = f"Configuration file '{command[2]}' does not exist".encode()
+                return CommandResult(return_code=255, stderr=stderr, stdout=b"")
+
+            return CommandResult(return_code=0, stderr=b"", stdout=json.dumps(responses[command[2]]).encode())
+
+    return FakePvesh
+
+
+def test_fetch_inventory() -> None:
+    calls = []
+    data = fetch_inventory(_client(calls))
+
+    assert calls == ["cluster/resources", "cluster/ha/resources"]
+    assert data == {"resources": RESOURCES, "ha_resources": HA_RESOURCES, "configs": {}}
+    assert json.loads(json.dumps(data)) == data
+
+
+def test_fetch_inventory_reads_configs() -> None:
+    calls = []
+    data = fetch_inventory(_client(calls), configs=True, ha_groups=False, workers=2)
+
+    # the template is read too, 103 disappeared since the listing
+    assert sorted(calls[1:]) == [
+        "nodes/pve1/qemu/101/config",
+        "nodes/pve1/qemu/9000/config",
+        "nodes/pve2/qemu/102/config",
+        "nodes/pve2/qemu/103/config",
+    ]
+    assert data["configs"] == {
+        "101": CONFIGS["nodes/pve1/qemu/101/config"],
+        "102": CONFIGS["nodes/pve2/qemu/102/config"],
+    }
+
+
+def test_build_inventory() -> None:
+    configs = {"101": CONFIGS["nodes/pve1/qemu/101/config"]}
+    inventory = build_inventory({"resources": RESOURCES, "ha_resources": HA_RESOURCES, "configs": configs})
+
+    assert list(inventory.hosts) == ["web1", "web1-102", "103", "dns"]
+    assert inventory.groups == {
+        "proxmox_node_pve1": ["web1", "dns"],
+        "proxmox_pool_web": ["web1"],
+        "proxmox_tag_prod": ["web1", "dns"],
+        "proxmox_tag_web": ["web1"],
+        "proxmox_ha_group_pve_1": ["web1"],
+        "proxmox_node_pve2": ["web1-102", "103"],
+    }
+    assert inventory.group_vars == {"proxmox_pool_web": {"proxmox_pool_comment": "Web servers"}}
+    assert inventory.hosts["web1"] == {
+        "proxmox_vmid": "101",
+        "proxmox_type": "qemu",
+        "proxmox_node": "pve1",
+        "proxmox_status": "running",
+        "proxmox_pool": "web",
+        "proxmox_tags": ["prod", "web"],
+        "proxmox_hastate": "started",
+        "proxmox_ha_group": "pve-1",
+        "proxmox_config": {"name": "web1", "cores": "2", "scsi0": "file=local-lvm:vm-101-disk-0,size=32"},
+    }
+    assert inventory.hosts["dns"]["proxmox_type"] == "lxc"
+
+
+def test_build_inventory_options() -> None:
+    options = {"group_by": ["node"], "prefix": "pve_", "hostnames": "vmid", "guest_types": ["qemu"], "templates": True}
+    inventory = build_inventory({"resources": RESOURCES}, **options)
+
+    assert list(inventory.hosts) == ["101", "102", "103", "9000"]
+    assert inventory.groups == {"pve_node_pve1": ["101", "9000"], "pve_node_pve2": ["102", "103"]}
+    assert inventory.group_vars == {}
+    assert inventory.hosts["9000"] == {"pve_vmid": "9000", "pve_type": "qemu", "pve_node": "pve1", "pve_tags": []}
@@ -0,0 +1,62 @@
+import pytest
+from module_utils.proxmox.property_string import format_property_string, parse_property_string
+from module_utils.proxmox.resources.cluster.ha import ClusterHAGroup
+from module_utils.proxmox.resources.node.qemu import Qemu
+
+# values as found in /etc/pve/qemu-server/*.conf
+REAL_WORLD = [
+    "local-lvm:vm-101-disk-0,cache=writeback,discard=on,iothread=1,size=32G",
+    "none,media=cdrom",
+    "local:iso/debian-12.5.0-amd64-netinst.iso,media=cdrom,size=629M",
+    "local-lvm:vm-101-disk-1,efitype=4m,pre-enrolled-keys=1,size=4M",
+    "local-lvm:0,import-from=/var/lib/vz/template/cloud/noble-server-cloudimg-amd64.img",
+    "ceph-pool:vm-101-disk-0,serial=QUJDRA==,size=8G",
+    "virtio=BC:24:11:2A:6F:01,bridge=vmbr0,firewall=1,tag=101",
+    "host=0000:01:00.0,pcie=1,x-vga=1",
+    "ip=10.0.0.5/24,gw=10.0.0.1,ip6=auto",
+    "user=local:snippets/user-data.yml,network=local:snippets/network.yml",
+    "order=scsi0;ide2;net0",
+    "uuid=6c0a8f7e-1b7b-4c4b-9a43-0a8f0d4f7a11,base64=1,serial=U2VyaWFsPQ==",
+    "order=1,up=30,down=60",
+    "source=/dev/urandom,max_bytes=1024,period=1000",
+]
+
+
+@pytest.mark.parametrize("text", REAL_WORLD)
+def test_property_string_round_trip(text: str) -> None:
+    assert format_property_string(parse_property_string(text)) == text
+
+
+def test_property_string_splits_at_the_first_equal_sign() -> None:
+    assert parse_property_string("host=0000:01:00.0,serial=QUJDRA==,none") == (
+        ("host", "0000:01:00.0"),
+        ("serial", "QUJDRA=="),
+        (None, "none"),
+    )
+    assert parse_property_string("") == ()
+    assert format_property_string([(None, "local-lvm:8"), ("cache", None), ("size", 8)]) == "local-lvm:8,size=8"
+
+
+def test_qemu_parses_values_with_separators() -> None:
+    qemu = Qemu(
+        "pve1",
+        {
+            "scsi0": "ceph-pool:vm-101-disk-0,serial=QUJDRA==,size=8G",
+            "ide2": "none,media=cdrom",
+            "net0": "virtio=BC:24:11:2A:6F:01,bridge=vmbr0",
+        },
+    )
+
+    assert qemu.serialize() == {
+        "node": "pve1",
+        "ide2": "file=none,media=cdrom",
+        "net0": "model=virtio,bridge=vmbr0",
+        "scsi0": "file=ceph-pool:vm-101-disk-0,serial=QUJDRA==,size=8",
+    }
+
+
+def test_ha_group_nodes() -> None:
+    assert str(ClusterHAGroup({"nodes": "pve1:2,pve2"}).nodes) == "pve1:2,pve2"
+
+    with pytest.raises(ValueError, match="Invalid format for nodes"):
+        ClusterHAGroup({"nodes": "pve1:2:1"})
@@ -0,0 +1,65 @@
+import threading
+import time
+import pytest
+from module_utils.proxmox.scheduler import ApplyError, Step, run_steps
+
+
+def test_run_steps_bounds_concurrency_per_group() -> None:
+    lock = threading.Lock()
+    running = {"a": 0, "b": 0}
+    peak = {"a": 0, "b": 0}
+
+    def step(group: str):
+        def run() -> str:
+            with lock:
+                running[group] += 1
+                peak[group] = max(peak[group], running[group])
+
+            time.sleep(0.02)
+            with lock:
+                running[group] -= 1
+
+            return group
+
+        return run
+
+    steps = [Step(f"{group}{idx}", step(group), group=group) for group in ("a", "b") for idx in range(4)]
+
+    start = time.perf_counter()
+    results = run_steps(steps, per_group=2)
+    elapsed = time.perf_counter() - start
+
+    assert results == {step.name: step.group for step in steps}
+    assert peak == {"a": 2, "b": 2}
+    assert elapsed < 0.02 * len(steps)
+
+
+def test_run_steps_aggregates_errors() -> None:
+    ran = []
+
+    def step(name: str, error: bool):
+        def run() -> None:
+            ran.append(name)
+            if error:
+                raise ValueError(f"{name} broke")
+
+        return run
+
+    steps = [Step(name, step(name, name != "scsi1")) for name in ("scsi0", "scsi1", "scsi2")]
+    with pytest.raises(ApplyError, match="2 of 3 steps failed - scsi0: scsi0 broke; scsi2: scsi2 broke") as e:
+        run_steps(steps)
+
+    assert sorted(ran) == ["scsi0", "scsi1", "scsi2"]
+    assert list(e.value.errors) == ["scsi0", "scsi2"]
+
+
+def test_run_steps_without_steps() -> None:
+    assert run_steps([]) == {}
+
+
+def test_run_steps_raises_interrupts_unwrapped() -> None:
+    def interrupt() -> None:
+        raise KeyboardInterrupt()
+
+    with pytest.raises(KeyboardInterrupt):
+        run_steps([Step("a", lambda: "a"), Step("b", interrupt)])
@@ -0,0 +1,111 @@
+import fcntl
+import pytest
+from module_utils.proxmox.client import ConflictError, LockedError, RetryPolicy, TransientError, with_retry_policy
+from module_utils.proxmox.fleet import expand_vms, reconcile_many
+from module_utils.proxmox.handlers.node_qemu_handler import NodeQemuHandler
+from module_utils.proxmox.handlers.pool_handler import PoolHandler
+from module_utils.proxmox.snapshot import ClusterSnapshot
+from ...fakes.simulated_cluster import STATE_ENV, SimulatedCluster
+from .utils import create_fake_pvesh, create_fake_session
+
+FAST_RETRY = RetryPolicy(attempts=3, initial_delay=0, jitter=0)
+
+
+@pytest.fixture
+def cluster(tmp_path, monkeypatch):
+    def create(**kwargs) -> SimulatedCluster:
+        monkeypatch.setenv(STATE_ENV, str(tmp_path))
+        return SimulatedCluster.init(str(tmp_path), **kwargs)
+
+    return create
+
+
+def test_reconcile_many_against_simulated_cluster(cluster) -> None:
+    cluster(nodes=2, vms=4)
+    client = create_fake_session()
+    vms = expand_vms(
+        [{"vmid_range": "100-103", "name": "vm{vmid}"}, {"vmid_range": "200-203", "name": "web-{index}"}],
+        {"node": "pve1", "cores": 2, "scsi0": "local-lvm:8,size=8"},
+    )
+    for vm in vms[:4]:
+        vm["node"] = "pve1" if vm["vmid"] % 2 == 0 else "pve2"
+
+    try:
+        first = reconcile_many(NodeQemuHandler, client, vms, check=False, snapshot=ClusterSnapshot(client).load())
+        second = reconcile_many(NodeQemuHandler, client, vms, check=False, snapshot=ClusterSnapshot(client).load())
+        config = client("nodes/pve1/qemu/201/config").get()
+    finally:
+        client.close()
+
+    assert (first["changed_count"], first["failed_count"]) == (8, 0)
+    assert (second["changed_count"], second["failed_count"]) == (0, 0)
+    assert config["name"] == "web-1"
+    assert config["scsi0"] == "local-lvm:vm-201-disk-0,size=8G"
+
+
+def test_pool_handler_against_simulated_cluster(cluster) -> None:
+    cluster()
+    client = create_fake_pvesh()
+
+    created = PoolHandler(client, {"poolid": "web", "comment": "Web"}).reconcile("present", False)
+    unchanged = PoolHandler(client, {"poolid": "web", "comment": "Web"}).reconcile("present", False)
+    removed = PoolHandler(client, {"poolid": "web"}).reconcile("absent", False)
+
+    assert (created["changed"], unchanged["changed"], removed["changed"]) == (True, False, True)
+    assert client("cluster/resources").get() == [
+        {"id": f"node/pve{index}", "type": "node", "node": f"pve{index}", "status": "online"} for index in (1, 2, 3)
+    ]
+
+
+def test_derived_data_matches_cluster_state(cluster) -> None:
+    cluster(vms=1)
+    client = create_fake_pvesh()
+    params = {"node": "pve1", "vmid": 100, "name": "renamed", "cores": 4, "memory": "2048"}
+
+    derived = NodeQemuHandler(client, params).reconcile("present", False)
+    verified = NodeQemuHandler(client, params).reconcile("present", False, return_mode="verified")
+
+    assert derived["changed"] and not verified["changed"]
+    assert verified["data"].pop("digest")
+    assert derived["data"] == verified["data"]
+
+
+def test_simulated_lock_contention(cluster, tmp_path) -> None:
+    cluster(vms=1, lock_timeout=0.05)
+    client = with_retry_policy(create_fake_pvesh(), FAST_RETRY)
+
+    with open(tmp_path / "locks" / "qemu-100.lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        with pytest.raises(LockedError, match="can't lock file '/var/lock/qemu-server/lock-100.conf'"):
+            client("nodes/pve1/qemu/100/config").add_option("cores", 4).set()
+
+    client("nodes/pve1/qemu/100/config").add_option("cores", 4).set()
+    assert client("nodes/pve1/qemu/100/config").get()["cores"] == "4"
+
+
+def test_concurrent_edit_is_detected(cluster) -> None:
+    cluster(vms=1)
+    client = create_fake_pvesh()
+    handler = NodeQemuHandler(client, {"node": "pve1", "vmid": 100, "cores": 4})
+    lookup = handler.lookup()
+    client("nodes/pve1/qemu/100/config").add_option("cores", 2).set()
+
+    with pytest.raises(ConflictError, match="detected modified configuration"):
+        handler.modify(False, lookup)
+
+    assert client("nodes/pve1/qemu/100/config").get()["cores"] == "2"
+
+
+@pytest.mark.parametrize(
+    "settings,error,message",
+    [
+        pytest.param({"failure_probability": 1.0}, TransientError, "ipcc_send_rec", id="transient"),
+        pytest.param({"lock_probability": 1.0}, LockedError, "cfs-lock 'file-cluster_cfg' error", id="locked"),
+    ],
+)
+def test_simulated_failure_injection(cluster, settings: dict, error: type, message: str) -> None:
+    cluster(**settings)
+    client = with_retry_policy(create_fake_pvesh(), FAST_RETRY)
+
+    with pytest.raises(error, match=message):
+        client("pools").add_option("poolid", "web").create()
@@ -0,0 +1,105 @@
+import json
+from module_utils.proxmox.snapshot import ClusterSnapshot
+from module_utils.proxmox.handlers.node_qemu_handler import NodeQemuHandler
+from module_utils.proxmox.handlers.pool_handler import PoolHandler
+from module_utils.proxmox.handlers.cluster_ha_resource_handler import ClusterHAResourceHandler
+from .utils import create_client, Response
+
+RESOURCES = [
+    {"id": "node/pve1", "type": "node", "node": "pve1"},
+    {"id": "node/pve2", "type": "node", "node": "pve2"},
+    {"id": "storage/pve1/local", "type": "storage", "node": "pve1", "storage": "local"},
+    {"id": "/pool/web", "type": "pool", "pool": "web"},
+    {"id": "/pool/empty", "type": "pool", "pool": "empty"},
+    {
+        "id": "qemu/101",
+        "type": "qemu",
+        "vmid": 101,
+        "node": "pve1",
+        "pool": "web",
+        "tags": "prod;web",
+        "hastate": "started",
+    },
+    {"id": "qemu/102", "type": "qemu", "vmid": 102, "node": "pve2", "pool": "web", "tags": "web"},
+    {"id": "lxc/201", "type": "lxc", "vmid": 201, "node": "pve1", "tags": "prod"},
+]
+
+
+def _resources_response(resources: list[dict] = RESOURCES) -> Response:
+    return Response(
+        command=["/usr/bin/pvesh", "get", "cluster/resources", "--output-format=json"],
+        return_code=0,
+        stdout=json.dumps(resources).encode(),
+        stderr=b"",
+    )
+
+
+def test_cluster_snapshot_indexes() -> None:
+    client = create_client([_resources_response()])
+    snapshot = ClusterSnapshot(client)
+
+    assert snapshot.guest(101)["node"] == "pve1"
+    assert snapshot.guest("201", "qemu") is None
+    assert [g["vmid"] for g in snapshot.guests(node="pve1")] == [101, 201]
+    assert [g["vmid"] for g in snapshot.guests(pool="web")] == [101, 102]
+    assert [g["vmid"] for g in snapshot.guests(tag="prod", guest_type="qemu")] == [101]
+    assert [g["vmid"] for g in snapshot.guests(tag="web", node="pve2")] == [102]
+    assert len(snapshot.guests()) == 3
+    assert snapshot.nodes() == ["pve1", "pve2"]
+    assert snapshot.pools() == ["empty", "web"]
+    assert snapshot.tags() == ["prod", "web"]
+    assert client.responses.empty()
+
+
+def test_cluster_snapshot_pool_and_ha_existence() -> None:
+    snapshot = ClusterSnapshot(create_client([_resources_response()]))
+
+    assert snapshot.has_pool("empty") is True
+    assert snapshot.has_pool("missing") is False
+    assert snapshot.has_ha_resource("vm:101") is True
+    assert snapshot.has_ha_resource("vm:102") is False
+    assert snapshot.has_ha_resource("ct:101") is None
+    assert snapshot.has_ha_resource("vm:999") is None
+
+
+def test_cluster_snapshot_without_pool_entries() -> None:
+    resources = [entry for entry in RESOURCES if entry["type"] != "pool"]
+    snapshot = ClusterSnapshot(create_client([_resources_response(resources)]))
+
+    assert snapshot.has_pool("web") is True
+    assert snapshot.has_pool("empty") is None
+
+
+def test_handlers_answer_existence_from_snapshot() -> None:
+    client = create_client([_resources_response()])
+    snapshot = ClusterSnapshot(client)
+
+    qemu = NodeQemuHandler(client, {"node": "pve1", "vmid": "101"}, snapshot=snapshot)
+    assert qemu.exists()
+    assert qemu.placement() == "pve1"
+    assert NodeQemuHandler(client, {"node": "pve1", "vmid": "999"}, snapshot=snapshot).lookup() is None
+    assert NodeQemuHandler(client, {"node": "pve1", "vmid": "201"}, snapshot=snapshot).lookup() is None
+    assert PoolHandler(client, {"poolid": "web"}, snapshot=snapshot).exists()
+    assert PoolHandler(client, {"poolid": "missing"}, snapshot=snapshot).lookup() is None
+    assert ClusterHAResourceHandler(client, {"sid": "vm:101"}, snapshot=snapshot).exists()
+    assert ClusterHAResourceHandler(client, {"sid": "vm:102"}, snapshot=snapshot).lookup() is None
+    assert client.responses.empty()
+
+
+def test_handler_fetches_config_only_for_existing_guest() -> None:
+    client = create_client(
+        [
+            _resources_response(),
+            Response(
+                command=["/usr/bin/pvesh", "get", "nodes/pve1/qemu/101/config", "--output-format=json"],
+                return_code=0,
+                stdout=b'{"name": "web1", "cores": 2}',
+                stderr=b"",
+            ),
+        ]
+    )
+    snapshot = ClusterSnapshot(client)
+
+    assert NodeQemuHandler(client, {"node": "pve1", "vmid": "103"}, snapshot=snapshot).lookup() is None
+    assert NodeQemuHandler(client, {"node": "pve1", "vmid": "101"}, snapshot=snapshot).lookup().name == "web1"
+    assert client.responses.empty()
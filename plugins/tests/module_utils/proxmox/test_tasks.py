@@ -0,0 +1,113 @@
+import json
+import pytest
+from module_utils.proxmox.client.cache import create_caching_client
+from module_utils.proxmox.handlers.node_qemu_handler import NodeQemuHandler
+from module_utils.proxmox.tasks import TaskError, TaskTimeout, TaskWaiter, is_upid, task_node
+from ...fakes.fake_clock import FakeClock
+from .utils import create_client, Response
+
+UPID_CREATE = "UPID:testprox:0000A1B2:0001C3D4:66A0B1C2:qmcreate:101:root@pam:"
+UPID_RESIZE = "UPID:testprox:0000A1B3:0001C3D5:66A0B1C3:resize:101:root@pam:"
+
+
+def _status(upid: str, status: str, exitstatus: str = "") -> Response:
+    data = {"status": status, "upid": upid}
+    if exitstatus:
+        data["exitstatus"] = exitstatus
+
+    return Response(
+        command=["/usr/bin/pvesh", "get", f"nodes/testprox/tasks/{upid}/status", "--output-format=json"],
+        return_code=0,
+        stdout=json.dumps(data).encode(),
+        stderr=b"",
+    )
+
+
+def _waiter(client: type, fake_clock: FakeClock, **kwargs) -> TaskWaiter:
+    return TaskWaiter(client, clock=fake_clock, sleep=fake_clock.sleep, rand=lambda: 0.5, **kwargs)
+
+
+def test_task_upid_helpers() -> None:
+    assert is_upid(UPID_CREATE)
+    assert not is_upid({})
+    assert task_node(UPID_CREATE) == "testprox"
+    with pytest.raises(ValueError):
+        task_node("testprox")
+
+
+def test_task_waiter_backs_off(fake_clock: FakeClock) -> None:
+    client = create_client(
+        [
+            _status(UPID_CREATE, "running"),
+            _status(UPID_CREATE, "running"),
+            _status(UPID_CREATE, "running"),
+            _status(UPID_CREATE, "stopped", "OK"),
+        ]
+    )
+
+    status = _waiter(client, fake_clock, initial_interval=1, max_interval=3).wait(UPID_CREATE)
+
+    assert status["exitstatus"] == "OK"
+    assert fake_clock.sleeps == [1, 2, 3]
+    assert client.responses.empty()
+
+
+def test_task_waiter_waits_for_many_tasks_in_one_loop(fake_clock: FakeClock) -> None:
+    client = create_client(
+        [
+            _status(UPID_CREATE, "running"),
+            _status(UPID_RESIZE, "stopped", "WARNINGS: 1"),
+            _status(UPID_CREATE, "stopped", "OK"),
+        ]
+    )
+
+    statuses = _waiter(client, fake_clock).wait_all([UPID_CREATE, UPID_RESIZE])
+
+    assert set(statuses) == {UPID_CREATE, UPID_RESIZE}
+    assert fake_clock.sleeps == [0.5]
+    assert client.responses.empty()
+
+
+def test_task_waiter_polls_through_a_caching_client(fake_clock: FakeClock) -> None:
+    client = create_caching_client(
+        create_client([_status(UPID_CREATE, "running"), _status(UPID_CREATE, "stopped", "OK")])
+    )
+
+    status = _waiter(client, fake_clock, timeout=3, initial_interval=1).wait(UPID_CREATE)
+
+    assert status["exitstatus"] == "OK"
+    assert client.cache.stats()["size"] == 0
+
+
+def test_task_waiter_raises_on_failed_task(fake_clock: FakeClock) -> None:
+    client = create_client([_status(UPID_CREATE, "stopped", "can't lock file '/var/lock/qemu-server/lock-101.conf'")])
+
+    with pytest.raises(TaskError, match="can't lock file"):
+        _waiter(client, fake_clock).wait(UPID_CREATE)
+
+
+def test_task_waiter_times_out(fake_clock: FakeClock) -> None:
+    client = create_client([_status(UPID_CREATE, "running") for _ in range(3)])
+
+    with pytest.raises(TaskTimeout):
+        _waiter(client, fake_clock, timeout=3, initial_interval=1).wait(UPID_CREATE)
+
+    assert client.responses.empty()
+
+
+def test_node_qemu_handler_waits_for_create_task() -> None:
+    client = create_client(
+        [
+            Response(
+                command=["/usr/bin/pvesh", "create", "nodes/testprox/qemu", "--vmid=101", "--output-format=json"],
+                return_code=0,
+                stdout=json.dumps(UPID_CREATE).encode(),
+                stderr=b"",
+            ),
+            _status(UPID_CREATE, "stopped", "OK"),
+        ]
+    )
+    handler = NodeQemuHandler(client, {"node": "testprox", "vmid": 101, "wait_for_task": True})
+
+    assert handler.create(check=False).status
+    assert client.responses.empty()
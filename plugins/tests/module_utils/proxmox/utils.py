@@ -1,8 +1,20 @@
-from dataclasses import dataclass
+import json
+import sys
+import threading
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
 from queue import Queue
-from typing import Iterable
+from typing import Iterable, Optional
+from urllib.parse import parse_qsl, urlsplit
+from module_utils.proxmox.client.api import PveApi, create_api_client
 from module_utils.proxmox.client.pvesh import Pvesh, CommandResult
+from module_utils.proxmox.client.pvesh_session import PveshSession
 from module_utils.proxmox.client.client import Client
+from module_utils.proxmox.client.metrics import MetricsCollector
+
+
+FAKE_PVESH = str(Path(__file__).parents[2] / "fakes" / "fake_pvesh.py")
 
 
 @dataclass
@@ -16,6 +28,7 @@ class Response:
 def create_client(responses: Iterable[Response]) -> type[Client]:
     class FakeClient(Pvesh):
         responses: Queue[Response] = Queue()
+        _stream = PveshSession._stream
 
         def _run(self, command: list[str]) -> CommandResult:
             result = FakeClient.responses.get_nowait()
@@ -34,3 +47,109 @@ def create_client(responses: Iterable[Response]) -> type[Client]:
         FakeClient.responses.put(r)
 
     return FakeClient
+
+
+def create_fake_pvesh() -> type[Pvesh]:
+    class FakePvesh(Pvesh):
+        _command = FAKE_PVESH
+
+    return FakePvesh
+
+
+def create_fake_session() -> type[PveshSession]:
+    class FakePveshSession(PveshSession):
+        _worker_command = [sys.executable, FAKE_PVESH, "--worker"]
+
+    return FakePveshSession
+
+
+@dataclass
+class ApiResponse:
+    method: str
+    path: str
+    status: int = 200
+    data: object = None
+    reason: str = "OK"
+    options: dict = field(default_factory=dict)
+
+
+@dataclass
+class ApiRequest:
+    method: str
+    path: str
+    options: dict
+    authorization: Optional[str]
+
+
+class ApiStandIn:
+    """Local HTTP server serving recorded Proxmox API responses in the expected order."""
+
+    def __init__(self, responses: Iterable[ApiResponse]) -> None:
+        self.responses: Queue[ApiResponse] = Queue()
+        self.requests: list[ApiRequest] = []
+        self.connections = 0
+        for r in responses:
+            self.responses.put(r)
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, args=(0.05,), daemon=True)
+
+    def __enter__(self) -> "ApiStandIn":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    def client(self, **kwargs) -> type[PveApi]:
+        return create_api_client("127.0.0.1", port=self.port, scheme="http", **kwargs)
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self) -> None:
+                super().setup()
+                stand_in.connections += 1
+
+            def log_message(self, *args) -> None:
+                pass
+
+            def _handle(self) -> None:
+                url = urlsplit(self.path)
+                length = int(self.headers.get("Content-Length", 0))
+                query = url.query if self.command in ("GET", "DELETE") else self.rfile.read(length).decode()
+                request = ApiRequest(self.command, url.path, dict(parse_qsl(query)), self.headers.get("Authorization"))
+                stand_in.requests.append(request)
+
+                expected = stand_in.responses.get_nowait()
+                expected_request = (expected.method, expected.path, expected.options)
+                if expected_request != (request.method, request.path, request.options):
+                    raise ValueError(f"Expected request {expected} but got {request}")
+
+                body = json.dumps({"data": expected.data}).encode()
+                self.send_response(expected.status, expected.reason)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            do_GET = do_POST = do_PUT = do_DELETE = _handle
+
+        return Handler
+
+
+def assert_call_budget(collector: MetricsCollector, total: int, **phases: int) -> None:
+    """Fail when a scenario makes more calls than budgeted, in total or in any of the given phases."""
+    summary = collector.summary()
+    assert summary["calls"] <= total, f"{summary['calls']} calls made, budget is {total}"
+    for phase, budget in phases.items():
+        calls = collector.count(phase=phase)
+        assert calls <= budget, f"{calls} calls made in phase {phase}, budget is {budget}"